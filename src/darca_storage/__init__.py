@@ -1,4 +1,42 @@
-from darca_storage.client import StorageClient
-from darca_storage.factory import StorageConnectorFactory
+# src/darca_storage/__init__.py
+# License: MIT
+"""
+darca-storage: scoped, async-first file storage clients.
 
-__all__ = ["StorageClient", "StorageConnectorFactory"]
+The public names are resolved lazily (PEP 562), so ``import darca_storage``
+stays cheap for short-lived CLI and serverless processes: a submodule and
+its dependencies are imported the first time one of its names is used.
+"""
+
+from __future__ import annotations
+
+TYPE_CHECKING = False  # avoids importing typing, which is not free
+if TYPE_CHECKING:
+    from typing import Any, List
+
+    from darca_storage.client import StorageClient
+    from darca_storage.factory import StorageConnectorFactory
+    from darca_storage.sync_client import SyncStorageClient
+
+__all__ = ["StorageClient", "StorageConnectorFactory", "SyncStorageClient"]
+
+_LAZY = {
+    "StorageClient": "darca_storage.client",
+    "StorageConnectorFactory": "darca_storage.factory",
+    "SyncStorageClient": "darca_storage.sync_client",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # later lookups skip this hook
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,67 +1,505 @@
 # src/darca_storage/backends/local_file_backend.py
 # License: MIT
 """
-Async local-disk backend that delegates to darca_file_utils under the hood,
-executed via asyncio.to_thread so the event-loop remains free.
+Local-disk backends that delegate to darca_file_utils under the hood.
+
+`SyncLocalFileBackend` performs the I/O directly on the calling thread.
+`LocalFileBackend` runs the very same operations in worker threads (see
+`darca_storage.executors.run_in_thread`) so the event-loop remains free;
+`checksum` hashes files through `run_cpu_bound` and may use a process pool.
+Write-time checksums and verified reads hash the in-memory payload in the
+I/O worker instead: handing it to another process would copy it through a
+pipe, and hashlib and zlib release the GIL on large buffers anyway.
+
+Every write records a random version in the ``user.darca.version`` extended
+attribute, and write-time checksums go to ``user.darca.checksum``.  Both are
+stored with the size and mtime they were recorded for, and the checksum also
+with the version, so a stamp left behind by a later rewrite is recognised as
+stale.  Weak etags are built from the version, so in-place rewrites of the
+same size within one mtime tick still get a new etag.  Files written by
+other tools (or on filesystems without user xattrs) fall back to an etag of
+inode, mtime and size.
+
+Conditional writes are atomic: ``if_none_match="*"`` creates the file with
+O_EXCL, and ``if_match`` compares etags while holding an exclusive lock on
+the parent directory (thread lock + flock, shared by all conditional writers
+in any process) before atomically replacing the file.
+
+Binary payloads may be any buffer-protocol object; they are handed to
+``os.writev`` as memoryviews, so neither `write` nor `writev` copies them.
 """
 
 from __future__ import annotations
 
-import asyncio
 import os
-from typing import List, Optional, Union
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager, suppress
+from stat import S_IMODE, S_ISDIR, S_ISREG
+from typing import Iterator, List, Optional, Sequence, Union
 
 from darca_file_utils.directory_utils import DirectoryUtils
 from darca_file_utils.file_utils import FileUtils, FileUtilsException
 
-from darca_storage.interfaces.file_backend import FileBackend
+from darca_storage.exceptions import (
+    StorageChecksumMismatch,
+    StorageChecksumUnavailable,
+    StoragePreconditionFailed,
+)
+from darca_storage.executors import run_cpu_bound, run_in_thread
+from darca_storage.hashing import (
+    digest_buffers,
+    digest_bytes,
+    file_digest,
+    validate_algorithm,
+)
+from darca_storage.interfaces.file_backend import (
+    NOT_MODIFIED,
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+    NotModified,
+)
+from darca_storage.path_query import PathQuery, walk
 
+try:  # POSIX only; elsewhere conditional writes lock within the process
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
 
-class LocalFileBackend(FileBackend):  # noqa: D101  (docstring inherited)
 
-    async def read(
-        self, path: str, *, binary: bool = False
-    ) -> Union[str, bytes]:
-        # FileUtils.read_file auto-detects binary vs text
-        return await asyncio.to_thread(
-            FileUtils.read_file, file_path=path, binary=binary
+CHECKSUM_XATTR = "user.darca.checksum"
+VERSION_XATTR = "user.darca.version"
+
+_DIRECTORY_LOCKS = [threading.Lock() for _ in range(64)]
+
+_IOV_MAX = 16  # buffers per os.writev call (the POSIX minimum)
+with suppress(AttributeError, ValueError, OSError):
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+if _IOV_MAX <= 0:  # -1: no fixed limit
+    _IOV_MAX = 1024
+
+
+def _store_stamps(
+    path: str, digest: Optional[str], fd: Optional[int] = None
+) -> None:
+    """
+    Record a fresh version and, if given, *digest* for what was just
+    written to *path* (through *fd* when given).
+
+    Raises:
+        StorageChecksumUnavailable: If *digest* cannot be stored.
+    """
+    target: Union[str, int] = path if fd is None else fd
+    st = os.stat(target)
+    state = f"{st.st_size} {st.st_mtime_ns}"
+    version: Optional[str] = os.urandom(8).hex()
+    try:
+        os.setxattr(target, VERSION_XATTR, f"{version} {state}".encode())
+    except (AttributeError, OSError):
+        version = None  # weak etags fall back to inode, mtime and size
+    if digest is None:
+        return
+    value = f"{digest} {state}"
+    if version is not None:
+        value += f" {version}"  # ties the digest to this very write
+    try:
+        os.setxattr(target, CHECKSUM_XATTR, value.encode("ascii"))
+    except (AttributeError, OSError) as exc:
+        raise StorageChecksumUnavailable(
+            path, f"cannot store checksum as an extended attribute ({exc})"
         )
 
-    async def write(
+
+def _load_stamp(
+    path: str, name: str, st: os.stat_result
+) -> Optional[List[str]]:
+    """
+    Fields of stamp *name* (value first, extras after size and mtime) if
+    it was recorded for the file's current size and mtime, else None.
+    """
+    try:
+        raw = os.getxattr(path, name)
+    except (AttributeError, OSError):
+        return None
+    fields = raw.decode("ascii", "replace").split(" ")
+    try:
+        size, mtime_ns = int(fields[1]), int(fields[2])
+    except (IndexError, ValueError):
+        return None
+    if size != st.st_size or mtime_ns != st.st_mtime_ns:
+        return None  # rewritten since the stamp was recorded
+    return [fields[0], *fields[3:]]
+
+
+def _load_version(path: str, st: os.stat_result) -> Optional[str]:
+    stamp = _load_stamp(path, VERSION_XATTR, st)
+    return stamp[0] if stamp else None
+
+
+def _load_checksum(
+    path: str, st: os.stat_result, version: Optional[str]
+) -> Optional[str]:
+    """Return the stored digest if it still describes the file, else None."""
+    stamp = _load_stamp(path, CHECKSUM_XATTR, st)
+    if stamp is None:
+        return None
+    digest, *recorded = stamp
+    if recorded and recorded[0] != version:
+        return None  # an earlier write of the same size and mtime
+    return digest
+
+
+def _weak_etag(st: os.stat_result, version: Optional[str]) -> str:
+    if version is not None:
+        # Unique per write, even for in-place rewrites within one mtime tick
+        # that keep the inode and size.
+        return f'W/"{version}-{st.st_size:x}"'
+    # Written by someone else: only an atomic replace changes the inode.
+    return f'W/"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _file_etag(path: str, st: os.stat_result) -> str:
+    version = _load_version(path, st)
+    return _load_checksum(path, st, version) or _weak_etag(st, version)
+
+
+def _current_etag(path: str) -> Optional[str]:
+    """Etag of the file at *path*, or None if there is no such file."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return None if S_ISDIR(st.st_mode) else _file_etag(path, st)
+
+
+@contextmanager
+def _directory_lock(path: str) -> Iterator[None]:
+    """Exclusive lock on the parent directory of *path*."""
+    directory = os.path.dirname(path) or "."
+    with _DIRECTORY_LOCKS[hash(directory) % len(_DIRECTORY_LOCKS)]:
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # releases the flock
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode *data* as a text-mode read would, translating newlines."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _byte_views(buffers: Sequence[Buffer]) -> List[memoryview]:
+    """
+    Flat byte views of *buffers* (no copies).
+
+    Raises:
+        TypeError: If a buffer is not C-contiguous.
+    """
+    return [memoryview(buffer).cast("B") for buffer in buffers]
+
+
+def _write_all(fd: int, views: List[memoryview]) -> None:
+    """Write every byte of *views*, retrying short writes."""
+    pending = [view for view in views if view]
+    if not hasattr(os, "writev"):  # pragma: no cover  (Windows)
+        for view in pending:
+            while view:
+                view = view[os.write(fd, view) :]
+        return
+    start = 0
+    while start < len(pending):
+        written = os.writev(fd, pending[start : start + _IOV_MAX])
+        while written:
+            head = pending[start]
+            if written < len(head):
+                pending[start] = head[written:]
+                break
+            written -= len(head)
+            start += 1
+
+
+def _open_for_write(path: str, flags: int) -> int:
+    return os.open(path, os.O_WRONLY | os.O_CLOEXEC | flags, 0o666)
+
+
+def _write_error(path: str, error: OSError) -> FileUtilsException:
+    if isinstance(error, FileNotFoundError):
+        return FileUtilsException(
+            message=f"Cannot write: parent directory missing: {path}",
+            error_code="WRITE_PARENT_NOT_FOUND",
+            metadata={"path": path},
+        )
+    return FileUtilsException(
+        message=f"Cannot write: {error.strerror or error}: {path}",
+        error_code="WRITE_FILE_FAILED",
+        metadata={"path": path, "errno": error.errno},
+    )
+
+
+def _checksum_not_found(path: str, algorithm: str) -> FileUtilsException:
+    return FileUtilsException(
+        message=f"Cannot checksum: file does not exist: {path}",
+        error_code="CHECKSUM_FILE_NOT_FOUND",
+        metadata={"path": path, "algorithm": algorithm},
+    )
+
+
+class SyncLocalFileBackend:
+    """
+    Blocking local-disk backend.
+
+    Mirrors the FileBackend contract with plain methods.  Used directly by
+    `SyncStorageClient` and, through worker threads, by `LocalFileBackend`.
+
+    Args:
+        default_checksum: Algorithm used when `write` is not given one
+                          (None records no checksum).
+    """
+
+    def __init__(self, default_checksum: Optional[str] = None) -> None:
+        if default_checksum is not None:
+            validate_algorithm(default_checksum)
+        self._default_checksum = default_checksum
+
+    def read(
+        self,
+        path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        if if_none_match is not None and _current_etag(path) == if_none_match:
+            return NOT_MODIFIED
+        if not verify:
+            # FileUtils.read_file auto-detects binary vs text
+            return FileUtils.read_file(file_path=path, binary=binary)
+
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+                st = os.fstat(fh.fileno())
+        except (FileNotFoundError, IsADirectoryError):
+            raise FileUtilsException(
+                message=f"Cannot read: file does not exist: {path}",
+                error_code="READ_FILE_NOT_FOUND",
+                metadata={"path": path},
+            )
+        expected = _load_checksum(path, st, _load_version(path, st))
+        if expected is None:
+            raise StorageChecksumUnavailable(
+                path, "no checksum recorded for the current contents"
+            )
+        actual = digest_bytes(expected.split(":", 1)[0], data)
+        if actual != expected:
+            raise StorageChecksumMismatch(path, expected, actual)
+        return data if binary else _decode_text(data)
+
+    def write(
         self,
         path: str,
-        content: Union[str, bytes],
+        content: Content,
         *,
         binary: bool = False,
         permissions: Optional[int] = None,
         user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
     ) -> None:
-        await asyncio.to_thread(
-            FileUtils.write_file,
+        if not isinstance(content, str):
+            # Buffers are written as raw bytes whatever *binary* says.
+            self.writev(
+                path,
+                (content,),
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            )
+            return
+        plain = (
+            checksum is None
+            and self._default_checksum is None
+            and if_match is None
+            and if_none_match is None
+        )
+        if not plain:
+            # Encode once so the bytes hashed are exactly the bytes written.
+            self.writev(
+                path,
+                (content.encode("utf-8"),),
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            )
+            return
+        FileUtils.write_file(
             file_path=path,
             content=content,
             binary=binary,
             permissions=permissions,
             user=user,
         )
+        _store_stamps(path, None)
 
-    async def delete(self, path: str) -> None:
-        await asyncio.to_thread(FileUtils.remove_file, path)
+    def writev(
+        self,
+        path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        if if_none_match not in (None, "*"):
+            raise ValueError("write() only supports if_none_match='*'.")
 
-    async def exists(self, path: str) -> bool:
-        return await asyncio.to_thread(
-            lambda p=path: FileUtils.file_exist(p)
-            or DirectoryUtils.directory_exist(p)
+        views = _byte_views(buffers)
+        algorithm = checksum or self._default_checksum
+        digest = (
+            digest_buffers(algorithm, views) if algorithm is not None else None
         )
 
-    async def list(
-        self, base_path: str, *, recursive: bool = False
-    ) -> List[str]:
-        return await asyncio.to_thread(
-            DirectoryUtils.list_directory, base_path, recursive
+        try:
+            if if_none_match == "*":
+                self._create_exclusive(path, views, permissions, user, digest)
+            elif if_match is not None:
+                with _directory_lock(path):
+                    current = _current_etag(path)
+                    if current is None or if_match not in ("*", current):
+                        raise StoragePreconditionFailed(
+                            path, "if_match", if_match, current
+                        )
+                    self._replace(path, views, permissions, user, digest)
+            else:
+                self._overwrite(path, views, permissions, user, digest)
+        except OSError as error:
+            # Report OS failures the way the str write path does.
+            raise _write_error(path, error)
+
+    def _overwrite(
+        self,
+        path: str,
+        views: List[memoryview],
+        permissions: Optional[int],
+        user: Optional[str],
+        digest: Optional[str],
+    ) -> None:
+        fd = _open_for_write(path, os.O_CREAT | os.O_TRUNC)
+        try:
+            _write_all(fd, views)
+            if permissions is not None:
+                os.fchmod(fd, permissions)
+            _store_stamps(path, digest, fd)
+        finally:
+            os.close(fd)
+        if user:
+            shutil.chown(path, user=user)
+
+    def _create_exclusive(
+        self,
+        path: str,
+        views: List[memoryview],
+        permissions: Optional[int],
+        user: Optional[str],
+        digest: Optional[str],
+    ) -> None:
+        try:
+            fd = _open_for_write(path, os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            raise StoragePreconditionFailed(
+                path, "if_none_match", "*", _current_etag(path)
+            )
+        try:
+            try:
+                _write_all(fd, views)
+                if permissions is not None:
+                    os.fchmod(fd, permissions)
+                _store_stamps(path, digest, fd)
+            finally:
+                os.close(fd)
+            if user:
+                shutil.chown(path, user=user)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+            raise
+
+    def _replace(
+        self,
+        path: str,
+        views: List[memoryview],
+        permissions: Optional[int],
+        user: Optional[str],
+        digest: Optional[str],
+    ) -> None:
+        """Atomically replace existing *path* via a temp file + rename."""
+        directory, name = os.path.split(path)
+        mode = (
+            permissions
+            if permissions is not None
+            else S_IMODE(os.stat(path).st_mode)
         )
+        fd, tmp = tempfile.mkstemp(prefix=f".{name}.", dir=directory)
+        try:
+            try:
+                _write_all(fd, views)
+                os.fchmod(fd, mode)
+                _store_stamps(path, digest, fd)
+            finally:
+                os.close(fd)
+            if user:
+                shutil.chown(tmp, user=user)
+            os.replace(tmp, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
 
-    async def mkdir(
+    def will_need(self, path: str) -> None:
+        """Ask the kernel to start reading *path* (best effort)."""
+        if not hasattr(os, "posix_fadvise"):  # pragma: no cover
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return  # the read itself will report the problem
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def delete(self, path: str) -> None:
+        FileUtils.remove_file(path)
+
+    def exists(self, path: str) -> bool:
+        # One stat instead of a failed file check followed by a dir check.
+        try:
+            mode = os.stat(path).st_mode
+        except (OSError, ValueError):
+            return False
+        return S_ISREG(mode) or S_ISDIR(mode)
+
+    def list(self, base_path: str, *, recursive: bool = False) -> List[str]:
+        return DirectoryUtils.list_directory(base_path, recursive)
+
+    def mkdir(
         self,
         path: str,
         *,
@@ -69,20 +507,16 @@ class LocalFileBackend(FileBackend):  # noqa: D101  (docstring inherited)
         permissions: Optional[int] = None,
         user: Optional[str] = None,
     ) -> None:
-        await asyncio.to_thread(
-            DirectoryUtils.create_directory,
+        DirectoryUtils.create_directory(
             path,
             permissions=permissions,
             user=user,
         )
 
-    async def rmdir(self, path: str) -> None:
-        await asyncio.to_thread(DirectoryUtils.remove_directory, path)
+    def rmdir(self, path: str) -> None:
+        DirectoryUtils.remove_directory(path)
 
-    async def rename(self, src: str, dest: str) -> None:
-        await asyncio.to_thread(self._rename_sync, src, dest)
-
-    def _rename_sync(self, src: str, dest: str) -> None:
+    def rename(self, src: str, dest: str) -> None:
         if FileUtils.file_exist(src):
             FileUtils.rename_file(src, dest)
         elif DirectoryUtils.directory_exist(src):
@@ -94,11 +528,214 @@ class LocalFileBackend(FileBackend):  # noqa: D101  (docstring inherited)
                 metadata={"src": src, "dest": dest},
             )
 
-    async def stat_mtime(self, path: str) -> float:
-        if not await self.exists(path):
+    def stat_mtime(self, path: str) -> float:
+        if not self.exists(path):
             raise FileUtilsException(
                 message=f"Cannot stat: path does not exist: {path}",
                 error_code="STAT_MTIME_NOT_FOUND",
                 metadata={"path": path},
             )
-        return await asyncio.to_thread(os.path.getmtime, path)
+        return os.path.getmtime(path)
+
+    def stat(self, path: str) -> FileStat:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            raise FileUtilsException(
+                message=f"Cannot stat: path does not exist: {path}",
+                error_code="STAT_NOT_FOUND",
+                metadata={"path": path},
+            )
+        is_dir = S_ISDIR(st.st_mode)
+        return FileStat(
+            name=os.path.basename(path),
+            size=st.st_size,
+            mtime=st.st_mtime,
+            is_dir=is_dir,
+            etag=None if is_dir else _file_etag(path, st),
+            mode=S_IMODE(st.st_mode),
+        )
+
+    def scan(self, path: str) -> List[FileStat]:
+        if not DirectoryUtils.directory_exist(path):
+            raise FileUtilsException(
+                message=f"Cannot scan: directory does not exist: {path}",
+                error_code="SCAN_DIRECTORY_NOT_FOUND",
+                metadata={"path": path},
+            )
+        entries: List[FileStat] = []
+        with os.scandir(path) as it:
+            for entry in it:
+                st = entry.stat(follow_symlinks=False)
+                entries.append(
+                    FileStat(
+                        name=entry.name,
+                        size=st.st_size,
+                        mtime=st.st_mtime,
+                        is_dir=S_ISDIR(st.st_mode),
+                    )
+                )
+        return entries
+
+    def find(
+        self,
+        path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        if not DirectoryUtils.directory_exist(path):
+            raise FileUtilsException(
+                message=f"Cannot find: directory does not exist: {path}",
+                error_code="FIND_DIRECTORY_NOT_FOUND",
+                metadata={"path": path},
+            )
+        return walk(path, query, after=after, limit=limit)
+
+    def checksum(self, path: str, algorithm: str = "sha256") -> str:
+        validate_algorithm(algorithm)
+        try:
+            return file_digest(path, algorithm)
+        except (FileNotFoundError, IsADirectoryError):
+            raise _checksum_not_found(path, algorithm)
+
+
+class LocalFileBackend(FileBackend):  # noqa: D101  (docstring inherited)
+
+    def __init__(self, default_checksum: Optional[str] = None) -> None:
+        self._sync = SyncLocalFileBackend(default_checksum=default_checksum)
+
+    @property
+    def sync(self) -> SyncLocalFileBackend:
+        """The blocking backend each operation is dispatched to."""
+        return self._sync
+
+    async def read(
+        self,
+        path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        # Etag checks and verification run inside the same worker hop.
+        return await run_in_thread(
+            self._sync.read,
+            path,
+            binary=binary,
+            verify=verify,
+            if_none_match=if_none_match,
+        )
+
+    async def write(
+        self,
+        path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await run_in_thread(
+            self._sync.write,
+            path,
+            content,
+            binary=binary,
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    async def writev(
+        self,
+        path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await run_in_thread(
+            self._sync.writev,
+            path,
+            list(buffers),
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    async def will_need(self, path: str) -> None:
+        await run_in_thread(self._sync.will_need, path)
+
+    async def delete(self, path: str) -> None:
+        await run_in_thread(self._sync.delete, path)
+
+    async def exists(self, path: str) -> bool:
+        return await run_in_thread(self._sync.exists, path)
+
+    async def list(
+        self, base_path: str, *, recursive: bool = False
+    ) -> List[str]:
+        return await run_in_thread(
+            self._sync.list, base_path, recursive=recursive
+        )
+
+    async def mkdir(
+        self,
+        path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        await run_in_thread(
+            self._sync.mkdir,
+            path,
+            parents=parents,
+            permissions=permissions,
+            user=user,
+        )
+
+    async def rmdir(self, path: str) -> None:
+        await run_in_thread(self._sync.rmdir, path)
+
+    async def rename(self, src: str, dest: str) -> None:
+        await run_in_thread(self._sync.rename, src, dest)
+
+    async def stat_mtime(self, path: str) -> float:
+        return await run_in_thread(self._sync.stat_mtime, path)
+
+    async def stat(self, path: str) -> FileStat:
+        return await run_in_thread(self._sync.stat, path)
+
+    async def scan(self, path: str) -> List[FileStat]:
+        return await run_in_thread(self._sync.scan, path)
+
+    async def find(
+        self,
+        path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        return await run_in_thread(
+            self._sync.find, path, query, after=after, limit=limit
+        )
+
+    async def checksum(self, path: str, algorithm: str = "sha256") -> str:
+        validate_algorithm(algorithm)
+        try:
+            return await run_cpu_bound(file_digest, path, algorithm)
+        except (FileNotFoundError, IsADirectoryError):
+            raise _checksum_not_found(path, algorithm)
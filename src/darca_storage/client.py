@@ -2,9 +2,50 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from darca_storage.interfaces.file_backend import FileBackend
+from darca_storage.decorators.forwarding_backend import (
+    RESOURCE_KEYS,
+    add_resources,
+    backend_resources,
+    backend_stats,
+    close_backend,
+    flush_backend,
+    will_need,
+)
+from darca_storage.exceptions import StorageClientClosed
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+    NotModified,
+)
+from darca_storage.manifest import (
+    Manifest,
+    ManifestDiff,
+    build_manifest,
+    diff_manifests,
+)
+from darca_storage.path_query import PathQuery, split_glob
+from darca_storage.prefetch import prefetch
+
+if TYPE_CHECKING:
+    from darca_storage.packed_store import PackedObjectStore
+    from darca_storage.transaction import Transaction
 
 
 class StorageClient(FileBackend):
@@ -14,7 +55,10 @@ class StorageClient(FileBackend):
     Implements the full FileBackend interface with added support for:
       - Session metadata
       - Optional user and credential context
-      - Introspection and future hooks (e.g. refresh, flush, presign_url)
+      - Introspection and future hooks (e.g. refresh, presign_url)
+      - An async lifecycle: ``async with`` / `close()` flushes buffered
+        data, waits for in-flight operations and releases the backend
+        chain; `stats()` reports what the chain currently holds
 
     All paths are relative to the scoped root directory
     enforced by the backend.
@@ -32,43 +76,199 @@ class StorageClient(FileBackend):
         self._session_metadata = session_metadata or {}
         self._user = user
         self._credentials = credentials or {}
+        self._closed = False
+        self._closing: Optional[asyncio.Future] = None
+        self._drained: Optional[asyncio.Event] = None
+        self._in_flight: Dict[str, int] = {}
+
+    # ───────────────────────────── lifecycle ────────────────────────────── #
+
+    @contextmanager
+    def _track(self, operation: str) -> Iterator[None]:
+        if self._closed:
+            raise StorageClientClosed(operation)
+        self._in_flight[operation] = self._in_flight.get(operation, 0) + 1
+        try:
+            yield
+        finally:
+            remaining = self._in_flight[operation] - 1
+            if remaining:
+                self._in_flight[operation] = remaining
+            else:
+                del self._in_flight[operation]
+                if not self._in_flight and self._drained is not None:
+                    self._drained.set()
+
+    async def __aenter__(self) -> StorageClient:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        """True once `close()` has been called."""
+        return self._closed
+
+    async def close(self) -> None:
+        """
+        Close the client.
+
+        New operations are rejected with `StorageClientClosed` at once.
+        Operations already running are awaited, buffered data is flushed,
+        and the backend chain is closed.  Calling `close` again (even
+        concurrently) waits for the first call to finish.
+        """
+        if self._closing is None:
+            self._closed = True
+            self._closing = asyncio.ensure_future(self._shutdown())
+        await asyncio.shield(self._closing)
+
+    async def _shutdown(self) -> None:
+        if self._in_flight:
+            self._drained = asyncio.Event()
+            await self._drained.wait()
+        try:
+            await flush_backend(self._backend)
+        finally:
+            await close_backend(self._backend)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the backend chain's statistics plus a ``"resources"``
+        summary: open handles, buffered bytes, cache entries and bytes,
+        and in-flight operations (see `RESOURCE_KEYS`).
+        """
+        return {
+            **backend_stats(self._backend),
+            "client": {
+                "closed": self._closed,
+                "in_flight": dict(self._in_flight),
+            },
+            "resources": add_resources(
+                dict.fromkeys(RESOURCE_KEYS, 0),
+                backend_resources(self._backend),
+                {"in_flight": sum(self._in_flight.values())},
+            ),
+        }
+
+    # ───────────────────────────── operations ───────────────────────────── #
 
     async def read(
-        self, relative_path: str, *, binary: bool = False
-    ) -> Union[str, bytes]:
-        return await self._backend.read(
-            relative_path=relative_path, binary=binary
-        )
+        self,
+        relative_path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        with self._track("read"):
+            return await self._backend.read(
+                relative_path=relative_path,
+                binary=binary,
+                verify=verify,
+                if_none_match=if_none_match,
+            )
 
     async def write(
         self,
         relative_path: str,
-        content: Union[str, bytes],
+        content: Content,
         *,
         binary: bool = False,
         permissions: Optional[int] = None,
         user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
     ) -> None:
-        await self._backend.write(
-            relative_path=relative_path,
-            content=content,
-            binary=binary,
-            permissions=permissions,
-            user=user or self._user,
-        )
+        with self._track("write"):
+            await self._backend.write(
+                relative_path=relative_path,
+                content=content,
+                binary=binary,
+                permissions=permissions,
+                user=user or self._user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            )
+
+    async def writev(
+        self,
+        relative_path: str,
+        buffers: Iterable[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        """
+        Write the concatenation of *buffers* to *relative_path*.
+
+        The buffers are written with vectored I/O and never joined or
+        copied; leave them unmodified until the call returns.
+        """
+        with self._track("writev"):
+            await self._backend.writev(
+                relative_path=relative_path,
+                buffers=list(buffers),
+                permissions=permissions,
+                user=user or self._user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            )
 
     async def delete(self, relative_path: str) -> None:
-        await self._backend.delete(relative_path=relative_path)
+        with self._track("delete"):
+            await self._backend.delete(relative_path=relative_path)
 
     async def exists(self, relative_path: str) -> bool:
-        return await self._backend.exists(relative_path=relative_path)
+        with self._track("exists"):
+            return await self._backend.exists(relative_path=relative_path)
 
     async def list(
-        self, relative_path: str = ".", *, recursive: bool = False
+        self,
+        relative_path: str = ".",
+        *,
+        recursive: bool = False,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        min_mtime: Optional[float] = None,
     ) -> List[str]:
-        return await self._backend.list(
-            relative_path=relative_path, recursive=recursive
-        )
+        """
+        List directory *relative_path*.
+
+        *include*, *exclude*, *max_depth* and *min_mtime* filter the listing
+        inside the backend, while it walks the tree (see `walk`); without
+        *recursive*, *max_depth* defaults to 1.
+        """
+        if (
+            include is None
+            and exclude is None
+            and max_depth is None
+            and min_mtime is None
+        ):
+            with self._track("list"):
+                return await self._backend.list(
+                    relative_path=relative_path, recursive=recursive
+                )
+        if max_depth is None and not recursive:
+            max_depth = 1
+        return [
+            path
+            async for path in self.walk(
+                relative_path,
+                include=include,
+                exclude=exclude,
+                max_depth=max_depth,
+                min_mtime=min_mtime,
+            )
+        ]
 
     async def mkdir(
         self,
@@ -78,24 +278,195 @@ class StorageClient(FileBackend):
         permissions: Optional[int] = None,
         user: Optional[str] = None,
     ) -> None:
-        await self._backend.mkdir(
-            relative_path=relative_path,
-            parents=parents,
-            permissions=permissions,
-            user=user or self._user,
-        )
+        with self._track("mkdir"):
+            await self._backend.mkdir(
+                relative_path=relative_path,
+                parents=parents,
+                permissions=permissions,
+                user=user or self._user,
+            )
 
     async def rmdir(self, relative_path: str) -> None:
-        await self._backend.rmdir(relative_path=relative_path)
+        with self._track("rmdir"):
+            await self._backend.rmdir(relative_path=relative_path)
 
     async def rename(self, src_relative: str, dest_relative: str) -> None:
-        await self._backend.rename(
-            src_relative=src_relative,
-            dest_relative=dest_relative,
-        )
+        with self._track("rename"):
+            await self._backend.rename(
+                src_relative=src_relative,
+                dest_relative=dest_relative,
+            )
 
     async def stat_mtime(self, relative_path: str) -> float:
-        return await self._backend.stat_mtime(relative_path=relative_path)
+        with self._track("stat_mtime"):
+            return await self._backend.stat_mtime(relative_path=relative_path)
+
+    async def stat(self, relative_path: str) -> FileStat:
+        with self._track("stat"):
+            return await self._backend.stat(relative_path=relative_path)
+
+    async def scan(self, relative_path: str = ".") -> List[FileStat]:
+        with self._track("scan"):
+            return await self._backend.scan(relative_path=relative_path)
+
+    async def find(
+        self,
+        relative_path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        with self._track("find"):
+            return await self._backend.find(
+                relative_path=relative_path,
+                query=query,
+                after=after,
+                limit=limit,
+            )
+
+    async def walk(
+        self,
+        relative_path: str = ".",
+        *,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        min_mtime: Optional[float] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the entries under *relative_path* matching the filters.
+
+        The filters are evaluated by the backend during its walk (see
+        `darca_storage.path_query`), and results arrive in pages of
+        *page_size*, so a huge tree is neither listed in full nor held in
+        memory.  Paths are relative to *relative_path*.
+        """
+        query = PathQuery.build(include, exclude, max_depth, min_mtime)
+        after = None
+        while True:
+            page = await self.find(
+                relative_path, query, after=after, limit=page_size
+            )
+            for path in page:
+                yield path
+            if len(page) < page_size:
+                return
+            after = page[-1]
+
+    async def glob(
+        self,
+        pattern: str,
+        *,
+        min_mtime: Optional[float] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the paths matching glob *pattern*, e.g. ``"logs/**/*.gz"``.
+
+        Only the directory named by the pattern's literal prefix is walked,
+        and only as deep as the pattern can match.  A missing directory
+        yields nothing.
+        """
+        base, rest = split_glob(pattern)
+        if base != "." and not await self.exists(base):
+            return
+        async for path in self.walk(
+            base, include=rest, min_mtime=min_mtime, page_size=page_size
+        ):
+            yield path if base == "." else f"{base}/{path}"
+
+    async def checksum(
+        self, relative_path: str, algorithm: str = "sha256"
+    ) -> str:
+        with self._track("checksum"):
+            return await self._backend.checksum(
+                relative_path=relative_path, algorithm=algorithm
+            )
+
+    async def manifest(
+        self,
+        relative_path: str = ".",
+        *,
+        previous: Optional[Manifest] = None,
+        checksum: Optional[str] = None,
+    ) -> Manifest:
+        """
+        Snapshot the tree under *relative_path* (see `build_manifest`).
+
+        Pass the manifest from the previous run as *previous* so that only
+        new or changed files are checksummed again.
+        """
+        with self._track("manifest"):
+            return await build_manifest(
+                self._backend,
+                relative_path,
+                previous=previous,
+                checksum=checksum,
+            )
+
+    def prefetch(
+        self,
+        relative_paths: Iterable[str],
+        *,
+        window: int = 4,
+        max_bytes: Optional[int] = None,
+        advise_ahead: int = 0,
+        binary: bool = False,
+        verify: bool = False,
+    ) -> AsyncIterator[Tuple[str, Union[str, bytes]]]:
+        """
+        Read *relative_paths* in order, keeping *window* reads in flight.
+
+        Returns an async iterator of ``(path, content)`` pairs.  Results
+        waiting for the consumer are limited to *max_bytes*, and the next
+        *advise_ahead* paths beyond the window get a read-ahead hint
+        (``posix_fadvise(WILLNEED)`` on local disk).  See
+        `darca_storage.prefetch.prefetch`.
+        """
+        return prefetch(
+            lambda path: self.read(path, binary=binary, verify=verify),
+            relative_paths,
+            window=window,
+            max_bytes=max_bytes,
+            advise=lambda path: will_need(self._backend, path),
+            advise_ahead=advise_ahead,
+        )
+
+    async def packed_store(
+        self, relative_path: str, **options: Any
+    ) -> PackedObjectStore:
+        """
+        Open the packed key-value store in directory *relative_path*.
+
+        Meant for many small objects; see `PackedObjectStore` for the
+        *options*.  Close the store when done.
+        """
+        from darca_storage.packed_store import PackedObjectStore
+
+        with self._track("packed_store"):
+            return await PackedObjectStore.open(self, relative_path, **options)
+
+    def transaction(self) -> Transaction:
+        """
+        Start a transaction: ``async with client.transaction() as tx:``.
+
+        Writes, deletes and renames staged on *tx* are published together
+        when the block exits (atomic rename per file, one fsync per
+        affected directory) and discarded if it raises.  See
+        `darca_storage.transaction`.
+        """
+        from darca_storage.transaction import Transaction
+
+        if self._closed:
+            raise StorageClientClosed("transaction")
+        return Transaction(self)
+
+    @staticmethod
+    def diff(old: Manifest, new: Manifest) -> ManifestDiff:
+        """Return added, changed and removed files between two manifests."""
+        return diff_manifests(old, new)
 
     @property
     def backend(self) -> FileBackend:
@@ -142,10 +513,11 @@ class StorageClient(FileBackend):
 
     async def flush(self) -> None:
         """
-        Hook for flushing buffered data to storage.
-        Useful for future implementations (e.g., batching or append-only logs).
+        Flush data buffered anywhere in the backend chain to storage
+        (e.g. write-behind copies of a `TieredFileBackend`).
         """
-        pass
+        with self._track("flush"):
+            await flush_backend(self._backend)
 
     async def presign_url(
         self, relative_path: str, expires_in: int
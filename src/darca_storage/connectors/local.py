@@ -5,17 +5,29 @@
 Async connector for a local-filesystem backend.
 
 • Performs reachability and access probes without blocking the event-loop
-  (`asyncio.to_thread`).
-• Returns a ready-scoped *async* `StorageClient`.
+  (`darca_storage.executors.run_in_thread`).
+• Returns a ready-scoped *async* `StorageClient` (or, via `connect_sync`, a
+  blocking backend for `SyncStorageClient`).
+• Finishes or discards transactions left by dead processes before the
+  client is returned (`darca_storage.transaction.recover_transactions`).
 • Supports credential injection (e.g. posix_user) via
   CredentialAware interface.
+• Builds the decorator chain below the scope from connector `parameters`
+  (e.g. `max_concurrency`, `ops_per_second`, see `ThrottleLimits`;
+  `coalesce_reads` for single-flight reads; `negative_cache_ttl` /
+  `listing_cache_ttl` for in-memory `exists` answers; `io_workers` /
+  `process_workers` to size the shared worker pools; `checksum` to record
+  a checksum on every write; `timeout` / `retries` / `hedge_after` for
+  deadlines, retries and hedged reads, see `ResiliencePolicy`;
+  ``simulate_*`` to make the disk slow or flaky for load tests, see
+  `SimulationProfile`).
 """
 
 from __future__ import annotations
 
-import asyncio
 import os
-from typing import Dict, Optional
+import weakref
+from typing import Any, Dict, Optional
 
 from darca_file_utils.directory_utils import (
     DirectoryUtils,
@@ -23,10 +35,48 @@ from darca_file_utils.directory_utils import (
 )
 from darca_file_utils.file_utils import FileUtils, FileUtilsException
 
-from darca_storage.backends.local_file_backend import LocalFileBackend
-from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.backends.local_file_backend import (
+    LocalFileBackend,
+    SyncLocalFileBackend,
+)
+from darca_storage.decorators.forwarding_backend import (
+    add_resources,
+    backend_resources,
+    close_backend,
+)
+from darca_storage.decorators.lookup_cache_backend import (
+    LookupCacheFileBackend,
+)
+from darca_storage.decorators.resilient_backend import (
+    ResiliencePolicy,
+    ResilientFileBackend,
+)
+from darca_storage.decorators.scoped_backend import (
+    ScopedFileBackend,
+    SyncScopedFileBackend,
+)
+from darca_storage.decorators.simulated_backend import (
+    SimulatedFileBackend,
+    SimulationProfile,
+)
+from darca_storage.decorators.single_flight_backend import (
+    SingleFlightFileBackend,
+)
+from darca_storage.decorators.throttled_backend import (
+    FairScheduler,
+    ThrottledFileBackend,
+    ThrottleLimits,
+)
+from darca_storage.executors import (
+    configure_io_pool,
+    configure_process_pool,
+    run_in_thread,
+)
 from darca_storage.interfaces.credential_aware import CredentialAware
+from darca_storage.interfaces.file_backend import FileBackend
 from darca_storage.interfaces.storage_connector import StorageConnector
+from darca_storage.parameters import get_bool, get_float, get_int
+from darca_storage.transaction import recover_transactions
 
 
 class LocalStorageConnector(StorageConnector, CredentialAware):
@@ -43,6 +93,9 @@ class LocalStorageConnector(StorageConnector, CredentialAware):
         self._base_path: str = os.path.abspath(base_path)
         self._credentials: Dict[str, str] = credentials or {}
         self._parameters: Dict[str, str] = parameters or {}
+        self._backends: "weakref.WeakSet[ScopedFileBackend]" = (
+            weakref.WeakSet()
+        )
 
     def inject_credentials(self, credentials: Dict[str, str]) -> None:
         """
@@ -58,16 +111,126 @@ class LocalStorageConnector(StorageConnector, CredentialAware):
             )
         if not await self.verify_access():
             raise PermissionError(f"Access to '{self._base_path}' is denied.")
+        # Before the client can write anything a replay would clobber.
+        await run_in_thread(recover_transactions, self._base_path)
+
+        backend = ScopedFileBackend(
+            backend=self._build_backend(), base_path=self._base_path
+        )
+        self._backends.add(backend)
+        return backend
 
-        return ScopedFileBackend(
-            backend=LocalFileBackend(), base_path=self._base_path
+    async def close(self) -> None:
+        """Close every backend returned by `connect` that is still alive."""
+        backends = list(self._backends)
+        self._backends.clear()
+        for backend in backends:
+            await close_backend(backend)
+
+    def stats(self) -> Dict[str, Any]:
+        backends = list(self._backends)
+        return {
+            "base_path": self._base_path,
+            "backends": len(backends),
+            "resources": add_resources(
+                *(backend_resources(b) for b in backends)
+            ),
+        }
+
+    def _build_backend(self) -> FileBackend:
+        """Wrap a LocalFileBackend in the decorators requested by params."""
+        # Worker pools are process-wide; the last connector to ask wins.
+        if "io_workers" in self._parameters:
+            configure_io_pool(get_int(self._parameters, "io_workers"))
+        if "process_workers" in self._parameters:
+            configure_process_pool(
+                get_int(self._parameters, "process_workers")
+            )
+
+        backend: FileBackend = LocalFileBackend(
+            default_checksum=self._parameters.get("checksum") or None
+        )
+
+        # Innermost: simulated latency and faults stand in for the disk.
+        profile = SimulationProfile.from_parameters(self._parameters)
+        if not profile.is_inert():
+            backend = SimulatedFileBackend(backend, profile)
+
+        limits = ThrottleLimits.from_parameters(self._parameters)
+        fair_slots = get_int(self._parameters, "fair_queue_concurrency")
+        if not limits.is_unlimited() or fair_slots:
+            backend = ThrottledFileBackend(
+                backend,
+                limits,
+                scheduler=(
+                    FairScheduler.shared(self._base_path, fair_slots)
+                    if fair_slots
+                    else None
+                ),
+                tenant=self._parameters.get("tenant", "default"),
+            )
+
+        # Above the throttle, so every retry and hedge is admitted like any
+        # other call; below coalescing, which would merge a hedge into the
+        # read it backs up.
+        policy = ResiliencePolicy.from_parameters(self._parameters)
+        if not policy.is_passive():
+            backend = ResilientFileBackend(backend, policy)
+
+        # Coalesce above the throttle so a herd of identical reads costs a
+        # single admission slot.
+        if get_bool(self._parameters, "coalesce_reads"):
+            backend = SingleFlightFileBackend(backend)
+
+        # Outermost: answers from memory should not queue for anything.
+        negative_ttl = get_float(self._parameters, "negative_cache_ttl")
+        listing_ttl = get_float(self._parameters, "listing_cache_ttl")
+        if negative_ttl or listing_ttl:
+            backend = LookupCacheFileBackend(
+                backend,
+                negative_ttl=negative_ttl,
+                negative_size=(
+                    get_int(self._parameters, "negative_cache_size") or 10_000
+                ),
+                listing_ttl=listing_ttl,
+                listing_size=(
+                    get_int(self._parameters, "listing_cache_size") or 256
+                ),
+                listing_after_misses=(
+                    get_int(self._parameters, "listing_after_misses") or 3
+                ),
+            )
+        return backend
+
+    def connect_sync(self) -> SyncScopedFileBackend:
+        """
+        Blocking variant of `connect` for `SyncStorageClient`.
+
+        Operations run directly on the caller's thread, so the async-only
+        decorators (throttling, read coalescing) are not applied.
+        """
+        if not self.verify_connection_sync():
+            raise RuntimeError(
+                f"Local storage path '{self._base_path}' is not reachable."
+            )
+        if not self.verify_access_sync():
+            raise PermissionError(f"Access to '{self._base_path}' is denied.")
+        recover_transactions(self._base_path)
+
+        return SyncScopedFileBackend(
+            backend=SyncLocalFileBackend(
+                default_checksum=self._parameters.get("checksum") or None
+            ),
+            base_path=self._base_path,
         )
 
     async def verify_connection(self) -> bool:
         """True if the directory exists."""
-        return await asyncio.to_thread(
-            DirectoryUtils.directory_exist, self._base_path
-        )
+        return await run_in_thread(self.verify_connection_sync)
+
+    def verify_connection_sync(self) -> bool:
+        """Blocking variant of `verify_connection`."""
+        return DirectoryUtils.directory_exist(self._base_path)
 
     async def verify_access(
         self,
@@ -80,28 +243,34 @@ class LocalStorageConnector(StorageConnector, CredentialAware):
 
         Uses injected credentials if available (e.g. posix_user).
         """
+        return await run_in_thread(
+            self.verify_access_sync, user=user, permissions=permissions
+        )
+
+    def verify_access_sync(
+        self,
+        *,
+        user: Optional[str] = None,
+        permissions: Optional[int] = None,
+    ) -> bool:
+        """Blocking variant of `verify_access`."""
         effective_user = self._credentials.get("posix_user") or user
         try:
             # Ensure root directory exists (mkdir may be needed the first time)
-            await asyncio.to_thread(
-                self._ensure_dir,
-                user=effective_user,
-                permissions=permissions,
-            )
+            self._ensure_dir(user=effective_user, permissions=permissions)
 
             # Probe write / delete
             test_file = os.path.join(
                 self._base_path, f".access_check_{os.getpid()}"
             )
-            await asyncio.to_thread(
-                FileUtils.write_file,
+            FileUtils.write_file(
                 file_path=test_file,
                 content="ok",
                 binary=False,
                 permissions=permissions,
                 user=effective_user,
             )
-            await asyncio.to_thread(FileUtils.remove_file, test_file)
+            FileUtils.remove_file(test_file)
             return True
         except (DirectoryUtilsException, FileUtilsException):
             return False
@@ -120,3 +289,8 @@ class LocalStorageConnector(StorageConnector, CredentialAware):
     def base_path(self) -> str:
         """Absolute root directory this connector targets."""
         return self._base_path
+
+    @property
+    def parameters(self) -> Dict[str, str]:
+        """Connection parameters this connector was configured with."""
+        return self._parameters
@@ -0,0 +1,335 @@
+# src/darca_storage/decorators/forwarding_backend.py
+# License: MIT
+"""
+Base class for FileBackend decorators.
+
+`ForwardingFileBackend` passes every operation straight through to a wrapped
+backend, routing each call through a single `_invoke` hook.  Decorators that
+apply the same policy to every operation (throttling, fault injection,
+retries…) override `_invoke`; decorators that treat specific operations
+differently override those methods instead.
+
+Decorators sit *inside* `ScopedFileBackend`, so they receive absolute,
+already-confined paths.
+
+Backends may also implement the optional lifecycle methods ``flush()``,
+``close()`` (coroutines) and ``resources()``; the helpers below call them
+when present, and the forwarding base passes all three down the chain.
+`resources()` reports additive counters under the `RESOURCE_KEYS` names.
+The optional ``will_need(path)`` coroutine is an advisory read-ahead hint
+and is forwarded the same way, as is ``invalidate(path)``, which tells
+caching decorators that *path* changed behind the chain's back.
+"""
+
+from __future__ import annotations
+
+import inspect
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+    NotModified,
+)
+from darca_storage.path_query import PathQuery
+
+T = TypeVar("T")
+
+RESOURCE_KEYS = (
+    "open_handles",
+    "buffered_bytes",
+    "cache_entries",
+    "cache_bytes",
+    "in_flight",
+)
+
+
+def _optional_call(backend: Any, method: str) -> Any:
+    func = getattr(backend, method, None)
+    return func() if callable(func) else None
+
+
+def backend_stats(backend: Any) -> Dict[str, Any]:
+    """Return ``backend.stats()`` if the backend provides it, else {}."""
+    stats = _optional_call(backend, "stats")
+    return stats if isinstance(stats, dict) else {}
+
+
+def backend_resources(backend: Any) -> Dict[str, int]:
+    """Return ``backend.resources()`` if the backend provides it, else {}."""
+    resources = _optional_call(backend, "resources")
+    return resources if isinstance(resources, dict) else {}
+
+
+def add_resources(*parts: Mapping[str, int]) -> Dict[str, int]:
+    """Sum resource counters key by key."""
+    total: Dict[str, int] = {}
+    for part in parts:
+        for key, value in part.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+async def flush_backend(backend: Any) -> None:
+    """Await ``backend.flush()`` if the backend provides it."""
+    result = _optional_call(backend, "flush")
+    if inspect.isawaitable(result):
+        await result
+
+
+async def close_backend(backend: Any) -> None:
+    """Await ``backend.close()`` if the backend provides it."""
+    result = _optional_call(backend, "close")
+    if inspect.isawaitable(result):
+        await result
+
+
+async def will_need(backend: Any, path: str) -> None:
+    """Await ``backend.will_need(path)`` if the backend provides it."""
+    func = getattr(backend, "will_need", None)
+    result = func(path) if callable(func) else None
+    if inspect.isawaitable(result):
+        await result
+
+
+def invalidate(backend: Any, path: str) -> None:
+    """Call ``backend.invalidate(path)`` if the backend provides it."""
+    func = getattr(backend, "invalidate", None)
+    if callable(func):
+        func(path)
+
+
+def content_size(content: Any) -> int:
+    """Best-effort payload size in bytes, without copying the content."""
+    if isinstance(content, str):
+        # Text is stored as UTF-8; only non-ASCII text needs encoding.
+        if content.isascii():
+            return len(content)
+        return len(content.encode("utf-8"))
+    try:
+        return memoryview(content).nbytes
+    except TypeError:
+        return 0
+
+
+class ForwardingFileBackend(FileBackend):
+    """Transparent FileBackend decorator; subclass and override `_invoke`."""
+
+    def __init__(self, backend: FileBackend) -> None:
+        self._backend: FileBackend = backend
+
+    @property
+    def backend(self) -> FileBackend:
+        """The wrapped backend."""
+        return self._backend
+
+    async def _invoke(
+        self,
+        operation: str,
+        path: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        nbytes: int = 0,
+    ) -> T:
+        """
+        Run *call* (the forwarded operation) and return its result.
+
+        Args:
+            operation: Name of the FileBackend method (e.g. ``"read"``).
+            path:      Target path (the source path for ``rename``).
+            call:      Zero-argument coroutine factory performing the call.
+            nbytes:    Payload size for writes, 0 otherwise.
+        """
+        return await call()
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistics reported by this decorator and everything below it."""
+        return backend_stats(self._backend)
+
+    def resources(self) -> Dict[str, int]:
+        """Resources held by this decorator and everything below it."""
+        return backend_resources(self._backend)
+
+    async def flush(self) -> None:
+        """Push buffered data down the chain."""
+        await flush_backend(self._backend)
+
+    async def close(self) -> None:
+        """Release resources held by this decorator and the chain below."""
+        await close_backend(self._backend)
+
+    async def will_need(self, path: str) -> None:
+        """Hint that *path* is about to be read."""
+        await will_need(self._backend, path)
+
+    def invalidate(self, path: str) -> None:
+        """Forget anything cached about *path* here and further down."""
+        invalidate(self._backend, path)
+
+    # ───────────────────────────── operations ───────────────────────────── #
+
+    async def read(
+        self,
+        path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        return await self._invoke(
+            "read",
+            path,
+            lambda: self._backend.read(
+                path,
+                binary=binary,
+                verify=verify,
+                if_none_match=if_none_match,
+            ),
+        )
+
+    async def write(
+        self,
+        path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await self._invoke(
+            "write",
+            path,
+            lambda: self._backend.write(
+                path=path,
+                content=content,
+                binary=binary,
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            ),
+            nbytes=content_size(content),
+        )
+
+    async def writev(
+        self,
+        path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await self._invoke(
+            "writev",
+            path,
+            lambda: self._backend.writev(
+                path,
+                buffers,
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            ),
+            nbytes=sum(content_size(buffer) for buffer in buffers),
+        )
+
+    async def delete(self, path: str) -> None:
+        await self._invoke("delete", path, lambda: self._backend.delete(path))
+
+    async def exists(self, path: str) -> bool:
+        return await self._invoke(
+            "exists", path, lambda: self._backend.exists(path)
+        )
+
+    async def list(
+        self, base_path: str, *, recursive: bool = False
+    ) -> List[str]:
+        return await self._invoke(
+            "list",
+            base_path,
+            lambda: self._backend.list(base_path, recursive=recursive),
+        )
+
+    async def mkdir(
+        self,
+        path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        await self._invoke(
+            "mkdir",
+            path,
+            lambda: self._backend.mkdir(
+                path=path,
+                parents=parents,
+                permissions=permissions,
+                user=user,
+            ),
+        )
+
+    async def rmdir(self, path: str) -> None:
+        await self._invoke("rmdir", path, lambda: self._backend.rmdir(path))
+
+    async def rename(self, src: str, dest: str) -> None:
+        await self._invoke(
+            "rename", src, lambda: self._backend.rename(src, dest)
+        )
+
+    async def stat_mtime(self, path: str) -> float:
+        return await self._invoke(
+            "stat_mtime", path, lambda: self._backend.stat_mtime(path)
+        )
+
+    async def stat(self, path: str) -> FileStat:
+        return await self._invoke(
+            "stat", path, lambda: self._backend.stat(path)
+        )
+
+    async def scan(self, path: str) -> List[FileStat]:
+        return await self._invoke(
+            "scan", path, lambda: self._backend.scan(path)
+        )
+
+    async def find(
+        self,
+        path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        return await self._invoke(
+            "find",
+            path,
+            lambda: self._backend.find(
+                path, query, after=after, limit=limit
+            ),
+        )
+
+    async def checksum(self, path: str, algorithm: str = "sha256") -> str:
+        return await self._invoke(
+            "checksum", path, lambda: self._backend.checksum(path, algorithm)
+        )
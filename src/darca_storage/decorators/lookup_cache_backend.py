@@ -0,0 +1,379 @@
+# src/darca_storage/decorators/lookup_cache_backend.py
+# License: MIT
+"""
+Short-lived lookup caches answering `exists` from memory.
+
+`LookupCacheFileBackend` keeps two bounded, TTL-limited caches:
+
+• A *negative* cache of paths found missing.  A path is also known to be
+  missing when any of its ancestors is.
+• A *listing* cache of directory member names.  Once a directory has seen a
+  few misses, its names are loaded with a single `scan`, after which any
+  `exists` in it (hit or miss) is answered from memory.  `scan` results
+  passing through fill it too.
+
+Mutations made through this instance update both caches, and a lookup
+racing with a mutation is not cached.  Changes made by other processes or
+other backend instances become visible once the entries expire.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from darca_storage.decorators.forwarding_backend import (
+    ForwardingFileBackend,
+    add_resources,
+)
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+)
+
+
+def _lineage(path: str) -> Iterator[str]:
+    """Yield *path* and each of its ancestors, nearest first."""
+    while True:
+        yield path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return
+        path = parent
+
+
+def _is_within(path: str, parent: str) -> bool:
+    return path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+class LookupCacheFileBackend(ForwardingFileBackend):
+    """
+    FileBackend decorator caching negative lookups and directory listings.
+
+    Args:
+        backend:              Backend to wrap.
+        negative_ttl:         Seconds a missing path is remembered; 0 or
+                              None disables the negative cache.
+        negative_size:        Maximum number of missing paths remembered.
+        listing_ttl:          Seconds a directory listing is remembered; 0 or
+                              None disables the listing cache.
+        listing_size:         Maximum number of directories remembered.
+        listing_after_misses: Misses in one directory (within
+                              *negative_ttl*) before its listing is loaded.
+    """
+
+    def __init__(
+        self,
+        backend: FileBackend,
+        *,
+        negative_ttl: Optional[float] = 1.0,
+        negative_size: int = 10_000,
+        listing_ttl: Optional[float] = None,
+        listing_size: int = 256,
+        listing_after_misses: int = 3,
+    ) -> None:
+        super().__init__(backend)
+        self._negative_ttl = negative_ttl or 0.0
+        self._negative_size = negative_size
+        self._listing_ttl = listing_ttl or 0.0
+        self._listing_size = listing_size
+        self._listing_after_misses = max(1, listing_after_misses)
+
+        self._missing: OrderedDict[str, float] = OrderedDict()
+        self._listings: OrderedDict[str, Tuple[float, FrozenSet[str]]] = (
+            OrderedDict()
+        )
+        self._dir_misses: OrderedDict[str, int] = OrderedDict()
+        self._generation = 0
+        self._counters = {
+            "negative_hits": 0,
+            "listing_hits": 0,
+            "lookups": 0,
+            "listings_loaded": 0,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "lookup_cache": {
+                **self._counters,
+                "missing": len(self._missing),
+                "listings": len(self._listings),
+            },
+        }
+
+    def resources(self) -> Dict[str, int]:
+        return add_resources(
+            super().resources(),
+            {"cache_entries": len(self._missing) + len(self._listings)},
+        )
+
+    async def close(self) -> None:
+        self._missing.clear()
+        self._listings.clear()
+        self._dir_misses.clear()
+        await super().close()
+
+    def invalidate(self, path: str) -> None:
+        self._generation += 1  # lookups already running are not cached
+        self._uncertain(path)
+        super().invalidate(path)
+
+    # ───────────────────────────── cache state ──────────────────────────── #
+
+    @staticmethod
+    def _put(cache: OrderedDict, key: str, value: Any, size: int) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+    def _known_missing(self, path: str, now: float) -> bool:
+        for candidate in _lineage(path):
+            expiry = self._missing.get(candidate)
+            if expiry is None:
+                continue
+            if expiry > now:
+                return True
+            del self._missing[candidate]
+        return False
+
+    def _listing(self, directory: str, now: float) -> Optional[FrozenSet[str]]:
+        cached = self._listings.get(directory)
+        if cached is None:
+            return None
+        expiry, names = cached
+        if expiry <= now:
+            del self._listings[directory]
+            return None
+        return names
+
+    def _store_listing(
+        self, directory: str, entries: List[FileStat], now: float
+    ) -> None:
+        self._dir_misses.pop(directory, None)
+        self._put(
+            self._listings,
+            directory,
+            (now + self._listing_ttl, frozenset(e.name for e in entries)),
+            self._listing_size,
+        )
+
+    def _edit_listing(
+        self, directory: str, *, add: Optional[str] = None, drop: str = ""
+    ) -> None:
+        cached = self._listings.get(directory)
+        if cached is not None:
+            expiry, names = cached
+            names = names - {drop}
+            self._listings[directory] = (
+                expiry,
+                names if add is None else names | {add},
+            )
+
+    async def _record_miss(self, path: str, now: float) -> None:
+        if self._negative_ttl:
+            self._put(
+                self._missing,
+                path,
+                now + self._negative_ttl,
+                self._negative_size,
+            )
+        if not self._listing_ttl:
+            return
+
+        parent = os.path.dirname(path)
+        misses = self._dir_misses.get(parent, 0) + 1
+        if misses < self._listing_after_misses:
+            self._put(self._dir_misses, parent, misses, self._listing_size)
+            return
+
+        generation = self._generation
+        try:
+            entries = await super().scan(parent)
+        except Exception:  # parent missing or unreadable: nothing to cache
+            self._dir_misses.pop(parent, None)
+            return
+        if generation == self._generation:
+            self._counters["listings_loaded"] += 1
+            self._store_listing(parent, entries, time.monotonic())
+
+    # ───────────────────────────── invalidation ─────────────────────────── #
+
+    def _created(self, path: str, *, subtree: bool = False) -> None:
+        """
+        *path* now exists (with children too, if *subtree*).
+
+        So do its ancestors, some of which the write may have created.
+        """
+        for candidate in _lineage(path):
+            self._missing.pop(candidate, None)
+            parent, name = os.path.split(candidate)
+            if name:
+                self._edit_listing(parent, add=name)
+        if subtree:
+            for missing in [p for p in self._missing if _is_within(p, path)]:
+                del self._missing[missing]
+
+    def _removed(self, path: str) -> None:
+        """*path* (and anything below it) no longer exists."""
+        for directory in [
+            d for d in self._listings if d == path or _is_within(d, path)
+        ]:
+            del self._listings[directory]
+        parent, name = os.path.split(path)
+        self._edit_listing(parent, drop=name)
+
+    def _uncertain(self, path: str) -> None:
+        """A mutation of *path* failed part-way; forget what we knew."""
+        for candidate in _lineage(path):
+            self._missing.pop(candidate, None)
+        self._removed(path)
+        self._listings.pop(os.path.dirname(path), None)
+
+    async def _mutate(
+        self,
+        paths: Tuple[str, ...],
+        operation: Awaitable[None],
+        on_success: Callable[[], None],
+    ) -> None:
+        # Bump before and after, so lookups overlapping the mutation in
+        # either direction are not cached.
+        self._generation += 1
+        try:
+            await operation
+        except BaseException:
+            for path in paths:
+                self._uncertain(path)
+            raise
+        finally:
+            self._generation += 1
+        on_success()
+
+    # ───────────────────────────── operations ───────────────────────────── #
+
+    async def exists(self, path: str) -> bool:
+        now = time.monotonic()
+        if self._negative_ttl and self._known_missing(path, now):
+            self._counters["negative_hits"] += 1
+            return False
+        if self._listing_ttl:
+            parent, name = os.path.split(path)
+            names = self._listing(parent, now)
+            if names is not None:
+                self._counters["listing_hits"] += 1
+                return name in names
+
+        self._counters["lookups"] += 1
+        generation = self._generation
+        found = await super().exists(path)
+        if not found and generation == self._generation:
+            await self._record_miss(path, time.monotonic())
+        return found
+
+    async def scan(self, path: str) -> List[FileStat]:
+        generation = self._generation
+        entries = await super().scan(path)
+        if self._listing_ttl and generation == self._generation:
+            self._store_listing(path, entries, time.monotonic())
+        return entries
+
+    async def write(
+        self,
+        path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await self._mutate(
+            (path,),
+            super().write(
+                path,
+                content,
+                binary=binary,
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            ),
+            lambda: self._created(path),
+        )
+
+    async def writev(
+        self,
+        path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await self._mutate(
+            (path,),
+            super().writev(
+                path,
+                buffers,
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            ),
+            lambda: self._created(path),
+        )
+
+    async def delete(self, path: str) -> None:
+        await self._mutate(
+            (path,), super().delete(path), lambda: self._removed(path)
+        )
+
+    async def mkdir(
+        self,
+        path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        await self._mutate(
+            (path,),
+            super().mkdir(
+                path, parents=parents, permissions=permissions, user=user
+            ),
+            lambda: self._created(path),
+        )
+
+    async def rmdir(self, path: str) -> None:
+        await self._mutate(
+            (path,), super().rmdir(path), lambda: self._removed(path)
+        )
+
+    async def rename(self, src: str, dest: str) -> None:
+        def moved() -> None:
+            self._removed(src)
+            self._created(dest, subtree=True)
+
+        await self._mutate((src, dest), super().rename(src, dest), moved)
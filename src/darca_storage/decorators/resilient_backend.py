@@ -0,0 +1,318 @@
+# src/darca_storage/decorators/resilient_backend.py
+# License: MIT
+"""
+Timeouts, retries and hedged reads for FileBackends.
+
+`ResilientFileBackend` applies a `ResiliencePolicy` to every operation:
+
+• Timeouts - each attempt gets at most ``timeout`` seconds and the whole
+  operation, retries included, at most ``deadline`` seconds; running out
+  raises `StorageOperationTimeout`.  A worker thread stuck in a system call
+  cannot be interrupted, so the timeout frees the caller, not the thread.
+• Retries - transient failures (timeouts, injected faults, ``EIO``,
+  ``ESTALE``, ``EAGAIN``…) are retried with exponential backoff and full
+  jitter.  Only operations that are safe to repeat are retried unless
+  ``retry_operations`` says otherwise.
+• Hedged reads - a read still running after ``hedge_after`` seconds (or
+  after the given percentile of recent read latencies, e.g. ``p95``) gets
+  a second, identical read; the first to succeed wins and the other is
+  cancelled.
+
+`stats()` counts timeouts, retries and hedges.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import errno
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Mapping,
+    Optional,
+    TypeVar,
+)
+
+from darca_storage.decorators.forwarding_backend import ForwardingFileBackend
+from darca_storage.exceptions import (
+    StorageOperationTimeout,
+    StorageSimulatedFault,
+)
+from darca_storage.interfaces.file_backend import FileBackend
+from darca_storage.parameters import get_float, get_int, get_prefixed
+
+T = TypeVar("T")
+
+#: Operations that can be repeated without changing their outcome.
+IDEMPOTENT_OPERATIONS = frozenset(
+    {"read", "exists", "stat", "stat_mtime", "list", "scan", "find"}
+)
+
+TRANSIENT_ERRNOS = frozenset(
+    {
+        errno.EAGAIN,
+        errno.EBUSY,
+        errno.EINTR,
+        errno.EIO,
+        errno.ESTALE,
+        errno.ETIMEDOUT,
+    }
+)
+
+# Reads remembered for percentile hedging, and how many are needed first.
+_LATENCY_WINDOW = 256
+_MIN_SAMPLES = 20
+_REFRESH_EVERY = 32
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    True if *error* (or an exception it was raised from) is worth retrying.
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, (StorageOperationTimeout, TimeoutError)):
+            return True
+        if isinstance(current, StorageSimulatedFault):
+            return True
+        if isinstance(current, OSError) and current.errno in TRANSIENT_ERRNOS:
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    """
+    Timeouts, retries and hedging applied by `ResilientFileBackend`.
+
+    Parameter keys understood by `from_parameters`::
+
+        timeout              seconds per attempt, every operation
+        timeout.<op>         seconds per attempt for one kind (read, ...)
+        deadline             seconds per operation, retries included
+        retries              extra attempts after a transient failure
+        retry_operations     comma-separated operations that may be retried
+                             (default: the read-only ones)
+        retry_backoff        first backoff in seconds (default 0.05)
+        retry_backoff_max    backoff cap in seconds (default 2)
+        hedge_after          seconds before a read is hedged, or ``pNN`` to
+                             hedge at the NNth percentile of recent reads
+    """
+
+    timeout: Optional[float] = None
+    operation_timeout: Dict[str, float] = field(default_factory=dict)
+    deadline: Optional[float] = None
+    retries: int = 0
+    retry_operations: FrozenSet[str] = IDEMPOTENT_OPERATIONS
+    retry_backoff: float = 0.05
+    retry_backoff_max: float = 2.0
+    hedge_after: Optional[float] = None
+    hedge_percentile: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.retries < 0:
+            raise ValueError("retries must not be negative.")
+        if self.hedge_percentile is not None and not (
+            0 < self.hedge_percentile < 100
+        ):
+            raise ValueError("hedge_after percentiles must be p1 to p99.")
+
+    @classmethod
+    def from_parameters(
+        cls, parameters: Mapping[str, str]
+    ) -> ResiliencePolicy:
+        hedge = (parameters.get("hedge_after") or "").strip().lower()
+        operations = parameters.get("retry_operations")
+        return cls(
+            timeout=get_float(parameters, "timeout"),
+            operation_timeout=get_prefixed(parameters, "timeout", get_float),
+            deadline=get_float(parameters, "deadline"),
+            retries=get_int(parameters, "retries") or 0,
+            retry_operations=(
+                _operations(operations.split(","))
+                if operations is not None
+                else IDEMPOTENT_OPERATIONS
+            ),
+            retry_backoff=_default(
+                get_float(parameters, "retry_backoff"), 0.05
+            ),
+            retry_backoff_max=_default(
+                get_float(parameters, "retry_backoff_max"), 2.0
+            ),
+            hedge_after=(
+                get_float(parameters, "hedge_after")
+                if hedge and not hedge.startswith("p")
+                else None
+            ),
+            hedge_percentile=(
+                float(hedge[1:]) if hedge.startswith("p") else None
+            ),
+        )
+
+    def timeout_for(self, operation: str) -> Optional[float]:
+        return self.operation_timeout.get(operation, self.timeout)
+
+    def is_passive(self) -> bool:
+        return (
+            self.timeout is None
+            and not self.operation_timeout
+            and self.deadline is None
+            and not self.retries
+            and self.hedge_after is None
+            and self.hedge_percentile is None
+        )
+
+
+def _operations(names: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(name.strip() for name in names if name.strip())
+
+
+def _default(value: Optional[float], default: float) -> float:
+    return default if value is None else value
+
+
+class ResilientFileBackend(ForwardingFileBackend):
+    """
+    FileBackend decorator enforcing a `ResiliencePolicy`.
+
+    Args:
+        backend: Backend to protect.
+        policy:  Timeouts, retries and hedging to apply.
+    """
+
+    def __init__(
+        self, backend: FileBackend, policy: ResiliencePolicy
+    ) -> None:
+        super().__init__(backend)
+        self._policy = policy
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._samples = 0  # all-time count; the window stops growing
+        self._hedge_delay = policy.hedge_after
+        self._counters = {
+            "timeouts": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+        }
+
+    @property
+    def policy(self) -> ResiliencePolicy:
+        return self._policy
+
+    async def _invoke(
+        self,
+        operation: str,
+        path: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        nbytes: int = 0,
+    ) -> T:
+        policy = self._policy
+        loop = asyncio.get_running_loop()
+        deadline = None
+        if policy.deadline is not None:
+            deadline = loop.time() + policy.deadline
+        retries = policy.retries if operation in policy.retry_operations else 0
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(operation, path, call, deadline)
+            except Exception as error:
+                if attempt >= retries or not is_transient(error):
+                    raise
+                ceiling = policy.retry_backoff * 2**attempt
+                delay = random.uniform(
+                    0, min(policy.retry_backoff_max, ceiling)
+                )
+                if deadline is not None and loop.time() + delay >= deadline:
+                    raise
+            attempt += 1
+            self._counters["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        operation: str,
+        path: str,
+        call: Callable[[], Awaitable[T]],
+        deadline: Optional[float],
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        timeout = self._policy.timeout_for(operation)
+        if deadline is not None:
+            remaining = max(0.0, deadline - loop.time())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        started = loop.time()
+        work = self._hedged(call) if operation == "read" else call()
+        try:
+            result = await asyncio.wait_for(work, timeout)
+        except asyncio.TimeoutError:
+            self._counters["timeouts"] += 1
+            raise StorageOperationTimeout(operation, path, timeout or 0.0)
+        if operation == "read":
+            self._record(loop.time() - started)
+        return result
+
+    # ───────────────────────────── hedging ──────────────────────────────── #
+
+    def _record(self, seconds: float) -> None:
+        percentile = self._policy.hedge_percentile
+        if percentile is None:
+            return
+        self._latencies.append(seconds)
+        self._samples += 1
+        count = len(self._latencies)
+        if count >= _MIN_SAMPLES and (
+            self._hedge_delay is None or self._samples % _REFRESH_EVERY == 0
+        ):
+            ordered = sorted(self._latencies)
+            index = min(count - 1, int(count * percentile / 100))
+            self._hedge_delay = ordered[index]
+
+    async def _hedged(self, call: Callable[[], Awaitable[T]]) -> T:
+        delay = self._hedge_delay
+        if delay is None:
+            return await call()
+        first = asyncio.ensure_future(call())
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            self._counters["hedges"] += 1
+            pending.add(asyncio.ensure_future(call()))
+            failures = []
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._counters["hedge_wins"] += 1
+                        return task.result()
+                    failures.append(task.exception())
+            raise failures[0]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "resilience": {
+                **self._counters,
+                "hedge_delay": self._hedge_delay,
+            },
+        }
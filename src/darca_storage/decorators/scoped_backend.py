@@ -1,10 +1,104 @@
 # src/darca_storage/decorators/scoped_backend.py
 
+from __future__ import annotations
+
 import os
-from typing import List, Optional, Union
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
 
+from darca_storage.decorators.forwarding_backend import (
+    backend_resources,
+    backend_stats,
+    close_backend,
+    flush_backend,
+    invalidate,
+    will_need,
+)
 from darca_storage.exceptions import StorageClientPathViolation
-from darca_storage.interfaces.file_backend import FileBackend
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+    NotModified,
+)
+from darca_storage.path_query import PathQuery
+
+if TYPE_CHECKING:
+    from darca_storage.backends.local_file_backend import (
+        SyncLocalFileBackend,
+    )
+
+# Staging area of `darca_storage.transaction` under the scoped root; kept
+# out of listings, scans and finds of the root.
+STAGING_DIR = ".darca-txn"
+
+
+def resolve_scoped_path(base_path: str, relative_path: str) -> str:
+    """
+    Resolve *relative_path* against *base_path* and reject escapes.
+
+    Raises:
+        StorageClientPathViolation - when traversal attempts to break
+        out of the scoped root (e.g. '../../etc/passwd').
+    """
+    full = os.path.realpath(
+        os.path.abspath(os.path.join(base_path, relative_path))
+    )
+    base = os.path.realpath(base_path)
+
+    if not (full == base or full.startswith(base + os.sep)):
+        raise StorageClientPathViolation(attempted_path=full, base_path=base)
+    return full
+
+
+def _hide_staging(base_path: str, full: str, names: List[str]) -> List[str]:
+    """Drop the staging area from *names* listed under directory *full*."""
+    if full != os.path.realpath(base_path):
+        return names
+    return [
+        name
+        for name in names
+        if name.replace(os.sep, "/").split("/", 1)[0] != STAGING_DIR
+    ]
+
+
+def _hide_staging_stats(
+    base_path: str, full: str, stats: List[FileStat]
+) -> List[FileStat]:
+    if full != os.path.realpath(base_path):
+        return stats
+    return [stat for stat in stats if stat.name != STAGING_DIR]
+
+
+def _skip_staging(base_path: str, full: str, query: PathQuery) -> PathQuery:
+    """*query*, excluding the staging area when it walks the root *full*."""
+    if full != os.path.realpath(base_path):
+        return query
+    return replace(query, exclude=query.exclude + ("/" + STAGING_DIR,))
+
+
+def resolve_scoped_query(
+    base_path: str, relative_path: str, query: PathQuery
+) -> str:
+    """
+    Resolve the directory a `PathQuery` walks and reject escaping patterns.
+
+    The walk itself never follows symbolic links, so only patterns with
+    ``..`` components could reach outside the scoped root.
+
+    Raises:
+        StorageClientPathViolation - for such patterns, or a directory
+        outside the scoped root.
+    """
+    full = resolve_scoped_path(base_path, relative_path)
+    pattern = query.escaping_pattern()
+    if pattern is not None:
+        raise StorageClientPathViolation(
+            attempted_path=os.path.join(full, pattern),
+            base_path=os.path.realpath(base_path),
+        )
+    return full
 
 
 class ScopedFileBackend(FileBackend):
@@ -27,32 +121,59 @@ class ScopedFileBackend(FileBackend):
             StorageClientPathViolation - when traversal attempts to break
             out of the scoped root (e.g. '../../etc/passwd').
         """
-        full = os.path.realpath(
-            os.path.abspath(os.path.join(self._base_path, relative_path))
-        )
-        base = os.path.realpath(self._base_path)
+        return resolve_scoped_path(self._base_path, relative_path)
+
+    @property
+    def base_path(self) -> str:
+        """Absolute root directory all paths are confined to."""
+        return self._base_path
 
-        if not (full == base or full.startswith(base + os.sep)):
-            raise StorageClientPathViolation(
-                attempted_path=full, base_path=base
-            )
-        return full
+    def stats(self) -> Dict[str, Any]:
+        """Statistics reported by the wrapped backend chain (if any)."""
+        return backend_stats(self._backend)
+
+    def resources(self) -> Dict[str, int]:
+        """Resources held by the wrapped backend chain (if any)."""
+        return backend_resources(self._backend)
+
+    async def flush(self) -> None:
+        await flush_backend(self._backend)
+
+    async def close(self) -> None:
+        await close_backend(self._backend)
+
+    async def will_need(self, relative_path: str) -> None:
+        await will_need(self._backend, self._full_path(relative_path))
+
+    def invalidate(self, relative_path: str) -> None:
+        invalidate(self._backend, self._full_path(relative_path))
 
     async def read(
-        self, relative_path: str, *, binary: bool = False
-    ) -> Union[str, bytes]:
+        self,
+        relative_path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
         return await self._backend.read(
-            self._full_path(relative_path), binary=binary
+            self._full_path(relative_path),
+            binary=binary,
+            verify=verify,
+            if_none_match=if_none_match,
         )
 
     async def write(
         self,
         relative_path: str,
-        content: Union[str, bytes],
+        content: Content,
         *,
         binary: bool = False,
         permissions: Optional[int] = None,
         user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
     ) -> None:
         await self._backend.write(
             path=self._full_path(relative_path),
@@ -60,6 +181,30 @@ class ScopedFileBackend(FileBackend):
             binary=binary,
             permissions=permissions,
             user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    async def writev(
+        self,
+        relative_path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await self._backend.writev(
+            self._full_path(relative_path),
+            buffers,
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
         )
 
     async def delete(self, relative_path: str) -> None:
@@ -74,8 +219,11 @@ class ScopedFileBackend(FileBackend):
         *,
         recursive: bool = False,
     ) -> List[str]:
-        return await self._backend.list(
-            self._full_path(relative_path), recursive=recursive
+        full = self._full_path(relative_path)
+        return _hide_staging(
+            self._base_path,
+            full,
+            await self._backend.list(full, recursive=recursive),
         )
 
     async def mkdir(
@@ -104,3 +252,189 @@ class ScopedFileBackend(FileBackend):
 
     async def stat_mtime(self, relative_path: str) -> float:
         return await self._backend.stat_mtime(self._full_path(relative_path))
+
+    async def stat(self, relative_path: str) -> FileStat:
+        return await self._backend.stat(self._full_path(relative_path))
+
+    async def scan(self, relative_path: str = ".") -> List[FileStat]:
+        full = self._full_path(relative_path)
+        return _hide_staging_stats(
+            self._base_path, full, await self._backend.scan(full)
+        )
+
+    async def find(
+        self,
+        relative_path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        full = resolve_scoped_query(self._base_path, relative_path, query)
+        return await self._backend.find(
+            full,
+            _skip_staging(self._base_path, full, query),
+            after=after,
+            limit=limit,
+        )
+
+    async def checksum(
+        self, relative_path: str, algorithm: str = "sha256"
+    ) -> str:
+        return await self._backend.checksum(
+            self._full_path(relative_path), algorithm
+        )
+
+
+class SyncScopedFileBackend:
+    """
+    Blocking counterpart of `ScopedFileBackend`.
+
+    Applies the same `resolve_scoped_path` confinement, then calls a
+    `SyncLocalFileBackend` directly on the caller's thread.
+    """
+
+    def __init__(self, backend: SyncLocalFileBackend, base_path: str) -> None:
+        self._backend: SyncLocalFileBackend = backend
+        self._base_path: str = os.path.abspath(base_path)
+
+    def _full_path(self, relative_path: str) -> str:
+        """Resolve and confine *relative_path* (see `resolve_scoped_path`)."""
+        return resolve_scoped_path(self._base_path, relative_path)
+
+    @property
+    def base_path(self) -> str:
+        """Absolute root directory all paths are confined to."""
+        return self._base_path
+
+    def read(
+        self,
+        relative_path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        return self._backend.read(
+            self._full_path(relative_path),
+            binary=binary,
+            verify=verify,
+            if_none_match=if_none_match,
+        )
+
+    def write(
+        self,
+        relative_path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        self._backend.write(
+            self._full_path(relative_path),
+            content,
+            binary=binary,
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    def writev(
+        self,
+        relative_path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        self._backend.writev(
+            self._full_path(relative_path),
+            buffers,
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    def delete(self, relative_path: str) -> None:
+        self._backend.delete(self._full_path(relative_path))
+
+    def exists(self, relative_path: str) -> bool:
+        return self._backend.exists(self._full_path(relative_path))
+
+    def list(
+        self, relative_path: str = ".", *, recursive: bool = False
+    ) -> List[str]:
+        full = self._full_path(relative_path)
+        return _hide_staging(
+            self._base_path,
+            full,
+            self._backend.list(full, recursive=recursive),
+        )
+
+    def mkdir(
+        self,
+        relative_path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        self._backend.mkdir(
+            self._full_path(relative_path),
+            parents=parents,
+            permissions=permissions,
+            user=user,
+        )
+
+    def rmdir(self, relative_path: str) -> None:
+        self._backend.rmdir(self._full_path(relative_path))
+
+    def rename(self, src_relative: str, dest_relative: str) -> None:
+        self._backend.rename(
+            self._full_path(src_relative),
+            self._full_path(dest_relative),
+        )
+
+    def stat_mtime(self, relative_path: str) -> float:
+        return self._backend.stat_mtime(self._full_path(relative_path))
+
+    def stat(self, relative_path: str) -> FileStat:
+        return self._backend.stat(self._full_path(relative_path))
+
+    def scan(self, relative_path: str = ".") -> List[FileStat]:
+        full = self._full_path(relative_path)
+        return _hide_staging_stats(
+            self._base_path, full, self._backend.scan(full)
+        )
+
+    def find(
+        self,
+        relative_path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        full = resolve_scoped_query(self._base_path, relative_path, query)
+        return self._backend.find(
+            full,
+            _skip_staging(self._base_path, full, query),
+            after=after,
+            limit=limit,
+        )
+
+    def checksum(self, relative_path: str, algorithm: str = "sha256") -> str:
+        return self._backend.checksum(
+            self._full_path(relative_path), algorithm
+        )
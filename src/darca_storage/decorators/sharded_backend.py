@@ -0,0 +1,564 @@
+# src/darca_storage/decorators/sharded_backend.py
+# License: MIT
+"""
+Spread files across several roots (e.g. one per NVMe device).
+
+`ShardedFileBackend` composes N `ScopedFileBackend`s and places each file on
+one of them by *rendezvous* (highest-random-weight) hashing of its relative
+path: every shard scores the path and the highest score wins.  Adding a
+shard therefore only moves the files the new shard now wins (about 1/N of
+them), and `rebalance` moves exactly those.
+
+`mkdir` and `rmdir` fan out to every shard, while a write creates missing
+parent directories on its own shard only.  `list`, `scan` and `find` merge
+the shards that have the directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import posixpath
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from darca_storage.decorators.forwarding_backend import (
+    add_resources,
+    backend_resources,
+    backend_stats,
+    close_backend,
+    flush_backend,
+    will_need,
+)
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.exceptions import StoragePreconditionFailed
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+    NotModified,
+)
+from darca_storage.path_query import PathQuery
+
+T = TypeVar("T")
+
+
+def _key(relative_path: str) -> str:
+    return posixpath.normpath(relative_path)
+
+
+def _score(shard: str, key: str) -> int:
+    digest = hashlib.blake2b(
+        f"{shard}\0{key}".encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
+@dataclass
+class RebalanceReport:
+    """Outcome of `ShardedFileBackend.rebalance`."""
+
+    scanned: int = 0
+    moved: int = 0
+    bytes_moved: int = 0
+    stale_removed: int = 0
+    planned: List[Tuple[str, str, str]] = field(default_factory=list)
+
+
+class ShardedFileBackend(FileBackend):
+    """
+    Scoped FileBackend routing each path to one of several shards.
+
+    Takes relative paths, like `ScopedFileBackend`, so it can back a
+    `StorageClient` directly.
+
+    Args:
+        shards:   Mapping of stable shard name to scoped backend.  Names
+                  (not order) determine placement, so keep them stable.
+        fallback: If the owning shard cannot serve a read-only operation,
+                  try the others in rank order.  Enable this after adding
+                  a shard until `rebalance` has completed.
+
+    Raises:
+        TypeError:  If a shard is not a ScopedFileBackend.
+        ValueError: If no shards are given.
+    """
+
+    def __init__(
+        self,
+        shards: Mapping[str, ScopedFileBackend],
+        *,
+        fallback: bool = False,
+    ) -> None:
+        if not shards:
+            raise ValueError("ShardedFileBackend needs at least one shard.")
+        for name, shard in shards.items():
+            if not isinstance(shard, ScopedFileBackend):
+                raise TypeError(
+                    f"Shard '{name}' must be a ScopedFileBackend, "
+                    f"got {type(shard).__name__}."
+                )
+        self._shards: Dict[str, ScopedFileBackend] = dict(shards)
+        self._fallback = fallback
+        self._fallback_hits = 0
+
+    # ───────────────────────────── placement ────────────────────────────── #
+
+    @property
+    def shards(self) -> Dict[str, ScopedFileBackend]:
+        """Shard backends by name."""
+        return dict(self._shards)
+
+    @property
+    def base_path(self) -> str:
+        """Root of the first shard (for diagnostics)."""
+        return next(iter(self._shards.values())).base_path
+
+    def ranking(self, relative_path: str) -> List[str]:
+        """Shard names ordered by preference for *relative_path*."""
+        key = _key(relative_path)
+        return sorted(
+            self._shards, key=lambda name: _score(name, key), reverse=True
+        )
+
+    def placement(self, relative_path: str) -> str:
+        """Name of the shard owning *relative_path*."""
+        key = _key(relative_path)
+        return max(self._shards, key=lambda name: _score(name, key))
+
+    def _owner(self, key: str) -> ScopedFileBackend:
+        return self._shards[self.placement(key)]
+
+    async def _routed(
+        self, key: str, call: Callable[[ScopedFileBackend], Awaitable[T]]
+    ) -> T:
+        if not self._fallback:
+            return await call(self._owner(key))
+        first_error: Optional[Exception] = None
+        for rank, name in enumerate(self.ranking(key)):
+            try:
+                result = await call(self._shards[name])
+            except Exception as exc:
+                first_error = first_error or exc
+                continue
+            if rank:
+                self._fallback_hits += 1
+            return result
+        assert first_error is not None
+        raise first_error
+
+    async def _holder(self, key: str) -> Tuple[ScopedFileBackend, FileStat]:
+        """The shard serving *key* (see `_routed`) and its stat there."""
+
+        async def stat(
+            shard: ScopedFileBackend,
+        ) -> Tuple[ScopedFileBackend, FileStat]:
+            return shard, await shard.stat(key)
+
+        return await self._routed(key, stat)
+
+    async def _on_holders(
+        self, key: str, call: Callable[[ScopedFileBackend], Awaitable[T]]
+    ) -> List[T]:
+        """
+        Run a read of directory *key* on every shard that has it.
+
+        A directory created implicitly by a write exists only on the shard
+        owning that file, so a shard without it contributes nothing.
+
+        Raises:
+            The owner's error if no shard has the directory, or the error
+            of a shard that has it but failed.
+        """
+        shards = list(self._shards.items())
+        results = await asyncio.gather(
+            *(call(shard) for _, shard in shards), return_exceptions=True
+        )
+        found: List[T] = []
+        errors: Dict[str, BaseException] = {}
+        for (name, shard), result in zip(shards, results):
+            if not isinstance(result, BaseException):
+                found.append(result)
+            elif not isinstance(result, Exception) or await shard.exists(key):
+                raise result
+            else:
+                errors[name] = result
+        if not found:
+            raise errors[self.placement(key)]
+        return found
+
+    async def _everywhere(
+        self, call: Callable[[ScopedFileBackend], Awaitable[T]]
+    ) -> List[T]:
+        results = await asyncio.gather(
+            *(call(shard) for shard in self._shards.values()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results  # type: ignore[return-value]
+
+    # ───────────────────────────── lifecycle ────────────────────────────── #
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sharded": {
+                "shards": len(self._shards),
+                "fallback": self._fallback,
+                "fallback_hits": self._fallback_hits,
+            },
+            "shards": {
+                name: backend_stats(shard)
+                for name, shard in self._shards.items()
+            },
+        }
+
+    def resources(self) -> Dict[str, int]:
+        return add_resources(
+            *(backend_resources(s) for s in self._shards.values())
+        )
+
+    async def flush(self) -> None:
+        await self._everywhere(flush_backend)
+
+    async def close(self) -> None:
+        await self._everywhere(close_backend)
+
+    async def will_need(self, relative_path: str) -> None:
+        key = _key(relative_path)
+        await will_need(self._owner(key), key)
+
+    # ───────────────────────────── operations ───────────────────────────── #
+
+    async def read(
+        self,
+        relative_path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        key = _key(relative_path)
+        return await self._routed(
+            key,
+            lambda shard: shard.read(
+                key, binary=binary, verify=verify, if_none_match=if_none_match
+            ),
+        )
+
+    async def write(
+        self,
+        relative_path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        key = _key(relative_path)
+        await self._owner(key).write(
+            key,
+            content,
+            binary=binary,
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    async def writev(
+        self,
+        relative_path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        key = _key(relative_path)
+        await self._owner(key).writev(
+            key,
+            buffers,
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    async def delete(self, relative_path: str) -> None:
+        key = _key(relative_path)
+        if not self._fallback:
+            await self._owner(key).delete(key)
+            return
+        # Until rebalanced, the file may (also) sit on another shard.
+        shards = list(self._shards.values())
+        found = await self._everywhere(lambda shard: shard.exists(key))
+        holders = [shard for shard, has in zip(shards, found) if has]
+        if not holders:
+            await self._owner(key).delete(key)  # reports the missing file
+            return
+        await asyncio.gather(*(shard.delete(key) for shard in holders))
+
+    async def exists(self, relative_path: str) -> bool:
+        key = _key(relative_path)
+        if await self._owner(key).exists(key):
+            return True
+        if not self._fallback:
+            return False
+        return any(await self._everywhere(lambda shard: shard.exists(key)))
+
+    async def list(
+        self, relative_path: str = ".", *, recursive: bool = False
+    ) -> List[str]:
+        key = _key(relative_path)
+        listings = await self._on_holders(
+            key, lambda shard: shard.list(key, recursive=recursive)
+        )
+        return sorted({entry for listing in listings for entry in listing})
+
+    async def mkdir(
+        self,
+        relative_path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        key = _key(relative_path)
+        await self._everywhere(
+            lambda shard: shard.mkdir(
+                key, parents=parents, permissions=permissions, user=user
+            )
+        )
+
+    async def rmdir(self, relative_path: str) -> None:
+        key = _key(relative_path)
+
+        async def remove(shard: ScopedFileBackend) -> None:
+            if await shard.exists(key):
+                await shard.rmdir(key)
+
+        await self._everywhere(remove)
+
+    async def rename(self, src_relative: str, dest_relative: str) -> None:
+        """
+        Rename a file or directory.
+
+        A file moves from the shard holding it to the shard owning its new
+        name (copy + delete when that is another shard, keeping its
+        checksum and permissions).  A directory is renamed on every shard
+        and its files are then rebalanced.
+        """
+        src, dest = _key(src_relative), _key(dest_relative)
+        src_shard, src_stat = await self._holder(src)
+        if src_stat.is_dir:
+            await self._everywhere(
+                lambda shard: self._rename_dir_on(shard, src, dest)
+            )
+            await self.rebalance(dest)
+            return
+
+        dest_shard = self._owner(dest)
+        if src_shard is dest_shard:
+            await src_shard.rename(src, dest)
+            return
+        await self._transfer(src_shard, src, src_stat, dest_shard, dest)
+
+    @staticmethod
+    async def _rename_dir_on(
+        shard: ScopedFileBackend, src: str, dest: str
+    ) -> None:
+        if await shard.exists(src):
+            await shard.rename(src, dest)
+
+    async def stat_mtime(self, relative_path: str) -> float:
+        key = _key(relative_path)
+        return await self._routed(key, lambda shard: shard.stat_mtime(key))
+
+    async def stat(self, relative_path: str) -> FileStat:
+        key = _key(relative_path)
+        return await self._routed(key, lambda shard: shard.stat(key))
+
+    async def scan(self, relative_path: str = ".") -> List[FileStat]:
+        key = _key(relative_path)
+        merged: Dict[str, FileStat] = {}
+        for entries in await self._on_holders(
+            key, lambda shard: shard.scan(key)
+        ):
+            for entry in entries:
+                known = merged.get(entry.name)
+                # Directories appear on every shard; report the newest.
+                if known is None or entry.mtime > known.mtime:
+                    merged[entry.name] = entry
+        return [merged[name] for name in sorted(merged)]
+
+    async def find(
+        self,
+        relative_path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        key = _key(relative_path)
+        pages = await self._on_holders(
+            key,
+            lambda shard: shard.find(key, query, after=after, limit=limit),
+        )
+        # Every shard's page starts right after *after*, so the first
+        # *limit* of their union, in walk order, are the merged page.
+        merged = sorted(
+            {entry for page in pages for entry in page},
+            key=lambda entry: entry.split("/"),
+        )
+        return merged if limit is None else merged[:limit]
+
+    async def checksum(
+        self, relative_path: str, algorithm: str = "sha256"
+    ) -> str:
+        key = _key(relative_path)
+        return await self._routed(
+            key, lambda shard: shard.checksum(key, algorithm)
+        )
+
+    # ───────────────────────────── rebalancing ──────────────────────────── #
+
+    async def rebalance(
+        self,
+        relative_path: str = ".",
+        *,
+        dry_run: bool = False,
+        concurrency: int = 8,
+    ) -> RebalanceReport:
+        """
+        Move every file under *relative_path* to the shard that owns it.
+
+        Run this after adding a shard (with ``fallback=True`` meanwhile).
+        A file is copied with ``if_none_match="*"``, so a newer copy that
+        was already written to the owner wins and the misplaced one is just
+        removed.  Write-time checksums are recomputed on the new shard and
+        permissions are carried over; ownership is not.
+
+        Args:
+            relative_path: Subtree to rebalance.
+            dry_run:       Only list the moves in `RebalanceReport.planned`.
+            concurrency:   Maximum number of files moved at once.
+        """
+        report = RebalanceReport()
+        limit = asyncio.Semaphore(max(1, concurrency))
+        moves = []
+        for name, shard in self._shards.items():
+            for path in await self._walk(shard, _key(relative_path)):
+                report.scanned += 1
+                owner = self.placement(path)
+                if owner == name:
+                    continue
+                if dry_run:
+                    report.planned.append((path, name, owner))
+                else:
+                    moves.append(self._move(limit, report, path, name))
+        await asyncio.gather(*moves)
+        return report
+
+    async def _walk(self, shard: ScopedFileBackend, root: str) -> List[str]:
+        if not await shard.exists(root):
+            return []
+        files: List[str] = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            for entry in await shard.scan(directory):
+                path = posixpath.normpath(f"{directory}/{entry.name}")
+                if entry.is_dir:
+                    stack.append(path)
+                else:
+                    files.append(path)
+        return files
+
+    async def _move(
+        self,
+        limit: asyncio.Semaphore,
+        report: RebalanceReport,
+        path: str,
+        source_name: str,
+    ) -> None:
+        source = self._shards[source_name]
+        async with limit:
+            # `scan` entries carry no etag; `stat` reports the checksum.
+            copied = await self._transfer(
+                source,
+                path,
+                await source.stat(path),
+                self._owner(path),
+                path,
+                exclusive=True,
+            )
+        if copied is None:
+            report.stale_removed += 1  # the owner has a newer copy
+        else:
+            report.moved += 1
+            report.bytes_moved += copied
+
+    @staticmethod
+    async def _transfer(
+        source: ScopedFileBackend,
+        src: str,
+        src_stat: FileStat,
+        target: ScopedFileBackend,
+        dest: str,
+        *,
+        exclusive: bool = False,
+    ) -> Optional[int]:
+        """
+        Copy file *src* of *source* to *dest* on *target*, then delete it.
+
+        The write-time checksum algorithm (from the etag of *src_stat*) and
+        the permissions are kept.  Returns the bytes copied, or None when
+        *exclusive* and *dest* already existed (nothing is copied then).
+        """
+        etag = src_stat.etag or ""
+        checksum = (
+            etag.split(":", 1)[0]
+            if ":" in etag and not etag.startswith("W/")
+            else None
+        )
+        data = await source.read(src, binary=True)
+        parent = posixpath.dirname(dest) or "."
+        if not await target.exists(parent):
+            await target.mkdir(parent, parents=True)
+        try:
+            await target.write(
+                dest,
+                data,
+                binary=True,
+                permissions=src_stat.mode,
+                checksum=checksum,
+                if_none_match="*" if exclusive else None,
+            )
+        except StoragePreconditionFailed:  # only when exclusive
+            copied = None
+        else:
+            copied = len(data)
+        await source.delete(src)
+        return copied
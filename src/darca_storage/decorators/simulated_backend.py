@@ -0,0 +1,278 @@
+# src/darca_storage/decorators/simulated_backend.py
+# License: MIT
+"""
+Slow, flaky storage on demand, for load tests and capacity planning.
+
+`SimulatedFileBackend` makes a fast backend behave like a remote or
+overloaded one.  Before each operation it sleeps for a latency drawn from
+a configurable distribution (per operation if wanted), occasionally
+stalls for much longer, and fails a configurable fraction of operations
+with `StorageSimulatedFault` without touching the wrapped backend.  Read
+and write payloads are paced through token buckets to cap throughput.
+
+Everything is driven by a seeded random generator, so a run can be
+repeated exactly.  `stats()` reports what was injected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from darca_storage.decorators.forwarding_backend import (
+    ForwardingFileBackend,
+    content_size,
+)
+from darca_storage.decorators.throttled_backend import TokenBucket
+from darca_storage.exceptions import StorageSimulatedFault
+from darca_storage.executors import register_fork_handler
+from darca_storage.interfaces.file_backend import FileBackend
+from darca_storage.parameters import (
+    get_float,
+    get_int,
+    get_prefixed,
+    with_prefix,
+)
+
+T = TypeVar("T")
+
+_ARITY = {
+    "fixed": 1,
+    "uniform": 2,
+    "normal": 2,
+    "lognormal": 2,
+    "exponential": 1,
+}
+
+# Buckets hold a tenth of a second of transfer, so bursts stay short.
+_BURST_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class Latency:
+    """
+    A latency distribution in seconds, parsed from ``kind:arg,arg``::
+
+        0.005                   fixed 5 ms (same as fixed:0.005)
+        uniform:0.001,0.010     uniform between 1 and 10 ms
+        normal:0.005,0.001      mean, standard deviation (clamped at 0)
+        lognormal:0.004,0.5     median, sigma - a long right tail
+        exponential:0.005       mean
+    """
+
+    kind: str
+    args: Tuple[float, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> Latency:
+        kind, _, raw = spec.partition(":")
+        if not raw:
+            kind, raw = "fixed", spec
+        kind = kind.strip().lower()
+        if kind not in _ARITY:
+            raise ValueError(f"Unknown latency distribution {kind!r}.")
+        try:
+            args = tuple(float(arg) for arg in raw.split(","))
+        except ValueError:
+            raise ValueError(f"Latency {spec!r} needs numeric arguments.")
+        if len(args) != _ARITY[kind] or any(arg < 0 for arg in args):
+            raise ValueError(
+                f"Latency {spec!r} needs {_ARITY[kind]} non-negative "
+                "argument(s)."
+            )
+        return cls(kind, args)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency from *rng*."""
+        first = self.args[0]
+        if self.kind == "uniform":
+            return rng.uniform(first, self.args[1])
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(first, self.args[1]))
+        if self.kind == "lognormal":
+            if not first:
+                return 0.0
+            return rng.lognormvariate(math.log(first), self.args[1])
+        if self.kind == "exponential":
+            return rng.expovariate(1 / first) if first else 0.0
+        return first
+
+
+@dataclass(frozen=True)
+class SimulationProfile:
+    """
+    What `SimulatedFileBackend` injects; the defaults inject nothing.
+
+    Parameter keys understood by `from_parameters`::
+
+        simulate_latency                 `Latency` spec for every operation
+        simulate_latency.<op>            spec for one kind (read, write, ...)
+        simulate_read_bytes_per_second   read throughput cap
+        simulate_write_bytes_per_second  write throughput cap
+        simulate_error_rate              fraction of operations that fail
+        simulate_error_rate.<op>         fraction for one kind
+        simulate_stall_rate              fraction of operations that stall
+        simulate_stall_seconds           length of a stall (default 1)
+        simulate_seed                    random seed, for repeatable runs
+    """
+
+    latency: Optional[Latency] = None
+    operation_latency: Dict[str, Latency] = field(default_factory=dict)
+    read_bytes_per_second: Optional[float] = None
+    write_bytes_per_second: Optional[float] = None
+    error_rate: float = 0.0
+    operation_error_rate: Dict[str, float] = field(default_factory=dict)
+    stall_rate: float = 0.0
+    stall_seconds: float = 1.0
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        rates = [self.error_rate, self.stall_rate]
+        rates.extend(self.operation_error_rate.values())
+        if any(not 0.0 <= rate <= 1.0 for rate in rates):
+            raise ValueError("Simulated error and stall rates must be 0-1.")
+
+    @classmethod
+    def from_parameters(
+        cls, parameters: Mapping[str, str]
+    ) -> SimulationProfile:
+        latency = parameters.get("simulate_latency")
+        return cls(
+            latency=Latency.parse(latency) if latency else None,
+            operation_latency={
+                op: Latency.parse(spec)
+                for op, spec in with_prefix(
+                    parameters, "simulate_latency"
+                ).items()
+            },
+            read_bytes_per_second=get_float(
+                parameters, "simulate_read_bytes_per_second"
+            ),
+            write_bytes_per_second=get_float(
+                parameters, "simulate_write_bytes_per_second"
+            ),
+            error_rate=get_float(parameters, "simulate_error_rate") or 0.0,
+            operation_error_rate=get_prefixed(
+                parameters, "simulate_error_rate", get_float
+            ),
+            stall_rate=get_float(parameters, "simulate_stall_rate") or 0.0,
+            stall_seconds=(
+                get_float(parameters, "simulate_stall_seconds") or 1.0
+            ),
+            seed=get_int(parameters, "simulate_seed"),
+        )
+
+    def is_inert(self) -> bool:
+        return (
+            self.latency is None
+            and not self.operation_latency
+            and self.read_bytes_per_second is None
+            and self.write_bytes_per_second is None
+            and not self.error_rate
+            and not any(self.operation_error_rate.values())
+            and not self.stall_rate
+        )
+
+
+class SimulatedFileBackend(ForwardingFileBackend):
+    """
+    FileBackend decorator injecting the latency, stalls, faults and
+    throughput caps of a `SimulationProfile`.
+
+    Args:
+        backend: Backend to slow down.
+        profile: What to inject.
+    """
+
+    def __init__(
+        self, backend: FileBackend, profile: SimulationProfile
+    ) -> None:
+        super().__init__(backend)
+        self._profile = profile
+        self._rng = random.Random(profile.seed)
+        self._counters = {
+            "operations": 0,
+            "faults": 0,
+            "stalls": 0,
+            "delay_seconds": 0.0,
+            "transfer_seconds": 0.0,
+        }
+        self._build_buckets()
+        register_fork_handler(self)
+
+    def _build_buckets(self) -> None:
+        rates = {
+            "read": self._profile.read_bytes_per_second,
+            "write": self._profile.write_bytes_per_second,
+        }
+        self._buckets = {
+            direction: (
+                TokenBucket(rate, rate * _BURST_SECONDS) if rate else None
+            )
+            for direction, rate in rates.items()
+        }
+
+    def _reset_after_fork(self) -> None:
+        # Buckets may hold waiters of the parent's loop.
+        self._build_buckets()
+
+    @property
+    def profile(self) -> SimulationProfile:
+        return self._profile
+
+    def _delay(self, operation: str) -> float:
+        profile = self._profile
+        latency = profile.operation_latency.get(operation, profile.latency)
+        delay = latency.sample(self._rng) if latency is not None else 0.0
+        if profile.stall_rate and self._rng.random() < profile.stall_rate:
+            self._counters["stalls"] += 1
+            delay += profile.stall_seconds
+        return delay
+
+    def _fails(self, operation: str) -> bool:
+        rate = self._profile.operation_error_rate.get(
+            operation, self._profile.error_rate
+        )
+        return bool(rate) and self._rng.random() < rate
+
+    async def _transfer(self, direction: str, nbytes: int) -> None:
+        bucket = self._buckets[direction]
+        if bucket is not None and nbytes:
+            self._counters["transfer_seconds"] += await bucket.acquire(nbytes)
+
+    async def _invoke(
+        self,
+        operation: str,
+        path: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        nbytes: int = 0,
+    ) -> T:
+        self._counters["operations"] += 1
+        delay = self._delay(operation)
+        if delay:
+            self._counters["delay_seconds"] += delay
+            await asyncio.sleep(delay)
+        if self._fails(operation):
+            self._counters["faults"] += 1
+            raise StorageSimulatedFault(operation, path)
+        await self._transfer("write", nbytes)
+        result = await call()
+        if operation == "read":
+            await self._transfer("read", content_size(result))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "simulated": dict(self._counters)}
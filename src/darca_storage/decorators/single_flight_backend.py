@@ -0,0 +1,274 @@
+# src/darca_storage/decorators/single_flight_backend.py
+# License: MIT
+"""
+Request coalescing ("single-flight") for read-only FileBackend operations.
+
+While a `read`, `exists`, `stat_mtime`, `stat`, `list`, `scan` or `find`
+call for a given path is in flight, identical calls join it instead of
+issuing their own disk operation.  Any mutation touching the path (`write`,
+`delete`, `mkdir`, `rmdir`, `rename`) drops the shared call, so callers
+arriving afterwards always start a fresh one.
+
+Cancelling one waiter never cancels the shared operation for the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from darca_storage.decorators.forwarding_backend import ForwardingFileBackend
+from darca_storage.executors import register_fork_handler
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+    NotModified,
+)
+from darca_storage.path_query import PathQuery
+
+T = TypeVar("T")
+
+_FlightKey = Tuple[str, str, Any]
+
+
+def _is_within(path: str, parent: str) -> bool:
+    return path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+class SingleFlightFileBackend(ForwardingFileBackend):
+    """FileBackend decorator sharing concurrent identical read operations."""
+
+    def __init__(self, backend: FileBackend) -> None:
+        super().__init__(backend)
+        self._flights: Dict[_FlightKey, asyncio.Future] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        register_fork_handler(self)
+
+    def _reset_after_fork(self) -> None:
+        # In-flight futures belong to the parent's event loop.
+        self._flights.clear()
+
+    async def _coalesce(
+        self, key: _FlightKey, call: Callable[[], Awaitable[T]]
+    ) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda f, k=key: self._land(k, f))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _land(self, key: _FlightKey, flight: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            flight.exception()  # mark retrieved even if every waiter left
+
+    def _invalidate(self, *paths: str) -> None:
+        """Detach in-flight calls on, above or below any of *paths*."""
+        for key in list(self._flights):
+            target = key[1]
+            if any(
+                target == p or _is_within(p, target) or _is_within(target, p)
+                for p in paths
+            ):
+                del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "single_flight": {
+                "in_flight": len(self._flights),
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+            },
+        }
+
+    def invalidate(self, path: str) -> None:
+        self._invalidate(path)
+        super().invalidate(path)
+
+    async def close(self) -> None:
+        # Let shared calls finish for the callers still waiting on them.
+        flights = list(self._flights.values())
+        if flights:
+            await asyncio.gather(*flights, return_exceptions=True)
+        await super().close()
+
+    # ────────────────────────── coalesced reads ─────────────────────────── #
+
+    async def read(
+        self,
+        path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        return await self._coalesce(
+            ("read", path, (binary, verify, if_none_match)),
+            lambda: self._backend.read(
+                path,
+                binary=binary,
+                verify=verify,
+                if_none_match=if_none_match,
+            ),
+        )
+
+    async def exists(self, path: str) -> bool:
+        return await self._coalesce(
+            ("exists", path, None), lambda: self._backend.exists(path)
+        )
+
+    async def stat_mtime(self, path: str) -> float:
+        return await self._coalesce(
+            ("stat_mtime", path, None),
+            lambda: self._backend.stat_mtime(path),
+        )
+
+    async def stat(self, path: str) -> FileStat:
+        return await self._coalesce(
+            ("stat", path, None), lambda: self._backend.stat(path)
+        )
+
+    async def list(
+        self, base_path: str, *, recursive: bool = False
+    ) -> List[str]:
+        # Callers get their own copy so one cannot mutate another's result.
+        return list(
+            await self._coalesce(
+                ("list", base_path, recursive),
+                lambda: self._backend.list(base_path, recursive=recursive),
+            )
+        )
+
+    async def scan(self, path: str) -> List[FileStat]:
+        return list(
+            await self._coalesce(
+                ("scan", path, None), lambda: self._backend.scan(path)
+            )
+        )
+
+    async def find(
+        self,
+        path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        return list(
+            await self._coalesce(
+                ("find", path, (query, after, limit)),
+                lambda: self._backend.find(
+                    path, query, after=after, limit=limit
+                ),
+            )
+        )
+
+    # ──────────────────────────── mutations ─────────────────────────────── #
+
+    async def _mutate(
+        self, paths: Tuple[str, ...], operation: Awaitable[None]
+    ) -> None:
+        # *operation* is an un-awaited coroutine: nothing runs until the
+        # in-flight reads have been detached.
+        self._invalidate(*paths)
+        try:
+            await operation
+        finally:
+            # Reads that started while the mutation ran may have seen the
+            # old state; do not let later callers join them.
+            self._invalidate(*paths)
+
+    async def write(
+        self,
+        path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await self._mutate(
+            (path,),
+            super().write(
+                path,
+                content,
+                binary=binary,
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            ),
+        )
+
+    async def writev(
+        self,
+        path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        await self._mutate(
+            (path,),
+            super().writev(
+                path,
+                buffers,
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+                if_match=if_match,
+                if_none_match=if_none_match,
+            ),
+        )
+
+    async def delete(self, path: str) -> None:
+        await self._mutate((path,), super().delete(path))
+
+    async def mkdir(
+        self,
+        path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        await self._mutate(
+            (path,),
+            super().mkdir(
+                path, parents=parents, permissions=permissions, user=user
+            ),
+        )
+
+    async def rmdir(self, path: str) -> None:
+        await self._mutate((path,), super().rmdir(path))
+
+    async def rename(self, src: str, dest: str) -> None:
+        await self._mutate((src, dest), super().rename(src, dest))
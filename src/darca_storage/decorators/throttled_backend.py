@@ -0,0 +1,360 @@
+# src/darca_storage/decorators/throttled_backend.py
+# License: MIT
+"""
+Admission control for FileBackends.
+
+`ThrottledFileBackend` bounds how much work a single client can push into the
+shared worker threads:
+
+• Concurrency semaphores - a global cap and optional per-operation caps.
+• Token buckets - operations per second and payload bytes per second.
+• Fair scheduling - clients sharing a `FairScheduler` get slots round-robin
+  per tenant, so one busy tenant cannot starve the others.
+
+Every time a limit makes a caller wait it is counted, and `stats()` reports
+the counts together with wait time and in-flight operations.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Mapping,
+    Optional,
+    TypeVar,
+)
+
+from darca_storage.decorators.forwarding_backend import (
+    ForwardingFileBackend,
+    content_size,
+)
+from darca_storage.executors import register_fork_handler
+from darca_storage.interfaces.file_backend import FileBackend
+from darca_storage.parameters import get_float, get_int, get_prefixed
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ThrottleLimits:
+    """
+    Limits enforced by `ThrottledFileBackend`; None means unlimited.
+
+    Parameter keys understood by `from_parameters`::
+
+        max_concurrency          total in-flight operations
+        max_concurrency.<op>     in-flight operations of one kind (read, ...)
+        ops_per_second           sustained operation rate
+        bytes_per_second         sustained read + write payload rate
+        burst_seconds            bucket depth, in seconds of rate (default 1)
+    """
+
+    max_concurrency: Optional[int] = None
+    operation_concurrency: Dict[str, int] = field(default_factory=dict)
+    ops_per_second: Optional[float] = None
+    bytes_per_second: Optional[float] = None
+    burst_seconds: float = 1.0
+
+    @classmethod
+    def from_parameters(cls, parameters: Mapping[str, str]) -> ThrottleLimits:
+        return cls(
+            max_concurrency=get_int(parameters, "max_concurrency"),
+            operation_concurrency=get_prefixed(
+                parameters, "max_concurrency", get_int
+            ),
+            ops_per_second=get_float(parameters, "ops_per_second"),
+            bytes_per_second=get_float(parameters, "bytes_per_second"),
+            burst_seconds=get_float(parameters, "burst_seconds") or 1.0,
+        )
+
+    def is_unlimited(self) -> bool:
+        return (
+            self.max_concurrency is None
+            and not self.operation_concurrency
+            and self.ops_per_second is None
+            and self.bytes_per_second is None
+        )
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket.
+
+    Requests larger than the bucket depth are admitted once the bucket is
+    full and leave it in debt, so large payloads are paced rather than
+    rejected.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        self._rate = rate
+        self._capacity = capacity if capacity and capacity > 0 else rate
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Take *amount* tokens, sleeping as needed; return seconds waited."""
+        async with self._lock:
+            self._refill()
+            needed = min(amount, self._capacity)
+            waited = 0.0
+            if self._tokens < needed:
+                waited = (needed - self._tokens) / self._rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self._tokens -= amount
+            return waited
+
+
+class FairScheduler:
+    """
+    Round-robin slot scheduler shared by several clients.
+
+    At most *max_concurrency* operations run at once across all tenants.
+    When slots are contended, waiting tenants are served in turn, one
+    operation each, regardless of how many operations each has queued.
+    """
+
+    _shared: Dict[str, FairScheduler] = {}
+
+    def __init__(self, max_concurrency: int) -> None:
+        if max_concurrency < 1:
+            raise ValueError("FairScheduler needs at least one slot.")
+        self._max = max_concurrency
+        self._active = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {}
+        self._turns: Deque[str] = deque()
+        self._waits: Dict[str, int] = {}
+        register_fork_handler(self)
+
+    def _reset_after_fork(self) -> None:
+        # Waiters belong to the parent's event loop; start afresh.
+        self._active = 0
+        self._queues.clear()
+        self._turns.clear()
+
+    @classmethod
+    def shared(cls, key: str, max_concurrency: int) -> FairScheduler:
+        """
+        Return the process-wide scheduler registered under *key*.
+
+        The first caller fixes the number of slots.
+        """
+        scheduler = cls._shared.get(key)
+        if scheduler is None:
+            scheduler = cls._shared[key] = cls(max_concurrency)
+        return scheduler
+
+    async def acquire(self, tenant: str) -> bool:
+        """Wait for a slot; return True if the caller had to queue."""
+        if self._active < self._max and not self._turns:
+            self._active += 1
+            return False
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(tenant, deque())
+        if not queue:
+            self._turns.append(tenant)
+        queue.append(future)
+        self._waits[tenant] = self._waits.get(tenant, 0) + 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # slot was granted as we were cancelled
+            raise
+        return True
+
+    def release(self) -> None:
+        """Return a slot and hand it to the next tenant in turn."""
+        self._active -= 1
+        while self._turns and self._active < self._max:
+            tenant = self._turns.popleft()
+            queue = self._queues[tenant]
+            while queue and queue[0].done():
+                queue.popleft()  # cancelled while waiting
+            if queue:
+                self._active += 1
+                queue.popleft().set_result(None)
+            if queue:
+                self._turns.append(tenant)
+            else:
+                del self._queues[tenant]
+
+    @asynccontextmanager
+    async def slot(self, tenant: str) -> AsyncIterator[bool]:
+        queued = await self.acquire(tenant)
+        try:
+            yield queued
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "slots": self._max,
+            "active": self._active,
+            "queued": {t: len(q) for t, q in self._queues.items()},
+            "waits": dict(self._waits),
+        }
+
+
+class ThrottledFileBackend(ForwardingFileBackend):
+    """
+    FileBackend decorator enforcing `ThrottleLimits`.
+
+    Args:
+        backend:   Backend to protect.
+        limits:    Per-client limits.
+        scheduler: Optional `FairScheduler` shared with other clients.
+        tenant:    Name this client queues under in *scheduler*.
+    """
+
+    def __init__(
+        self,
+        backend: FileBackend,
+        limits: ThrottleLimits,
+        *,
+        scheduler: Optional[FairScheduler] = None,
+        tenant: str = "default",
+    ) -> None:
+        super().__init__(backend)
+        self._limits = limits
+        self._scheduler = scheduler
+        self._tenant = tenant
+        self._limit_hits: Dict[str, int] = {}
+        self._wait_seconds = 0.0
+        self._build_primitives()
+        register_fork_handler(self)
+
+    def _build_primitives(self) -> None:
+        limits = self._limits
+        self._semaphore = (
+            asyncio.Semaphore(limits.max_concurrency)
+            if limits.max_concurrency
+            else None
+        )
+        self._op_semaphores = {
+            op: asyncio.Semaphore(n)
+            for op, n in limits.operation_concurrency.items()
+        }
+        burst = limits.burst_seconds
+        self._ops_bucket = (
+            TokenBucket(limits.ops_per_second, limits.ops_per_second * burst)
+            if limits.ops_per_second
+            else None
+        )
+        self._bytes_bucket = (
+            TokenBucket(
+                limits.bytes_per_second, limits.bytes_per_second * burst
+            )
+            if limits.bytes_per_second
+            else None
+        )
+        self._in_flight: Dict[str, int] = {}
+
+    def _reset_after_fork(self) -> None:
+        # Semaphores and buckets may hold waiters of the parent's loop.
+        self._build_primitives()
+
+    @property
+    def limits(self) -> ThrottleLimits:
+        return self._limits
+
+    def _record_wait(self, limit: str, seconds: float) -> None:
+        self._limit_hits[limit] = self._limit_hits.get(limit, 0) + 1
+        self._wait_seconds += seconds
+
+    async def _acquire_semaphore(
+        self, stack: AsyncExitStack, semaphore: asyncio.Semaphore, limit: str
+    ) -> None:
+        contended = semaphore.locked()
+        started = time.monotonic()
+        await stack.enter_async_context(semaphore)
+        if contended:
+            self._record_wait(limit, time.monotonic() - started)
+
+    async def _charge_bytes(self, nbytes: int) -> None:
+        if self._bytes_bucket is not None and nbytes:
+            waited = await self._bytes_bucket.acquire(nbytes)
+            if waited:
+                self._record_wait("bytes_per_second", waited)
+
+    @asynccontextmanager
+    async def _admission(self, operation: str) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            if self._ops_bucket is not None:
+                waited = await self._ops_bucket.acquire()
+                if waited:
+                    self._record_wait("ops_per_second", waited)
+
+            op_semaphore = self._op_semaphores.get(operation)
+            if op_semaphore is not None:
+                await self._acquire_semaphore(
+                    stack, op_semaphore, f"max_concurrency.{operation}"
+                )
+            if self._semaphore is not None:
+                await self._acquire_semaphore(
+                    stack, self._semaphore, "max_concurrency"
+                )
+            if self._scheduler is not None:
+                started = time.monotonic()
+                queued = await stack.enter_async_context(
+                    self._scheduler.slot(self._tenant)
+                )
+                if queued:
+                    self._record_wait(
+                        "fair_queue", time.monotonic() - started
+                    )
+
+            self._in_flight[operation] = self._in_flight.get(operation, 0) + 1
+            try:
+                yield
+            finally:
+                self._in_flight[operation] -= 1
+
+    async def _invoke(
+        self,
+        operation: str,
+        path: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        nbytes: int = 0,
+    ) -> T:
+        await self._charge_bytes(nbytes)
+        async with self._admission(operation):
+            result = await call()
+        if operation == "read":
+            # Read sizes are only known afterwards; charge them so the
+            # *next* operations are paced.
+            await self._charge_bytes(content_size(result))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        throttle: Dict[str, Any] = {
+            "tenant": self._tenant,
+            "limit_hits": dict(self._limit_hits),
+            "wait_seconds": self._wait_seconds,
+            "in_flight": {k: v for k, v in self._in_flight.items() if v},
+        }
+        if self._scheduler is not None:
+            throttle["fair_queue"] = self._scheduler.stats()
+        return {**super().stats(), "throttle": throttle}
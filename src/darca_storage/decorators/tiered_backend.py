@@ -0,0 +1,615 @@
+# src/darca_storage/decorators/tiered_backend.py
+# License: MIT
+"""
+Two-tier storage: a small fast tier caching a large slow tier.
+
+`TieredFileBackend` composes two `ScopedFileBackend`s, typically a local SSD
+root in front of an NFS mount:
+
+• Reads are served from the fast tier when the file is cached there.
+  Otherwise the file is read from the slow tier and *promoted* into the fast
+  tier.  The least-recently-used clean files are evicted once the cached
+  payload exceeds `capacity_bytes`.
+• Writes go *through* (slow tier first, then the cache) or *behind* (cache
+  first, copied to the slow tier by a background task; `flush` waits for
+  the copies).  Files not yet copied are never evicted.
+
+The slow tier is authoritative: metadata operations (`stat`, `scan`,
+`list`…), verified and conditional reads, and conditional writes go to it,
+after any pending write-behind copies below the path have landed.
+
+The cache starts cold, and it assumes the slow tier is changed only through
+this backend.  Pass ``revalidate=True`` to check the slow tier's mtime before
+each cache hit when other writers exist.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import posixpath
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from darca_storage.decorators.forwarding_backend import (
+    add_resources,
+    backend_resources,
+    backend_stats,
+    close_backend,
+    content_size,
+    will_need,
+)
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.executors import register_fork_handler
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileBackend,
+    FileStat,
+    NotModified,
+)
+from darca_storage.path_query import PathQuery
+
+WRITE_THROUGH = "through"
+WRITE_BEHIND = "behind"
+
+
+@dataclass
+class _CacheEntry:
+    size: int
+    slow_mtime: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class _PendingWrite:
+    permissions: Optional[int]
+    user: Optional[str]
+    checksum: Optional[str]
+
+
+_Put = Callable[..., Awaitable[None]]
+
+
+def _key(relative_path: str) -> str:
+    return posixpath.normpath(relative_path)
+
+
+def _is_under(key: str, path: str) -> bool:
+    """True if *key* is *path* itself or lies below it."""
+    return path == "." or key == path or key.startswith(path + "/")
+
+
+class TieredFileBackend(FileBackend):
+    """
+    Scoped FileBackend caching a slow tier in a fast tier.
+
+    Takes relative paths, like `ScopedFileBackend`, so it can back a
+    `StorageClient` directly.
+
+    Args:
+        fast:           Scoped backend holding the cache.  Its root should be
+                        dedicated to this cache.
+        slow:           Scoped, authoritative capacity backend.
+        capacity_bytes: Payload budget of the fast tier; None is unbounded.
+        write_policy:   ``"through"`` (default) or ``"behind"``.
+        revalidate:     Compare the slow tier's mtime before serving a hit.
+
+    Raises:
+        TypeError:  If either tier is not a ScopedFileBackend.
+        ValueError: If *write_policy* or *capacity_bytes* is invalid.
+    """
+
+    def __init__(
+        self,
+        fast: ScopedFileBackend,
+        slow: ScopedFileBackend,
+        *,
+        capacity_bytes: Optional[int] = None,
+        write_policy: str = WRITE_THROUGH,
+        revalidate: bool = False,
+    ) -> None:
+        for name, tier in (("fast", fast), ("slow", slow)):
+            if not isinstance(tier, ScopedFileBackend):
+                raise TypeError(
+                    f"The {name} tier must be a ScopedFileBackend, "
+                    f"got {type(tier).__name__}."
+                )
+        if write_policy not in (WRITE_THROUGH, WRITE_BEHIND):
+            raise ValueError(
+                f"write_policy must be '{WRITE_THROUGH}' or "
+                f"'{WRITE_BEHIND}', got {write_policy!r}"
+            )
+        if capacity_bytes is not None and capacity_bytes < 0:
+            raise ValueError("capacity_bytes must not be negative.")
+
+        self._fast = fast
+        self._slow = slow
+        self._capacity = capacity_bytes
+        self._write_policy = write_policy
+        self._revalidate = revalidate
+
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._cached_bytes = 0
+        self._dirty: Dict[str, _PendingWrite] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self._fast_dirs = {"."}
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "promotions": 0,
+            "evictions": 0,
+            "flushed": 0,
+            "flush_errors": 0,
+        }
+        register_fork_handler(self)
+
+    def _reset_after_fork(self) -> None:
+        # Flush tasks and locks belong to the parent's event loop.
+        self._pending.clear()
+        self._locks.clear()
+
+    # ───────────────────────────── properties ───────────────────────────── #
+
+    @property
+    def fast(self) -> ScopedFileBackend:
+        """The cache tier."""
+        return self._fast
+
+    @property
+    def slow(self) -> ScopedFileBackend:
+        """The authoritative capacity tier."""
+        return self._slow
+
+    @property
+    def base_path(self) -> str:
+        """Root directory of the authoritative (slow) tier."""
+        return self._slow.base_path
+
+    @property
+    def write_policy(self) -> str:
+        return self._write_policy
+
+    def cached(self) -> List[str]:
+        """Paths currently held in the fast tier, least recent first."""
+        return list(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters plus the statistics of both tiers."""
+        return {
+            "tiered": {
+                **self._counters,
+                "cached_files": len(self._entries),
+                "cached_bytes": self._cached_bytes,
+                "capacity_bytes": self._capacity,
+                "dirty": len(self._dirty),
+            },
+            "fast": backend_stats(self._fast),
+            "slow": backend_stats(self._slow),
+        }
+
+    def resources(self) -> Dict[str, int]:
+        return add_resources(
+            backend_resources(self._fast),
+            backend_resources(self._slow),
+            {
+                "cache_entries": len(self._entries),
+                "cache_bytes": self._cached_bytes,
+                "buffered_bytes": sum(
+                    self._entries[k].size
+                    for k in self._dirty
+                    if k in self._entries
+                ),
+            },
+        )
+
+    # ───────────────────────────── bookkeeping ──────────────────────────── #
+
+    @asynccontextmanager
+    async def _key_lock(self, key: str) -> AsyncIterator[None]:
+        """Serialise cache fills and writes of one path."""
+        lock, users = self._locks.get(key) or (asyncio.Lock(), 0)
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    def _cache(self, key: str, entry: _CacheEntry) -> None:
+        self._drop(key)
+        self._entries[key] = entry
+        self._cached_bytes += entry.size
+
+    def _drop(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._cached_bytes -= entry.size
+        return True
+
+    def _fits(self, size: int) -> bool:
+        return self._capacity is None or size <= self._capacity
+
+    async def _discard(self, key: str) -> None:
+        """Forget *key* and remove its fast copy (best effort)."""
+        if not self._drop(key):
+            return
+        try:
+            await self._fast.delete(key)
+        except Exception:  # the copy is only a cache
+            pass
+
+    async def _forget_tree(self, path: str) -> None:
+        for key in [k for k in self._entries if _is_under(k, path)]:
+            self._dirty.pop(key, None)
+            await self._discard(key)
+
+    async def _evict(self) -> None:
+        if self._capacity is None:
+            return
+        while self._cached_bytes > self._capacity:
+            victim = next(
+                (k for k in self._entries if k not in self._dirty), None
+            )
+            if victim is None:
+                return  # only unflushed files left; they stay pinned
+            self._counters["evictions"] += 1
+            await self._discard(victim)
+
+    async def _write_fast(self, key: str, put: _Put) -> None:
+        parent = posixpath.dirname(key) or "."
+        if parent not in self._fast_dirs:
+            await self._fast.mkdir(parent, parents=True)
+            self._fast_dirs.add(parent)
+        await put(self._fast)
+
+    async def _slow_mtime(self, key: str) -> Optional[float]:
+        return await self._slow.stat_mtime(key) if self._revalidate else None
+
+    # ─────────────────────────── write-behind ───────────────────────────── #
+
+    def _schedule_flush(self, key: str) -> None:
+        if key in self._pending:
+            return
+        task = asyncio.ensure_future(self._flush_path(key))
+        self._pending[key] = task
+        task.add_done_callback(lambda t, k=key: self._flush_done(k, t))
+
+    def _flush_done(self, key: str, task: asyncio.Future) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._counters["flush_errors"] += 1
+
+    async def _flush_path(self, key: str) -> None:
+        # A write arriving mid-copy replaces the pending record, so the loop
+        # copies again until the slow tier holds the latest content.
+        while key in self._dirty:
+            pending = self._dirty[key]
+            async with self._key_lock(key):
+                data = await self._fast.read(key, binary=True)
+            await self._slow.write(
+                key,
+                data,
+                binary=True,
+                permissions=pending.permissions,
+                user=pending.user,
+                checksum=pending.checksum,
+            )
+            if self._dirty.get(key) is pending:
+                del self._dirty[key]
+            self._counters["flushed"] += 1
+        await self._evict()
+
+    async def _settle(self, path: str) -> None:
+        """Wait for pending write-behind copies at or below *path*."""
+        tasks = [t for k, t in self._pending.items() if _is_under(k, path)]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def flush(self) -> None:
+        """
+        Copy every write-behind file to the slow tier and wait for it.
+
+        Files whose earlier background copy failed are retried.
+
+        Raises:
+            The first error raised while copying; the affected files stay
+            pending.
+        """
+        for key in list(self._dirty):
+            self._schedule_flush(key)
+        results = await asyncio.gather(
+            *self._pending.values(), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def close(self) -> None:
+        """Flush write-behind data, then close both tiers."""
+        try:
+            await self.flush()
+        finally:
+            await close_backend(self._fast)
+            await close_backend(self._slow)
+
+    async def will_need(self, relative_path: str) -> None:
+        """Pass a read-ahead hint to the tier that will serve the read."""
+        key = _key(relative_path)
+        tier = self._fast if key in self._entries else self._slow
+        await will_need(tier, key)
+
+    # ───────────────────────────── operations ───────────────────────────── #
+
+    async def read(
+        self,
+        relative_path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        key = _key(relative_path)
+        if verify or if_none_match is not None:
+            # Checksums and etags belong to the authoritative copy.
+            await self._settle(key)
+            return await self._slow.read(
+                key, binary=binary, verify=verify, if_none_match=if_none_match
+            )
+
+        hit = await self._read_cached(key, binary)
+        if hit is not None:
+            return hit
+
+        async with self._key_lock(key):
+            hit = await self._read_cached(key, binary)  # filled meanwhile?
+            if hit is not None:
+                return hit
+            self._counters["misses"] += 1
+            slow_mtime = await self._slow_mtime(key)
+            data = await self._slow.read(key, binary=True)
+            promoted = False
+            if self._fits(len(data)):
+                try:
+                    await self._write_fast(
+                        key, lambda tier: tier.write(key, data, binary=True)
+                    )
+                except Exception:  # cache fill is best effort
+                    pass
+                else:
+                    self._cache(key, _CacheEntry(len(data), slow_mtime))
+                    self._counters["promotions"] += 1
+                    promoted = True
+            # Text goes through a tier's own text read, as on a hit, so
+            # newline handling does not depend on whether the file was cached.
+            text = None
+            if not binary:
+                text = await (self._fast if promoted else self._slow).read(key)
+        await self._evict()
+        return data if text is None else text
+
+    async def _read_cached(
+        self, key: str, binary: bool
+    ) -> Optional[Union[str, bytes]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if (
+            self._revalidate
+            and key not in self._dirty
+            and await self._slow_mtime(key) != entry.slow_mtime
+        ):
+            await self._discard(key)
+            return None
+        try:
+            data = await self._fast.read(key, binary=binary)
+        except Exception:
+            if key in self._dirty:
+                raise  # the fast copy is the only copy
+            self._drop(key)  # evicted or removed underneath us
+            return None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return data
+
+    async def write(
+        self,
+        relative_path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        key = _key(relative_path)
+        await self._store(
+            key,
+            content_size(content),
+            lambda tier, **options: tier.write(
+                key, content, binary=binary, **options
+            ),
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    async def writev(
+        self,
+        relative_path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        key = _key(relative_path)
+        await self._store(
+            key,
+            sum(content_size(buffer) for buffer in buffers),
+            lambda tier, **options: tier.writev(key, buffers, **options),
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    async def _store(
+        self,
+        key: str,
+        size: int,
+        put: _Put,
+        *,
+        permissions: Optional[int],
+        user: Optional[str],
+        checksum: Optional[str],
+        if_match: Optional[str],
+        if_none_match: Optional[str],
+    ) -> None:
+        """Write *size* bytes to *key* with ``put(tier, **options)``."""
+        conditional = if_match is not None or if_none_match is not None
+        behind = (
+            self._write_policy == WRITE_BEHIND
+            and not conditional
+            and self._fits(size)
+        )
+
+        if conditional:
+            await self._settle(key)  # before the lock the copy needs
+        async with self._key_lock(key):
+            if behind:
+                await self._write_fast(key, put)
+                self._cache(key, _CacheEntry(size))
+                self._dirty[key] = _PendingWrite(permissions, user, checksum)
+                self._schedule_flush(key)
+            else:
+                await put(
+                    self._slow,
+                    permissions=permissions,
+                    user=user,
+                    checksum=checksum,
+                    if_match=if_match,
+                    if_none_match=if_none_match,
+                )
+                self._dirty.pop(key, None)
+                if not self._fits(size):
+                    await self._discard(key)
+                else:
+                    try:
+                        slow_mtime = await self._slow_mtime(key)
+                        await self._write_fast(key, put)
+                    except Exception:  # cache fill is best effort
+                        await self._discard(key)
+                    else:
+                        self._cache(key, _CacheEntry(size, slow_mtime))
+        await self._evict()
+
+    async def delete(self, relative_path: str) -> None:
+        key = _key(relative_path)
+        await self._settle(key)
+        async with self._key_lock(key):
+            self._dirty.pop(key, None)
+            await self._discard(key)
+            await self._slow.delete(key)
+
+    async def exists(self, relative_path: str) -> bool:
+        key = _key(relative_path)
+        if key in self._entries and not self._revalidate:
+            return True
+        await self._settle(key)
+        return await self._slow.exists(key)
+
+    async def list(
+        self, relative_path: str = ".", *, recursive: bool = False
+    ) -> List[str]:
+        key = _key(relative_path)
+        await self._settle(key)
+        return await self._slow.list(key, recursive=recursive)
+
+    async def mkdir(
+        self,
+        relative_path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        await self._slow.mkdir(
+            _key(relative_path),
+            parents=parents,
+            permissions=permissions,
+            user=user,
+        )
+
+    async def rmdir(self, relative_path: str) -> None:
+        key = _key(relative_path)
+        await self._settle(key)
+        await self._slow.rmdir(key)
+        await self._forget_tree(key)
+
+    async def rename(self, src_relative: str, dest_relative: str) -> None:
+        src, dest = _key(src_relative), _key(dest_relative)
+        await self._settle(src)
+        await self._settle(dest)
+        await self._slow.rename(src, dest)
+        await self._forget_tree(src)
+        await self._forget_tree(dest)
+
+    async def stat_mtime(self, relative_path: str) -> float:
+        key = _key(relative_path)
+        await self._settle(key)
+        return await self._slow.stat_mtime(key)
+
+    async def stat(self, relative_path: str) -> FileStat:
+        key = _key(relative_path)
+        await self._settle(key)
+        return await self._slow.stat(key)
+
+    async def scan(self, relative_path: str = ".") -> List[FileStat]:
+        key = _key(relative_path)
+        await self._settle(key)
+        return await self._slow.scan(key)
+
+    async def find(
+        self,
+        relative_path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        key = _key(relative_path)
+        await self._settle(key)
+        return await self._slow.find(key, query, after=after, limit=limit)
+
+    async def checksum(
+        self, relative_path: str, algorithm: str = "sha256"
+    ) -> str:
+        key = _key(relative_path)
+        await self._settle(key)
+        return await self._slow.checksum(key, algorithm)
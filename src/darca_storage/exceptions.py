@@ -1,3 +1,5 @@
+from typing import Optional
+
 from darca_exception import DarcaException
 
 
@@ -18,3 +20,170 @@ class StorageClientPathViolation(DarcaException):
                 "base_path": base_path,
             },
         )
+
+
+class StorageChecksumMismatch(DarcaException):
+    """
+    Raised when a verified read finds data that does not match the checksum
+    recorded when the file was written.
+    """
+
+    def __init__(self, path: str, expected: str, actual: str):
+        super().__init__(
+            message=(
+                f"Checksum mismatch for '{path}': expected {expected},"
+                f" got {actual}."
+            ),
+            error_code="CHECKSUM_MISMATCH",
+            metadata={"path": path, "expected": expected, "actual": actual},
+        )
+
+
+class StorageChecksumUnavailable(DarcaException):
+    """
+    Raised when a checksum cannot be recorded or is missing for a verified
+    read (e.g. the file was rewritten without one, or the filesystem does
+    not support extended attributes).
+    """
+
+    def __init__(self, path: str, reason: str):
+        super().__init__(
+            message=f"No usable checksum for '{path}': {reason}",
+            error_code="CHECKSUM_UNAVAILABLE",
+            metadata={"path": path, "reason": reason},
+        )
+
+
+class StoragePreconditionFailed(DarcaException):
+    """
+    Raised when a conditional write's precondition (``if_match`` /
+    ``if_none_match``) does not hold for the current state of the file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        condition: str,
+        expected: Optional[str],
+        actual: Optional[str],
+    ):
+        super().__init__(
+            message=(
+                f"Precondition {condition}={expected!r} failed for '{path}'"
+                f" (current etag: {actual!r})."
+            ),
+            error_code="PRECONDITION_FAILED",
+            metadata={
+                "path": path,
+                "condition": condition,
+                "expected": expected,
+                "actual": actual,
+            },
+        )
+
+
+class StorageClientClosed(DarcaException):
+    """
+    Raised when an operation is attempted on a storage client after its
+    `close()` has been called.
+    """
+
+    def __init__(self, operation: str):
+        super().__init__(
+            message=f"Cannot {operation}: the storage client is closed.",
+            error_code="CLIENT_CLOSED",
+            metadata={"operation": operation},
+        )
+
+
+class StoragePackCorrupted(DarcaException):
+    """
+    Raised when a packed object store finds a damaged record anywhere but
+    at the very end of its newest segment (which is where an interrupted
+    write leaves one, and is repaired by truncation).
+    """
+
+    def __init__(self, path: str, offset: int, reason: str):
+        super().__init__(
+            message=f"Corrupt record in '{path}' at offset {offset}: {reason}",
+            error_code="PACK_CORRUPTED",
+            metadata={"path": path, "offset": offset, "reason": reason},
+        )
+
+
+class StoragePackLocked(DarcaException):
+    """
+    Raised when a packed object store is already open in another process
+    (or by another store instance).
+    """
+
+    def __init__(self, path: str):
+        super().__init__(
+            message=f"Packed object store '{path}' is already open.",
+            error_code="PACK_LOCKED",
+            metadata={"path": path},
+        )
+
+
+class StorageTransactionFailed(DarcaException):
+    """
+    Raised when a transaction's staged changes cannot be applied (e.g. a
+    file to delete or rename does not exist).  Raised before anything is
+    published, except for the failures listed by a partial publish.
+    """
+
+    def __init__(self, path: str, reason: str):
+        super().__init__(
+            message=f"Transaction failed on '{path}': {reason}",
+            error_code="TRANSACTION_FAILED",
+            metadata={"path": path, "reason": reason},
+        )
+
+
+class StorageTransactionClosed(DarcaException):
+    """
+    Raised when a change is staged on, or a commit is attempted for, a
+    transaction that was already committed or rolled back.
+    """
+
+    def __init__(self, operation: str):
+        super().__init__(
+            message=f"Cannot {operation}: the transaction is finished.",
+            error_code="TRANSACTION_CLOSED",
+            metadata={"operation": operation},
+        )
+
+
+class StorageSimulatedFault(DarcaException):
+    """
+    Raised by `SimulatedFileBackend` for an operation it was configured to
+    fail; the wrapped backend was not called.
+    """
+
+    def __init__(self, operation: str, path: str):
+        super().__init__(
+            message=f"Simulated {operation} failure on '{path}'.",
+            error_code="SIMULATED_FAULT",
+            metadata={"operation": operation, "path": path},
+        )
+
+
+class StorageOperationTimeout(DarcaException):
+    """
+    Raised when a storage operation (or one attempt at it) runs past the
+    timeout or deadline of its `ResiliencePolicy`.
+    """
+
+    def __init__(self, operation: str, path: str, seconds: float):
+        super().__init__(
+            message=(
+                f"{operation} on '{path}' did not finish within"
+                f" {seconds:g} seconds."
+            ),
+            error_code="OPERATION_TIMEOUT",
+            metadata={
+                "operation": operation,
+                "path": path,
+                "seconds": seconds,
+            },
+        )
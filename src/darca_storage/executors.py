@@ -0,0 +1,174 @@
+# src/darca_storage/executors.py
+# License: MIT
+"""
+Worker pools for blocking and CPU-heavy storage work, with fork safety.
+
+• `run_in_thread` - drop-in for `asyncio.to_thread`.  Uses a dedicated
+  thread pool when one is configured (`configure_io_pool`), otherwise the
+  event loop's default executor.
+• `run_cpu_bound` - runs picklable, module-level functions (hashing,
+  compression, checksum verification) in a process pool when one is
+  configured (`configure_process_pool`), so they use every core instead of
+  contending for the GIL.  Falls back to `run_in_thread`.
+• Fork safety - after `os.fork()` the child drops the inherited pools (their
+  worker threads/processes belong to the parent) and calls
+  `_reset_after_fork()` on every object passed to `register_fork_handler`,
+  so loop-bound state such as in-flight futures and semaphores is rebuilt.
+  Pools are recreated lazily on first use in the child.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+T = TypeVar("T")
+
+_io_workers: Optional[int] = None
+_io_pool: Optional[ThreadPoolExecutor] = None
+_process_workers: Optional[int] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_owner_pid: int = os.getpid()
+_fork_handlers: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def configure_io_pool(max_workers: Optional[int]) -> None:
+    """
+    Use a dedicated thread pool of *max_workers* for storage I/O.
+
+    Pass None to go back to the event loop's default executor.
+    """
+    global _io_workers, _io_pool
+    if max_workers == _io_workers:
+        return
+    old, _io_pool, _io_workers = _io_pool, None, max_workers
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def configure_process_pool(max_workers: Optional[int]) -> None:
+    """
+    Offload `run_cpu_bound` work to a pool of *max_workers* processes.
+
+    ``0`` sizes the pool to `os.cpu_count()`; None disables the pool.
+    """
+    global _process_workers, _process_pool
+    if max_workers == _process_workers:
+        return
+    old, _process_pool, _process_workers = _process_pool, None, max_workers
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def process_pool_enabled() -> bool:
+    return _process_workers is not None
+
+
+def register_fork_handler(obj: Any) -> None:
+    """
+    Call ``obj._reset_after_fork()`` in the child after every fork.
+
+    Objects are held weakly; there is no need to unregister.
+    """
+    _fork_handlers.add(obj)
+
+
+def shutdown(wait: bool = True) -> None:
+    """Shut down any pools created by this module."""
+    global _io_pool, _process_pool
+    for pool in (_io_pool, _process_pool):
+        if pool is not None:
+            pool.shutdown(wait=wait)
+    _io_pool = _process_pool = None
+
+
+async def run_in_thread(func: Callable[..., T], /, *args, **kwargs) -> T:
+    """Run *func* in a worker thread, propagating contextvars."""
+    pool = _get_io_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        pool, functools.partial(ctx.run, func, *args, **kwargs)
+    )
+
+
+async def run_cpu_bound(func: Callable[..., T], /, *args) -> T:
+    """
+    Run CPU-heavy *func* in the process pool (or a thread if disabled).
+
+    *func* and its arguments must be picklable; prefer passing file paths
+    over large buffers so the data never crosses the process boundary.
+    """
+    pool = _get_process_pool()
+    if pool is None:
+        return await run_in_thread(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(
+        pool, functools.partial(func, *args)
+    )
+
+
+# ─────────────────────────────── internals ────────────────────────────── #
+
+
+def _check_pid() -> None:
+    # Fallback for forks that bypass os.register_at_fork.
+    if os.getpid() != _owner_pid:
+        _after_fork_in_child()
+
+
+def _get_io_pool() -> Optional[Executor]:
+    global _io_pool
+    _check_pid()
+    if _io_workers is None:
+        return None
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(
+            max_workers=_io_workers, thread_name_prefix="darca-storage-io"
+        )
+    return _io_pool
+
+
+def _get_process_pool() -> Optional[Executor]:
+    global _process_pool
+    _check_pid()
+    if _process_workers is None:
+        return None
+    if _process_pool is None:
+        # Imported here: multiprocessing is slow to import and most
+        # processes never enable the pool.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Never fork a (possibly multi-threaded) parent to create workers.
+        method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_process_workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _process_pool
+
+
+def _after_fork_in_child() -> None:
+    global _io_pool, _process_pool, _owner_pid
+    # The inherited pools' workers live in the parent: drop, don't shut down.
+    _io_pool = _process_pool = None
+    _owner_pid = os.getpid()
+    for handler in list(_fork_handlers):
+        handler._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -8,21 +8,34 @@ Resolves URL-based schemes (e.g. file:///data) into a connected,
 scoped StorageClient.
 
 This factory guarantees that all returned clients operate over a
-ScopedFileBackend,
-preventing directory traversal and enforcing per-root isolation.
+ScopedFileBackend (or a TieredFileBackend / ShardedFileBackend composed only
+of scoped backends), preventing directory traversal and enforcing per-root
+isolation.
 """
 
 from __future__ import annotations
 
 import os
 from typing import Any, Dict, Optional
-from urllib.parse import unquote, urlparse
+from urllib.parse import parse_qsl, unquote, urlparse
 
 from darca_storage.client import StorageClient
 from darca_storage.connectors.local import LocalStorageConnector
 from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.decorators.sharded_backend import ShardedFileBackend
+from darca_storage.decorators.tiered_backend import (
+    WRITE_THROUGH,
+    TieredFileBackend,
+)
 from darca_storage.interfaces.credential_aware import CredentialAware
 from darca_storage.interfaces.file_backend import FileBackend
+from darca_storage.parameters import (
+    get_bool,
+    get_int,
+    resolve_parameters,
+    with_prefix,
+)
+from darca_storage.sync_client import SyncStorageClient
 
 
 class StorageConnectorFactory:
@@ -43,12 +56,33 @@ class StorageConnectorFactory:
         """
         Parse a URL and return a connected, scoped StorageClient.
 
+        Composite ``tiered://`` URLs put a fast cache tier in front of a
+        slow one (see `TieredFileBackend`)::
+
+            tiered://?fast=file:///ssd/cache&slow=file:///mnt/nfs/data
+                     &capacity_bytes=10737418240&write_policy=behind
+
+        Other query items are parameters; ``fast.<key>`` / ``slow.<key>``
+        parameters apply to one tier only.
+
+        Multi-root ``sharded://`` URLs spread files over several roots (see
+        `ShardedFileBackend`)::
+
+            sharded://?shard=file:///nvme0/data&shard=file:///nvme1/data
+
+        Shards are named by their root path unless ``shard_names`` lists
+        one name per shard (comma-separated, in order); ``shard_fallback``
+        enables reads from non-owning shards while rebalancing.
+
         Args:
             url (str): A storage URL (e.g., file:///data)
             session_metadata (dict, optional): Metadata associated with
             this session credentials (dict, optional): Credential map
             (e.g., {"user": "...", "token": "..."})
-            parameters (dict, optional): Additional connection parameters
+            parameters (dict, optional): Additional connection parameters,
+            merged over ``session_metadata["storage_parameters"]``
+            (e.g. ``{"max_concurrency": "16", "ops_per_second": "500"}``;
+            ``session_metadata["tenant"]`` names the fair-queue tenant)
 
         Returns:
             StorageClient: Session-aware client wrapping a ScopedFileBackend
@@ -61,33 +95,184 @@ class StorageConnectorFactory:
         parsed = urlparse(url)
         scheme = parsed.scheme
         path = unquote(parsed.path)
+        parameters = resolve_parameters(parameters, session_metadata)
 
         if scheme == "file":
             base_path = os.path.abspath(path or "/")
+            backend = await StorageConnectorFactory._connect_local(
+                base_path, credentials, parameters
+            )
+            return StorageClient(
+                backend=backend,
+                session_metadata={
+                    **(session_metadata or {}),
+                    "scheme": "file",
+                    "base_path": base_path,
+                },
+                credentials=credentials,
+            )
 
-            connector = LocalStorageConnector(
-                base_path=base_path,
+        if scheme == "tiered":
+            query = dict(parse_qsl(parsed.query))
+            tier_urls = {t: query.pop(t, "") for t in ("fast", "slow")}
+            parameters = {**query, **parameters}
+
+            tiers: Dict[str, ScopedFileBackend] = {}
+            for tier, tier_url in tier_urls.items():
+                tier_parsed = urlparse(tier_url)
+                if tier_parsed.scheme != "file":
+                    raise ValueError(
+                        f"The {tier} tier of a tiered:// URL must be a "
+                        f"file:// URL, got {tier_url!r}"
+                    )
+                tiers[tier] = await StorageConnectorFactory._connect_local(
+                    os.path.abspath(unquote(tier_parsed.path) or "/"),
+                    credentials,
+                    {**parameters, **with_prefix(parameters, tier)},
+                )
+
+            return StorageClient(
+                backend=TieredFileBackend(
+                    tiers["fast"],
+                    tiers["slow"],
+                    capacity_bytes=get_int(parameters, "capacity_bytes"),
+                    write_policy=parameters.get(
+                        "write_policy", WRITE_THROUGH
+                    ),
+                    revalidate=get_bool(parameters, "revalidate"),
+                ),
+                session_metadata={
+                    **(session_metadata or {}),
+                    "scheme": "tiered",
+                    "base_path": tiers["slow"].base_path,
+                    "fast_path": tiers["fast"].base_path,
+                },
                 credentials=credentials,
-                parameters=parameters,
             )
 
-            # Inject credentials if the connector supports it
-            if isinstance(connector, CredentialAware) and credentials:
-                connector.inject_credentials(credentials)
+        if scheme == "sharded":
+            shard_urls = []
+            query = {}
+            for key, value in parse_qsl(parsed.query):
+                if key == "shard":
+                    shard_urls.append(value)
+                else:
+                    query[key] = value
+            parameters = {**query, **parameters}
+            if not shard_urls:
+                raise ValueError("A sharded:// URL needs at least one shard.")
 
-            backend: FileBackend = await connector.connect()
+            names = [
+                n.strip()
+                for n in parameters.get("shard_names", "").split(",")
+                if n.strip()
+            ]
+            if names and len(names) != len(shard_urls):
+                raise ValueError(
+                    f"shard_names lists {len(names)} names for "
+                    f"{len(shard_urls)} shards."
+                )
 
-            # Enforce scoped backend invariant
-            if not isinstance(backend, ScopedFileBackend):
-                raise RuntimeError(
-                    f"Connector '{connector.__class__.__name__}' returned "
-                    "an unscoped backend. "
-                    "All backends must be wrapped in ScopedFileBackend to "
-                    "ensure path isolation."
+            shards: Dict[str, ScopedFileBackend] = {}
+            for index, shard_url in enumerate(shard_urls):
+                shard_parsed = urlparse(shard_url)
+                if shard_parsed.scheme != "file":
+                    raise ValueError(
+                        "Shards of a sharded:// URL must be file:// URLs, "
+                        f"got {shard_url!r}"
+                    )
+                shard_path = os.path.abspath(
+                    unquote(shard_parsed.path) or "/"
+                )
+                name = names[index] if names else shard_path
+                if name in shards:
+                    raise ValueError(f"Duplicate shard name: {name!r}")
+                shards[name] = await StorageConnectorFactory._connect_local(
+                    shard_path, credentials, parameters
                 )
 
+            sharded = ShardedFileBackend(
+                shards, fallback=get_bool(parameters, "shard_fallback")
+            )
             return StorageClient(
-                backend=backend,
+                backend=sharded,
+                session_metadata={
+                    **(session_metadata or {}),
+                    "scheme": "sharded",
+                    "base_path": sharded.base_path,
+                    "shards": {n: s.base_path for n, s in shards.items()},
+                },
+                credentials=credentials,
+            )
+
+        raise ValueError(f"Unsupported storage scheme: '{scheme}'")
+
+    @staticmethod
+    async def _connect_local(
+        base_path: str,
+        credentials: Optional[Dict[str, str]],
+        parameters: Dict[str, str],
+    ) -> ScopedFileBackend:
+        connector = LocalStorageConnector(
+            base_path=base_path,
+            credentials=credentials,
+            parameters=parameters,
+        )
+
+        # Inject credentials if the connector supports it
+        if isinstance(connector, CredentialAware) and credentials:
+            connector.inject_credentials(credentials)
+
+        backend: FileBackend = await connector.connect()
+
+        # Enforce scoped backend invariant
+        if not isinstance(backend, ScopedFileBackend):
+            raise RuntimeError(
+                f"Connector '{connector.__class__.__name__}' returned "
+                "an unscoped backend. "
+                "All backends must be wrapped in ScopedFileBackend to "
+                "ensure path isolation."
+            )
+        return backend
+
+    @staticmethod
+    def from_url_sync(
+        url: str,
+        *,
+        session_metadata: Optional[Dict[str, Any]] = None,
+        credentials: Optional[Dict[str, str]] = None,
+        parameters: Optional[Dict[str, str]] = None,
+    ) -> SyncStorageClient:
+        """
+        Blocking counterpart of `from_url` for callers without an event loop.
+
+        Accepts the same arguments and returns a `SyncStorageClient` whose
+        backend is a `SyncScopedFileBackend`.  ``tiered://`` and
+        ``sharded://`` URLs are only supported by `from_url`.
+
+        Raises:
+            ValueError: If the scheme is unsupported
+            RuntimeError: If the base path is not reachable
+            PermissionError: If access to the base path is denied
+        """
+        parsed = urlparse(url)
+        scheme = parsed.scheme
+        path = unquote(parsed.path)
+        parameters = resolve_parameters(parameters, session_metadata)
+
+        if scheme == "file":
+            base_path = os.path.abspath(path or "/")
+
+            connector = LocalStorageConnector(
+                base_path=base_path,
+                credentials=credentials,
+                parameters=parameters,
+            )
+            if credentials:
+                connector.inject_credentials(credentials)
+
+            return SyncStorageClient(
+                backend=connector.connect_sync(),
                 session_metadata={
                     **(session_metadata or {}),
                     "scheme": "file",
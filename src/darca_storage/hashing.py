@@ -0,0 +1,122 @@
+# src/darca_storage/hashing.py
+# License: MIT
+"""
+Streaming checksum helpers.
+
+Supported algorithms:
+
+• ``crc32`` - zlib CRC-32, fast, always available.
+• ``crc32c`` - Castagnoli CRC, requires the optional ``crc32c`` package.
+• ``xxh64``, ``xxh3_64``, ``xxh3_128``, ``xxh128`` - require the optional
+  ``xxhash`` package.
+• Any `hashlib` algorithm (``sha256``, ``blake2b``, …) for strength.
+
+All functions are module-level and picklable so they can run in the process
+pool of `darca_storage.executors.run_cpu_bound`; only `file_digest` is sent
+there, since the others would have to pickle their payload.  Digests are
+formatted as ``"<algorithm>:<hex>"``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import zlib
+from typing import Any, Iterable, Union
+
+from darca_storage.interfaces.file_backend import Buffer
+
+CHUNK_SIZE = 1024 * 1024
+
+_XXHASH_ALGORITHMS = {"xxh64", "xxh3_64", "xxh3_128", "xxh128"}
+
+
+class _Crc32:
+    """hashlib-style wrapper around zlib.crc32."""
+
+    def __init__(self) -> None:
+        self._value = 0
+
+    def update(self, data: Any) -> None:
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+class _Crc32c(_Crc32):
+    """hashlib-style wrapper around the optional ``crc32c`` package."""
+
+    def __init__(self, module: Any) -> None:
+        super().__init__()
+        self._module = module
+
+    def update(self, data: Any) -> None:
+        self._value = self._module.crc32c(data, self._value)
+
+
+def _require(module: str, algorithm: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ValueError(
+            f"Checksum algorithm '{algorithm}' requires the optional "
+            f"'{module}' package."
+        )
+
+
+def new_hasher(algorithm: str) -> Any:
+    """
+    Return a fresh incremental hasher (``update`` / ``hexdigest``).
+
+    Raises:
+        ValueError: If *algorithm* is unknown or its package is missing.
+    """
+    if algorithm == "crc32":
+        return _Crc32()
+    if algorithm == "crc32c":
+        return _Crc32c(_require("crc32c", algorithm))
+    if algorithm in _XXHASH_ALGORITHMS:
+        return getattr(_require("xxhash", algorithm), algorithm)()
+    if algorithm in hashlib.algorithms_available:
+        return hashlib.new(algorithm)
+    raise ValueError(f"Unsupported checksum algorithm: '{algorithm}'")
+
+
+def validate_algorithm(algorithm: str) -> None:
+    """
+    Raises:
+        ValueError: If *algorithm* cannot be used in this environment.
+    """
+    new_hasher(algorithm)
+
+
+def digest_bytes(algorithm: str, data: Union[str, Buffer]) -> str:
+    """
+    Checksum an in-memory payload (text is hashed as UTF-8).
+
+    Any buffer-protocol object is accepted; it is fed to the hasher in
+    `CHUNK_SIZE` slices of a memoryview, without copying.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return digest_buffers(algorithm, (data,))
+
+
+def digest_buffers(algorithm: str, buffers: Iterable[Buffer]) -> str:
+    """Checksum the concatenation of *buffers*, without joining them."""
+    hasher = new_hasher(algorithm)
+    for buffer in buffers:
+        view = memoryview(buffer).cast("B")
+        for offset in range(0, len(view), CHUNK_SIZE):
+            hasher.update(view[offset : offset + CHUNK_SIZE])
+    return f"{algorithm}:{hasher.hexdigest()}"
+
+
+def file_digest(path: str, algorithm: str) -> str:
+    """Checksum the file at *path*, reading it in `CHUNK_SIZE` pieces."""
+    hasher = new_hasher(algorithm)
+    with open(path, "rb") as fh:
+        while chunk := fh.read(CHUNK_SIZE):
+            hasher.update(chunk)
+    return f"{algorithm}:{hasher.hexdigest()}"
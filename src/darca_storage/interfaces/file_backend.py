@@ -1,7 +1,70 @@
 # src/darca_storage/interfaces/file_backend.py
 # License: MIT
 
-from typing import List, Optional, Protocol, Union
+from dataclasses import dataclass
+from typing import List, Optional, Protocol, Sequence, Union
+
+from darca_storage.path_query import PathQuery
+
+try:  # Python 3.12+; typing_extensions costs several ms to import
+    from collections.abc import Buffer
+except ImportError:  # pragma: no cover
+    from typing_extensions import Buffer
+
+Content = Union[str, Buffer]
+"""
+Payload accepted by ``write``: text (stored as UTF-8) or any C-contiguous
+buffer-protocol object (bytes, bytearray, memoryview, array, NumPy array…),
+which is written as raw bytes without being copied.
+"""
+
+
+class NotModified:
+    """
+    Type of the `NOT_MODIFIED` sentinel.
+
+    Returned by ``read(..., if_none_match=etag)`` when the file's current
+    etag equals *etag*; the file is not read.  The sentinel is falsy.
+    """
+
+    _instance: Optional["NotModified"] = None
+
+    def __new__(cls) -> "NotModified":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = NotModified()
+
+
+@dataclass(frozen=True)
+class FileStat:
+    """
+    Lightweight metadata record for a single file or directory.
+
+    Attributes:
+        name:   Base name of the entry (no directory component).
+        size:   Size in bytes (as reported by the backend for directories).
+        mtime:  Last-modified time (UNIX epoch seconds).
+        is_dir: True if the entry is a directory.
+        etag:   Opaque version tag for files, when the backend provides one
+                (the stored checksum if there is one, else a weak tag).
+        mode:   Permission bits, when the backend reports them (`stat`).
+    """
+
+    name: str
+    size: int
+    mtime: float
+    is_dir: bool = False
+    etag: Optional[str] = None
+    mode: Optional[int] = None
 
 
 class FileBackend(Protocol):
@@ -15,32 +78,79 @@ class FileBackend(Protocol):
     """
 
     async def read(
-        self, path: str, *, binary: bool = False
-    ) -> Union[str, bytes]:
+        self,
+        path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
         """
         Return the full contents of *path*.
 
         Args:
             path: Absolute path of the file.
             binary: If True, return bytes; otherwise decode as text.
+            verify: If True, check the data against the checksum recorded
+                    at write time.
+            if_none_match: If the file's current etag equals this value,
+                    return `NOT_MODIFIED` without reading the file.
+
+        Raises:
+            StorageChecksumMismatch if verification fails.
+            StorageChecksumUnavailable if no checksum is recorded.
         """
         ...
 
     async def write(
         self,
         path: str,
-        content: Union[str, bytes],
+        content: Content,
         *,
         binary: bool = False,
         permissions: Optional[int] = None,
         user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
     ) -> None:
         """
         Overwrite or create *path* with *content*.
 
         Optional:
-            permissions - chmod bits (e.g. 0o644)
-            user        - chown to given username (requires privilege)
+            permissions   - chmod bits (e.g. 0o644)
+            user          - chown to given username (requires privilege)
+            checksum      - algorithm (e.g. "crc32", "sha256") to record a
+                            checksum with, computed in the same worker hop
+            if_match      - only replace the file if its current etag equals
+                            this value ("*": if it exists at all)
+            if_none_match - "*" to only create the file if it does not exist
+
+        Text is encoded in the worker, not on the event loop.  Buffers are
+        written in place: do not modify them until the call returns.
+
+        Raises:
+            StoragePreconditionFailed if a condition does not hold.
+        """
+        ...
+
+    async def writev(
+        self,
+        path: str,
+        buffers: Sequence[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        """
+        Overwrite or create *path* with the concatenation of *buffers*.
+
+        Like `write`, but the pieces are handed to vectored I/O as they
+        are, so callers never need to join them first.  Takes the same
+        options as `write`.
         """
         ...
 
@@ -91,3 +201,59 @@ class FileBackend(Protocol):
             FileUtilsException if *path* does not exist.
         """
         ...
+
+    async def stat(self, path: str) -> FileStat:
+        """
+        Return size, mtime, type and etag information for *path*.
+
+        Raises:
+            FileUtilsException if *path* does not exist.
+        """
+        ...
+
+    async def scan(self, path: str) -> List[FileStat]:
+        """
+        Return a `FileStat` for every direct child of directory *path*.
+
+        Unlike `list`, each entry carries its metadata so callers walking a
+        tree do not need a separate `stat` per child.  Symbolic links are
+        reported as-is and never followed.
+
+        Raises:
+            FileUtilsException if *path* is not a directory.
+        """
+        ...
+
+    async def find(
+        self,
+        path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Walk directory *path* and return the entries matching *query*.
+
+        The query is evaluated during the walk, so subtrees that cannot
+        match are never read.  Paths are relative to *path*, in walk order;
+        at most *limit* are returned, all after the path *after*, so a
+        large tree can be fetched page by page.
+
+        Raises:
+            FileUtilsException if *path* is not a directory.
+        """
+        ...
+
+    async def checksum(self, path: str, algorithm: str = "sha256") -> str:
+        """
+        Return the checksum of file *path* as ``"<algorithm>:<hex>"``.
+
+        The file is hashed in a worker (possibly another process), so the
+        data never passes through the event loop.
+
+        Raises:
+            FileUtilsException if *path* is not an existing file.
+            ValueError if *algorithm* is not supported.
+        """
+        ...
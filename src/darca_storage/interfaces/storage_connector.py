@@ -10,14 +10,18 @@ A connector encapsulates whatever is needed to reach a given storage backend
 - Produce a ready-to-use `StorageClient` (`connect`)
 All three operations are *coroutines* so event-loop callers remain
 non-blocking.
+
+Connectors are also async context managers: `close` releases whatever the
+backends returned by `connect` still hold.
 """
 
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from darca_storage.backends.local_file_backend import LocalFileBackend
+if TYPE_CHECKING:
+    from darca_storage.backends.local_file_backend import LocalFileBackend
 
 
 class StorageConnector(ABC):
@@ -47,6 +51,23 @@ class StorageConnector(ABC):
         """
         ...
 
+    async def close(self) -> None:
+        """
+        Release resources held by backends returned from `connect`.
+
+        The default implementation holds nothing and does nothing.
+        """
+
+    async def __aenter__(self) -> "StorageConnector":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Resource usage of the backends this connector produced."""
+        return {}
+
     # ──────────────────────────── probes ────────────────────────────── #
 
     @abstractmethod
@@ -0,0 +1,230 @@
+# src/darca_storage/loadgen.py
+# License: MIT
+"""
+Synthetic load against a storage URL, for capacity planning.
+
+Run it as a script::
+
+    python -m darca_storage.loadgen file:///tmp/bench \\
+        --duration 30 --concurrency 64 --mix read=70,write=20,exists=10 \\
+        -p simulate_latency=lognormal:0.004,0.5 -p simulate_error_rate=0.01
+
+Combined with the ``simulate_*`` parameters (see `SimulationProfile`) this
+shows how retry, caching and concurrency settings hold up against slow or
+flaky storage without needing such storage.  A pool of *files* objects of
+*size* bytes is written to *directory* first; the script writes it through
+a second client without the ``simulate_*`` parameters, so injected faults
+cannot abort the run.  Then *concurrency* workers pick operations by weight
+from *mix* until *duration* seconds or *operations* operations have passed.
+The JSON report gives throughput, latency percentiles and errors per
+operation, and the client's `stats()`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+MIX = {"read": 70, "write": 20, "exists": 10}
+OPERATIONS = ("read", "write", "exists", "stat", "list")
+
+
+async def run_load(
+    client: Any,
+    *,
+    duration: Optional[float] = 10.0,
+    operations: Optional[int] = None,
+    concurrency: int = 16,
+    mix: Optional[Mapping[str, int]] = None,
+    size: int = 4096,
+    files: int = 100,
+    directory: str = "loadgen",
+    seed: Optional[int] = None,
+    setup_client: Any = None,
+) -> Dict[str, Any]:
+    """
+    Drive *client* with a weighted operation mix and report on it.
+
+    The run stops after *duration* seconds or *operations* operations,
+    whichever comes first; at least one of them must be set.  The file pool
+    is written with *setup_client* (default: *client*); pass one over the
+    same storage without simulated faults when *client* injects them.
+
+    Raises:
+        ValueError: For an unknown operation in *mix* or a run with no end.
+    """
+    mix = dict(mix or MIX)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {sorted(unknown)}")
+    if duration is None and operations is None:
+        raise ValueError("Set a duration or a number of operations.")
+    if concurrency < 1 or files < 1:
+        raise ValueError("concurrency and files must be at least 1.")
+
+    rng = random.Random(seed)
+    payload = os.urandom(size)
+    paths = [f"{directory}/{index:06d}.bin" for index in range(files)]
+    setup = client if setup_client is None else setup_client
+    await setup.mkdir(directory, parents=True)
+    for start in range(0, files, concurrency):
+        batch = paths[start : start + concurrency]
+        await asyncio.gather(*(setup.write(path, payload) for path in batch))
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, Dict[str, int]] = {name: {} for name in names}
+    calls = {
+        "read": lambda path: client.read(path, binary=True),
+        "write": lambda path: client.write(path, payload),
+        "exists": client.exists,
+        "stat": client.stat,
+        "list": lambda path: client.list(directory),
+    }
+    issued = 0
+    started = time.monotonic()
+    deadline = None if duration is None else started + duration
+
+    async def worker() -> None:
+        nonlocal issued
+        while (operations is None or issued < operations) and (
+            deadline is None or time.monotonic() < deadline
+        ):
+            issued += 1
+            name = rng.choices(names, weights)[0]
+            began = time.monotonic()
+            try:
+                await calls[name](rng.choice(paths))
+            except Exception as error:
+                kind = type(error).__name__
+                errors[name][kind] = errors[name].get(kind, 0) + 1
+            latencies[name].append(time.monotonic() - began)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+    return {
+        "seconds": elapsed,
+        "operations": issued,
+        "ops_per_second": issued / elapsed if elapsed else 0.0,
+        "by_operation": {
+            name: _summary(latencies[name], errors[name], elapsed)
+            for name in names
+        },
+    }
+
+
+def _summary(
+    latencies: List[float], errors: Dict[str, int], elapsed: float
+) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> Optional[float]:
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "ops_per_second": len(ordered) / elapsed if elapsed else 0.0,
+        "errors": dict(errors),
+        "p50": percentile(0.50),
+        "p90": percentile(0.90),
+        "p99": percentile(0.99),
+        "max": ordered[-1] if ordered else None,
+    }
+
+
+def _parse_pairs(pairs: Sequence[str]) -> Dict[str, str]:
+    parsed = {}
+    for pair in pairs:
+        key, found, value = pair.partition("=")
+        if not found:
+            raise ValueError(f"Expected key=value, got {pair!r}")
+        parsed[key.strip()] = value.strip()
+    return parsed
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m darca_storage.loadgen",
+        description="Generate synthetic load against a storage URL.",
+    )
+    parser.add_argument("url", help="storage URL, e.g. file:///tmp/bench")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--operations", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{k}={v}" for k, v in MIX.items()),
+        help=f"operation weights, from: {', '.join(OPERATIONS)}",
+    )
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--directory", default="loadgen")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "-p",
+        "--parameter",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="connector parameter, e.g. simulate_latency=0.005 (repeatable)",
+    )
+    return parser
+
+
+def _is_simulation(parameter: str) -> bool:
+    # Also matches per-operation and per-tier keys such as
+    # ``simulate_latency.read`` and ``slow.simulate_latency``.
+    return any(part.startswith("simulate_") for part in parameter.split("."))
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    from darca_storage.factory import StorageConnectorFactory
+
+    parameters = _parse_pairs(args.parameter)
+    setup_client = await StorageConnectorFactory.from_url(
+        args.url,
+        parameters={
+            key: value
+            for key, value in parameters.items()
+            if not _is_simulation(key)
+        },
+    )
+    client = await StorageConnectorFactory.from_url(
+        args.url, parameters=parameters
+    )
+    async with setup_client, client:
+        report = await run_load(
+            client,
+            duration=args.duration,
+            operations=args.operations,
+            concurrency=args.concurrency,
+            mix={
+                name: int(weight)
+                for name, weight in _parse_pairs(args.mix.split(",")).items()
+            },
+            size=args.size,
+            files=args.files,
+            directory=args.directory,
+            seed=args.seed,
+            setup_client=setup_client,
+        )
+        report["stats"] = client.stats()
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    report = asyncio.run(_main(_parser().parse_args(argv)))
+    print(json.dumps(report, indent=2, sort_keys=True, default=str))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,258 @@
+# src/darca_storage/manifest.py
+# License: MIT
+"""
+Tree manifests and snapshot diffing for incremental sync jobs.
+
+A `Manifest` is a compact, serialisable snapshot of a directory tree: one
+`ManifestEntry` (path, size, mtime, optional checksum) per file plus the
+mtime of every directory.  Passing the previous manifest to
+`build_manifest` makes checksumming incremental: every directory is still
+scanned (one ``scandir`` each, which also catches files rewritten in place),
+but checksums are only recomputed for files whose size or mtime changed.
+"""
+
+from __future__ import annotations
+
+import json
+import posixpath
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+from darca_storage.hashing import validate_algorithm
+from darca_storage.interfaces.file_backend import FileBackend, FileStat
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """
+    A single file or directory recorded in a `Manifest`.
+
+    `path` is relative to the manifest root and always uses ``/`` as the
+    separator; the root directory itself is recorded as ``"."``.
+    """
+
+    path: str
+    size: int
+    mtime: float
+    is_dir: bool = False
+    checksum: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ManifestDiff:
+    """File-level differences between two manifests."""
+
+    added: List[ManifestEntry] = field(default_factory=list)
+    changed: List[ManifestEntry] = field(default_factory=list)
+    removed: List[ManifestEntry] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+@dataclass
+class Manifest:
+    """
+    Snapshot of a directory tree, keyed by root-relative path.
+
+    Use `to_json` / `from_json` to persist a manifest between runs (e.g. via
+    `StorageClient.write`).
+    """
+
+    root: str
+    entries: Dict[str, ManifestEntry] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    def files(self) -> List[ManifestEntry]:
+        """Return all file entries, sorted by path."""
+        return sorted(
+            (e for e in self.entries.values() if not e.is_dir),
+            key=lambda e: e.path,
+        )
+
+    def directories(self) -> List[ManifestEntry]:
+        """Return all directory entries (including the root), sorted."""
+        return sorted(
+            (e for e in self.entries.values() if e.is_dir),
+            key=lambda e: e.path,
+        )
+
+    def to_json(self) -> str:
+        """
+        Serialise to compact JSON.
+
+        Entries are stored as positional arrays rather than objects to keep
+        snapshots of large trees small.
+        """
+        return json.dumps(
+            {
+                "version": MANIFEST_FORMAT_VERSION,
+                "root": self.root,
+                "created_at": self.created_at,
+                "entries": [
+                    [e.path, e.size, e.mtime, int(e.is_dir), e.checksum]
+                    for e in self.entries.values()
+                ],
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "Manifest":
+        """
+        Restore a manifest produced by `to_json`.
+
+        Raises:
+            ValueError: If the payload is not a supported manifest.
+        """
+        payload = json.loads(data)
+        if payload.get("version") != MANIFEST_FORMAT_VERSION:
+            raise ValueError(
+                "Unsupported manifest format version: "
+                f"{payload.get('version')!r}"
+            )
+        entries = {}
+        for path, size, mtime, is_dir, checksum in payload["entries"]:
+            entries[path] = ManifestEntry(
+                path=path,
+                size=size,
+                mtime=mtime,
+                is_dir=bool(is_dir),
+                checksum=checksum,
+            )
+        return cls(
+            root=payload["root"],
+            entries=entries,
+            created_at=payload["created_at"],
+        )
+
+
+def diff_manifests(old: Manifest, new: Manifest) -> ManifestDiff:
+    """
+    Compare the *file* entries of two manifests.
+
+    A file counts as changed when its size or mtime differs, or when both
+    manifests carry a checksum for it and the checksums differ.
+    """
+    old_files = {e.path: e for e in old.entries.values() if not e.is_dir}
+    new_files = {e.path: e for e in new.entries.values() if not e.is_dir}
+
+    added: List[ManifestEntry] = []
+    changed: List[ManifestEntry] = []
+    for path in sorted(new_files):
+        entry = new_files[path]
+        before = old_files.get(path)
+        if before is None:
+            added.append(entry)
+        elif _entry_changed(before, entry):
+            changed.append(entry)
+
+    removed = [old_files[p] for p in sorted(old_files) if p not in new_files]
+    return ManifestDiff(added=added, changed=changed, removed=removed)
+
+
+async def build_manifest(
+    backend: FileBackend,
+    path: str = ".",
+    *,
+    previous: Optional[Manifest] = None,
+    checksum: Optional[str] = None,
+) -> Manifest:
+    """
+    Walk *path* on *backend* and return a `Manifest` of its contents.
+
+    Args:
+        backend:  A (scoped) backend exposing `stat` and `scan`.
+        path:     Directory to snapshot, as understood by *backend*.
+        previous: Manifest from an earlier run; its checksums are reused
+                  for files whose size and mtime are unchanged.
+        checksum: Optional hashlib algorithm name (e.g. ``"sha256"``).
+                  Checksums are only computed for new or changed files, via
+                  `FileBackend.checksum` (which may use a process pool).
+
+    Raises:
+        ValueError: If *path* is not a directory or *checksum* is unknown.
+    """
+    if checksum is not None:
+        validate_algorithm(checksum)
+
+    root_stat = await backend.stat(path)
+    if not root_stat.is_dir:
+        raise ValueError(f"Cannot build manifest: '{path}' is not a directory")
+
+    if previous is not None and previous.root != path:
+        previous = None
+
+    manifest = Manifest(root=path)
+    stack = [(".", root_stat)]
+    while stack:
+        rel_dir, dir_stat = stack.pop()
+        manifest.entries[rel_dir] = ManifestEntry(
+            path=rel_dir,
+            size=dir_stat.size,
+            mtime=dir_stat.mtime,
+            is_dir=True,
+        )
+
+        scan_path = path if rel_dir == "." else posixpath.join(path, rel_dir)
+        for st in await backend.scan(scan_path):
+            entry = _entry_from_stat(rel_dir, st)
+            if entry.is_dir:
+                stack.append((entry.path, st))
+                continue
+            if checksum:
+                prior = previous.entries.get(entry.path) if previous else None
+                if (
+                    prior is not None
+                    and prior.checksum is not None
+                    and not _entry_changed(prior, entry)
+                ):
+                    entry = prior
+                else:
+                    entry = await _with_checksum(
+                        backend, path, entry, checksum
+                    )
+            manifest.entries[entry.path] = entry
+
+    return manifest
+
+
+# ─────────────────────────────── helpers ──────────────────────────────── #
+
+
+def _entry_changed(old: ManifestEntry, new: ManifestEntry) -> bool:
+    if old.size != new.size or old.mtime != new.mtime:
+        return True
+    return (
+        old.checksum is not None
+        and new.checksum is not None
+        and old.checksum != new.checksum
+    )
+
+
+def _entry_from_stat(rel_dir: str, st: FileStat) -> ManifestEntry:
+    path = st.name if rel_dir == "." else f"{rel_dir}/{st.name}"
+    return ManifestEntry(
+        path=path, size=st.size, mtime=st.mtime, is_dir=st.is_dir
+    )
+
+
+def _backend_path(root: str, entry: ManifestEntry) -> str:
+    return posixpath.join(root, entry.path)
+
+
+async def _with_checksum(
+    backend: FileBackend, root: str, entry: ManifestEntry, algorithm: str
+) -> ManifestEntry:
+    return ManifestEntry(
+        path=entry.path,
+        size=entry.size,
+        mtime=entry.mtime,
+        is_dir=False,
+        checksum=await backend.checksum(
+            _backend_path(root, entry), algorithm
+        ),
+    )
@@ -0,0 +1,599 @@
+# src/darca_storage/packed_store.py
+# License: MIT
+"""
+Packed key-value storage for large numbers of small objects.
+
+Writing millions of sub-kilobyte objects as individual files wastes inodes
+and makes directory listings slow.  A `PackedObjectStore` instead appends
+every ``put`` / ``delete`` as a record to a log-structured *segment* file
+inside one directory of a storage client's scoped root::
+
+    <root>/LOCK
+    <root>/00000001.pack
+    <root>/00000002.pack   ← active segment, receives all appends
+
+Record layout (little-endian)::
+
+    crc32 (4) | kind (1) | key length (2) | value length (4) | key | value
+
+The CRC covers everything after it.  An in-memory index maps each key to the
+location of its latest value; it is rebuilt by replaying the segments when
+the store is opened.  A damaged record at the end of the newest segment is
+what an interrupted append leaves behind, and is truncated away.
+
+Overwritten and deleted records become garbage.  A tombstone stays live
+only while an older segment still holds a value it hides.  Once at least
+*compact_ratio* of a sealed segment is garbage, a background task copies its
+live records into the active segment and removes the file.
+
+All file I/O runs in worker threads (`run_in_thread`).  A store must be
+opened by a single instance at a time; this is enforced with a lock file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from darca_storage.decorators.scoped_backend import (
+    ScopedFileBackend,
+    resolve_scoped_path,
+)
+from darca_storage.exceptions import StoragePackCorrupted, StoragePackLocked
+from darca_storage.executors import run_in_thread
+from darca_storage.interfaces.file_backend import Buffer
+
+try:  # POSIX only; elsewhere the lock file only guards this process
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_HEADER = struct.Struct("<IBHI")
+_PUT = 0
+_DELETE = 1
+_SEGMENT = re.compile(r"^(\d{8})\.pack$")
+_MAX_KEY_BYTES = 0xFFFF
+_ITERATE_BATCH = 256
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _sync_directory(path: str) -> None:
+    if not hasattr(os, "O_DIRECTORY"):  # pragma: no cover  (Windows)
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _Location(NamedTuple):
+    segment: int
+    offset: int  # of the value
+    size: int  # of the value
+    record: int  # size of the whole record
+    first: int  # oldest segment that may still hold a value of the key
+
+
+class _Grave(NamedTuple):
+    first: int  # oldest segment that may still hold a value of the key
+    segment: int  # of the tombstone
+    record: int  # size of the tombstone
+
+
+def _encode_record(kind: int, key: bytes, value: Buffer) -> bytes:
+    body = _HEADER.pack(0, kind, len(key), memoryview(value).nbytes)[4:]
+    crc = zlib.crc32(value, zlib.crc32(key, zlib.crc32(body)))
+    return b"".join((struct.pack("<I", crc), body, key, value))
+
+
+class PackedObjectStore:
+    """
+    Log-structured key-value store under a storage client's root.
+
+    Open it with `PackedObjectStore.open` (or `StorageClient.packed_store`)
+    and close it when done; it can also be used as an ``async with`` block.
+
+    Args:
+        root:          Absolute directory holding the segments.
+        segment_bytes: Size at which the active segment is sealed and a new
+                       one started.
+        compact_ratio: Fraction of garbage at which a sealed segment is
+                       compacted (0 < ratio <= 1).
+        sync:          ``fdatasync`` after every append, so acknowledged
+                       writes survive a power failure.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        segment_bytes: int = 64 * 1024 * 1024,
+        compact_ratio: float = 0.5,
+        sync: bool = False,
+    ) -> None:
+        if segment_bytes <= 0:
+            raise ValueError("segment_bytes must be positive.")
+        if not 0 < compact_ratio <= 1:
+            raise ValueError("compact_ratio must be in (0, 1].")
+        self._root = root
+        self._segment_bytes = segment_bytes
+        self._compact_ratio = compact_ratio
+        self._sync = sync
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, _Location] = {}
+        self._graves: Dict[str, _Grave] = {}
+        self._fds: Dict[int, int] = {}
+        self._sizes: Dict[int, int] = {}
+        self._live: Dict[int, int] = {}
+        self._active = 0
+        self._lock_fd: Optional[int] = None
+        self._compactor: Optional[asyncio.Future] = None
+        self._closed = False
+        self._counters = {"compactions": 0, "bytes_reclaimed": 0}
+
+    @classmethod
+    async def open(
+        cls, client: Any, relative_path: str = ".", **options: Any
+    ) -> PackedObjectStore:
+        """
+        Open (or create) the store in *relative_path* of *client*.
+
+        The client must be backed by a `ScopedFileBackend` on local disk;
+        *options* are passed to the constructor.
+
+        Raises:
+            TypeError:             If the client is not scoped to a local
+                                   directory.
+            StoragePackLocked:     If the store is already open.
+            StoragePackCorrupted:  If a sealed segment is damaged.
+        """
+        backend = client.backend
+        if not isinstance(backend, ScopedFileBackend):
+            raise TypeError(
+                "Packed object stores need a client backed by a "
+                f"ScopedFileBackend, got {type(backend).__name__}."
+            )
+        await client.mkdir(relative_path, parents=True)
+        store = cls(
+            resolve_scoped_path(backend.base_path, relative_path), **options
+        )
+        await run_in_thread(store._load)
+        return store
+
+    async def __aenter__(self) -> PackedObjectStore:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def root(self) -> str:
+        """Directory holding the segments."""
+        return self._root
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self._sizes.values())
+            live = sum(self._live.values())
+            return {
+                "packed_store": {
+                    **self._counters,
+                    "keys": len(self._index),
+                    "segments": len(self._fds),
+                    "bytes": total,
+                    "garbage_bytes": total - live,
+                }
+            }
+
+    def resources(self) -> Dict[str, int]:
+        return {
+            "open_handles": len(self._fds) + (self._lock_fd is not None),
+            "in_flight": int(self._compacting()),
+        }
+
+    # ───────────────────────────── operations ───────────────────────────── #
+
+    async def put(self, key: str, value: Union[str, Buffer]) -> None:
+        """Store *value* (text is stored as UTF-8) under *key*."""
+        self._check_open()
+        await run_in_thread(self._put, key, value)
+        self._maybe_compact()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under *key*, or None."""
+        self._check_open()
+        if key not in self._index:
+            return None
+        return await run_in_thread(self._get, key)
+
+    async def delete(self, key: str) -> bool:
+        """Remove *key*; returns False if it was not present."""
+        self._check_open()
+        if key not in self._index:
+            return False
+        removed = await run_in_thread(self._delete, key)
+        self._maybe_compact()
+        return removed
+
+    async def iterate(
+        self, prefix: str = ""
+    ) -> AsyncIterator[Tuple[str, bytes]]:
+        """
+        Yield ``(key, value)`` pairs for keys starting with *prefix*.
+
+        Keys come in sorted order, as of the start of the iteration; keys
+        deleted meanwhile are skipped.  Values are fetched in batches, one
+        worker hop per batch.
+        """
+        self._check_open()
+        keys = sorted(k for k in list(self._index) if k.startswith(prefix))
+        for start in range(0, len(keys), _ITERATE_BATCH):
+            batch = keys[start : start + _ITERATE_BATCH]
+            for key, value in await run_in_thread(self._get_many, batch):
+                yield key, value
+
+    async def compact(self) -> None:
+        """Compact every sealed segment with enough garbage, and wait."""
+        self._check_open()
+        self._maybe_compact()
+        if self._compactor is not None:
+            await asyncio.shield(self._compactor)
+
+    async def flush(self) -> None:
+        """Flush the active segment to stable storage."""
+        if not self._closed:
+            await run_in_thread(self._flush)
+
+    async def close(self) -> None:
+        """Wait for compaction, flush and release the files."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._compactor is not None:
+                await asyncio.gather(self._compactor, return_exceptions=True)
+        finally:
+            await run_in_thread(self._close)
+
+    # ─────────────────────────── worker methods ─────────────────────────── #
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError(f"Packed object store '{self._root}' is closed.")
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self._root, f"{segment:08d}.pack")
+
+    def _load(self) -> None:
+        self._lock_fd = os.open(
+            os.path.join(self._root, "LOCK"),
+            os.O_RDWR | os.O_CREAT | os.O_CLOEXEC,
+            0o666,
+        )
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    raise StoragePackLocked(self._root)
+            segments = sorted(
+                int(m.group(1))
+                for m in map(_SEGMENT.match, os.listdir(self._root))
+                if m
+            )
+            for position, segment in enumerate(segments):
+                self._replay(segment, last=position == len(segments) - 1)
+            self._open_segment(segments[-1] if segments else 1)
+        except BaseException:
+            self._close()
+            raise
+
+    def _replay(self, segment: int, *, last: bool) -> None:
+        path = self._path(segment)
+        with open(path, "rb") as fh:
+            data = fh.read()
+        offset = 0
+        self._sizes[segment] = self._live[segment] = 0
+        while offset < len(data):
+            reason = None
+            if len(data) - offset < _HEADER.size:
+                reason = "truncated header"
+            else:
+                crc, kind, key_len, value_len = _HEADER.unpack_from(
+                    data, offset
+                )
+                end = offset + _HEADER.size + key_len + value_len
+                if end > len(data):
+                    reason = "truncated record"
+                elif crc != zlib.crc32(data[offset + 4 : end]):
+                    reason = "checksum mismatch"
+                elif kind not in (_PUT, _DELETE):
+                    reason = f"unknown record kind {kind}"
+            if reason is not None:
+                if not last:
+                    raise StoragePackCorrupted(path, offset, reason)
+                os.truncate(path, offset)  # an interrupted append
+                break
+            key_start = offset + _HEADER.size
+            key = data[key_start : key_start + key_len].decode("utf-8")
+            self._sizes[segment] = end
+            if kind == _PUT:
+                self._link(
+                    key,
+                    _Location(
+                        segment,
+                        key_start + key_len,
+                        value_len,
+                        end - offset,
+                        self._first(key, segment),
+                    ),
+                )
+            else:
+                # A tombstone left twice by an interrupted compaction
+                # replaces the grave of the first copy.
+                location = self._index.get(key)
+                first = self._exhume(key)
+                if location is not None:
+                    self._unlink(key)
+                    first = location.first
+                if first is not None:
+                    self._bury(key, first, segment, end - offset)
+            offset = end
+        self._fds[segment] = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+
+    def _open_segment(self, segment: int) -> None:
+        replayed = self._fds.get(segment)
+        if replayed is not None:  # reopen the newest segment for appends
+            os.close(replayed)
+        fd = os.open(
+            self._path(segment),
+            os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC,
+            0o666,
+        )
+        self._fds[segment] = fd
+        self._sizes.setdefault(segment, 0)
+        self._live.setdefault(segment, 0)
+        self._active = segment
+
+    def _link(self, key: str, location: _Location) -> None:
+        self._unlink(key)
+        self._index[key] = location
+        self._live[location.segment] += location.record
+
+    def _unlink(self, key: str) -> bool:
+        old = self._index.pop(key, None)
+        if old is None:
+            return False
+        self._live[old.segment] -= old.record
+        return True
+
+    def _first(self, key: str, segment: int) -> int:
+        """Oldest segment that may hold a value of *key*, put in *segment*."""
+        location = self._index.get(key)
+        if location is not None:
+            return location.first
+        first = self._exhume(key)
+        return segment if first is None else first
+
+    def _hides(self, first: int, segment: int) -> bool:
+        """Whether a tombstone in *segment* hides a value still on disk."""
+        return any(first <= other < segment for other in self._fds)
+
+    def _bury(self, key: str, first: int, segment: int, record: int) -> None:
+        """
+        Track the tombstone of *key* in *segment* while it hides a value.
+
+        Such a tombstone counts as live data; one that hides nothing is
+        garbage from the start.
+        """
+        if self._hides(first, segment):
+            self._graves[key] = _Grave(first, segment, record)
+            self._live[segment] += record
+
+    def _exhume(self, key: str) -> Optional[int]:
+        """Forget the tombstone of *key*; return its oldest segment."""
+        grave = self._graves.pop(key, None)
+        if grave is None:
+            return None
+        self._live[grave.segment] -= grave.record
+        return grave.first
+
+    def _append(self, record: bytes) -> int:
+        """Append *record* to the active segment; return its offset."""
+        if self._sizes[self._active] >= self._segment_bytes:
+            if self._sync:
+                _fdatasync(self._fds[self._active])
+            self._open_segment(self._active + 1)
+        fd = self._fds[self._active]
+        offset = self._sizes[self._active]
+        view = memoryview(record)
+        while view:
+            view = view[os.write(fd, view) :]
+        self._sizes[self._active] = offset + len(record)
+        if self._sync:
+            _fdatasync(fd)
+        return offset
+
+    def _put(self, key: str, value: Union[str, Buffer]) -> None:
+        raw_key = key.encode("utf-8")
+        if len(raw_key) > _MAX_KEY_BYTES:
+            raise ValueError(f"Key exceeds {_MAX_KEY_BYTES} bytes: {key!r}")
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        record = _encode_record(_PUT, raw_key, value)
+        value_offset = _HEADER.size + len(raw_key)
+        with self._lock:
+            offset = self._append(record)
+            self._link(
+                key,
+                _Location(
+                    self._active,
+                    offset + value_offset,
+                    len(record) - value_offset,
+                    len(record),
+                    self._first(key, self._active),
+                ),
+            )
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return None
+            return os.pread(
+                self._fds[location.segment], location.size, location.offset
+            )
+
+    def _get_many(self, keys: List[str]) -> List[Tuple[str, bytes]]:
+        found = []
+        for key in keys:
+            value = self._get(key)
+            if value is not None:
+                found.append((key, value))
+        return found
+
+    def _delete(self, key: str) -> bool:
+        record = _encode_record(_DELETE, key.encode("utf-8"), b"")
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return False
+            self._append(record)
+            self._unlink(key)
+            self._bury(key, location.first, self._active, len(record))
+            return True
+
+    def _flush(self) -> None:
+        with self._lock:
+            if self._active in self._fds:
+                _fdatasync(self._fds[self._active])
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._active in self._fds and self._sizes[self._active]:
+                _fdatasync(self._fds[self._active])
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)  # releases the flock
+                self._lock_fd = None
+
+    # ───────────────────────────── compaction ───────────────────────────── #
+
+    def _compacting(self) -> bool:
+        return self._compactor is not None and not self._compactor.done()
+
+    def _candidates(self) -> List[int]:
+        return [
+            segment
+            for segment, size in self._sizes.items()
+            if segment != self._active
+            and size
+            and size - self._live[segment] >= size * self._compact_ratio
+        ]
+
+    def _maybe_compact(self) -> None:
+        if self._compacting() or self._closed or not self._candidates():
+            return
+        self._compactor = asyncio.ensure_future(self._compact_all())
+
+    async def _compact_all(self) -> None:
+        while True:
+            with self._lock:
+                candidates = self._candidates()
+            if not candidates:
+                return
+            for segment in candidates:
+                if self._closed:
+                    return
+                await run_in_thread(self._compact_segment, segment)
+
+    def _compact_segment(self, segment: int) -> None:
+        """Move the live records of sealed *segment*, then remove it."""
+        path = self._path(segment)
+        with open(path, "rb") as fh:
+            data = fh.read()
+        with self._lock:
+            # Once this segment is gone, the oldest segment that may hold
+            # a value of a key whose oldest value was here is the next one.
+            successor = min(other for other in self._fds if other > segment)
+        offset = copied = 0
+        written = set()
+        while offset < len(data):
+            _, kind, key_len, value_len = _HEADER.unpack_from(data, offset)
+            key_start = offset + _HEADER.size
+            end = key_start + key_len + value_len
+            key = data[key_start : key_start + key_len].decode("utf-8")
+            record = data[offset:end]
+            with self._lock:
+                location = self._index.get(key)
+                grave = self._graves.get(key)
+                if kind == _PUT:
+                    if location is not None and location.first == segment:
+                        location = location._replace(first=successor)
+                        self._index[key] = location
+                    elif grave is not None and grave.first == segment:
+                        self._graves[key] = grave._replace(first=successor)
+                    if location is not None and location[:2] == (
+                        segment,
+                        key_start + key_len,
+                    ):
+                        moved = self._append(record)
+                        written.add(self._active)
+                        self._link(
+                            key,
+                            location._replace(
+                                segment=self._active,
+                                offset=moved + _HEADER.size + key_len,
+                            ),
+                        )
+                        copied += len(record)
+                elif grave is not None and grave.segment == segment:
+                    if self._hides(grave.first, segment):
+                        self._append(record)
+                        written.add(self._active)
+                        self._graves[key] = grave._replace(
+                            segment=self._active
+                        )
+                        self._live[self._active] += len(record)
+                        copied += len(record)
+                    else:
+                        del self._graves[key]
+            offset = end
+        with self._lock:
+            # Whatever ``sync`` says, the copies must be durable before the
+            # only other copy of those records goes away.
+            for target in written:
+                _fdatasync(self._fds[target])
+            if written:
+                _sync_directory(self._root)
+            os.close(self._fds.pop(segment))
+            self._live.pop(segment)
+            reclaimed = self._sizes.pop(segment) - copied
+            self._counters["bytes_reclaimed"] += reclaimed
+            self._counters["compactions"] += 1
+            os.unlink(path)
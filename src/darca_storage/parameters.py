@@ -0,0 +1,118 @@
+# src/darca_storage/parameters.py
+# License: MIT
+"""
+Helpers for reading typed values out of connector `parameters`.
+
+`StorageConnectorFactory.from_url` accepts parameters as a flat string map
+(``{"max_concurrency": "8"}``).  Parameters may also be supplied through
+``session_metadata["storage_parameters"]``; explicit `parameters` win.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Mapping, Optional, TypeVar
+
+SESSION_PARAMETERS_KEY = "storage_parameters"
+
+T = TypeVar("T")
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+def resolve_parameters(
+    parameters: Optional[Mapping[str, Any]],
+    session_metadata: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, str]:
+    """
+    Merge session-level and explicit parameters into one string map.
+
+    ``session_metadata["tenant"]`` is used as the ``tenant`` parameter
+    unless one is given explicitly.
+    """
+    session_metadata = session_metadata or {}
+    merged: Dict[str, str] = {}
+    if "tenant" in session_metadata:
+        merged["tenant"] = str(session_metadata["tenant"])
+    for source in (
+        session_metadata.get(SESSION_PARAMETERS_KEY) or {},
+        parameters or {},
+    ):
+        merged.update({k: str(v) for k, v in source.items()})
+    return merged
+
+
+def get_int(parameters: Mapping[str, str], key: str) -> Optional[int]:
+    """Return *key* as an int, or None if absent."""
+    raw = parameters.get(key)
+    if raw is None or raw == "":
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Parameter '{key}' must be an integer, got {raw!r}")
+
+
+def get_float(parameters: Mapping[str, str], key: str) -> Optional[float]:
+    """Return *key* as a float, or None if absent."""
+    raw = parameters.get(key)
+    if raw is None or raw == "":
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"Parameter '{key}' must be a number, got {raw!r}")
+
+
+def get_bool(
+    parameters: Mapping[str, str], key: str, default: bool = False
+) -> bool:
+    """Return *key* as a bool (true/false, yes/no, on/off, 1/0)."""
+    raw = parameters.get(key)
+    if raw is None or raw == "":
+        return default
+    value = str(raw).strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ValueError(f"Parameter '{key}' must be a boolean, got {raw!r}")
+
+
+def with_prefix(parameters: Mapping[str, str], prefix: str) -> Dict[str, str]:
+    """
+    Return the parameters starting with ``prefix + "."``, prefix stripped.
+
+    Example:
+        with_prefix({"max_concurrency.read": "4"}, "max_concurrency")
+        -> {"read": "4"}
+    """
+    head = prefix + "."
+    return {
+        key[len(head) :]: value
+        for key, value in parameters.items()
+        if key.startswith(head)
+    }
+
+
+def get_prefixed(
+    parameters: Mapping[str, str],
+    prefix: str,
+    get: Callable[[Mapping[str, str], str], Optional[T]],
+) -> Dict[str, T]:
+    """
+    Return the ``prefix + "."`` parameters parsed by *get*, prefix stripped.
+
+    Each value is parsed under its full key, so errors name it; empty
+    values are skipped like absent ones.
+
+    Example:
+        get_prefixed({"timeout.read": "2"}, "timeout", get_float)
+        -> {"read": 2.0}
+    """
+    values: Dict[str, T] = {}
+    for name in with_prefix(parameters, prefix):
+        value = get(parameters, f"{prefix}.{name}")
+        if value is not None:
+            values[name] = value
+    return values
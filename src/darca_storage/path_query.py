@@ -0,0 +1,249 @@
+# src/darca_storage/path_query.py
+# License: MIT
+"""
+Filtered directory walks evaluated next to the data.
+
+A `PathQuery` describes which entries of a tree a caller wants: glob
+*include* and *exclude* patterns, a *max_depth* and a *min_mtime*.  `walk`
+evaluates it during the walk itself, so a backend never materialises the
+whole tree: subtrees that no include pattern can match, and directories
+that an exclude pattern matches, are not entered at all.
+
+Patterns follow ``.gitignore`` anchoring: a pattern containing a ``/``
+(other than a trailing one) is matched against the path relative to the
+walked directory, and a leading ``/`` only anchors; a pattern without one
+matches an entry's name at any depth.  Within a component ``*``, ``?`` and
+``[...]`` work as in `fnmatch`; ``**`` spans any number of directories.
+As in `glob`, wildcards do not match names starting with ``.``, and ``**``
+does not enter such directories, unless the pattern spells the dot out.
+
+Results come in a stable order (names sorted per directory, parents before
+children) and can be fetched in pages: ``walk(..., after=last_path)``
+continues after the last path of the previous page without any state
+being kept in between.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+_MAGIC = frozenset("*?[")
+
+
+def _has_magic(part: str) -> bool:
+    return not _MAGIC.isdisjoint(part)
+
+
+def _parts(pattern: str) -> Tuple[str, ...]:
+    return tuple(part for part in pattern.split("/") if part not in ("", "."))
+
+
+@dataclass(frozen=True)
+class _Pattern:
+    """One glob pattern, matched one path component at a time."""
+
+    parts: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, pattern: str) -> _Pattern:
+        anchored = "/" in pattern.rstrip("/")
+        parts = _parts(pattern)
+        return cls(parts if anchored else ("**",) + parts)
+
+    def _closure(self, states: Iterable[int]) -> FrozenSet[int]:
+        closed = set(states)
+        for index in sorted(closed):
+            while index < len(self.parts) and self.parts[index] == "**":
+                index += 1
+                closed.add(index)
+        return frozenset(closed)
+
+    def start(self) -> FrozenSet[int]:
+        return self._closure((0,))
+
+    def step(self, states: FrozenSet[int], name: str) -> FrozenSet[int]:
+        """States after descending into (or reaching) entry *name*."""
+        hidden = name.startswith(".")
+        reached = set()
+        for index in states:
+            if index == len(self.parts):
+                continue
+            part = self.parts[index]
+            if part == "**":
+                if not hidden:
+                    reached.add(index)
+            elif not (hidden and _has_magic(part) and part[0] != "."):
+                if fnmatchcase(name, part):
+                    reached.add(index + 1)
+        return self._closure(reached)
+
+    def accepts(self, states: FrozenSet[int]) -> bool:
+        return len(self.parts) in states
+
+    def continues(self, states: FrozenSet[int]) -> bool:
+        """True if entries below the current directory can still match."""
+        return any(index < len(self.parts) for index in states)
+
+
+@dataclass(frozen=True)
+class PathQuery:
+    """
+    Which entries of a tree to report; see the module docs for patterns.
+
+    Attributes:
+        include:   Report entries matching any of these (all if empty).
+        exclude:   Skip entries matching any of these; matching
+                   directories are not entered.
+        max_depth: 1 reports direct children only; None is unlimited.
+        min_mtime: Only report entries modified at or after this UNIX
+                   time (directories are still entered).
+    """
+
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    max_depth: Optional[int] = None
+    min_mtime: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.max_depth is not None and self.max_depth < 1:
+            raise ValueError("max_depth must be at least 1.")
+
+    @classmethod
+    def build(
+        cls,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        min_mtime: Optional[float] = None,
+    ) -> PathQuery:
+        """Build a query from a pattern or an iterable of patterns each."""
+        return cls(
+            include=_patterns(include),
+            exclude=_patterns(exclude),
+            max_depth=max_depth,
+            min_mtime=min_mtime,
+        )
+
+    def escaping_pattern(self) -> Optional[str]:
+        """The first pattern using ``..`` (and so leaving the tree), if any."""
+        for pattern in self.include + self.exclude:
+            if ".." in _parts(pattern):
+                return pattern
+        return None
+
+
+def _patterns(patterns: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    if patterns is None:
+        return ()
+    if isinstance(patterns, str):
+        return (patterns,)
+    return tuple(patterns)
+
+
+def _modified_since(entry: os.DirEntry, min_mtime: Optional[float]) -> bool:
+    if min_mtime is None:
+        return True
+    try:
+        return entry.stat(follow_symlinks=False).st_mtime >= min_mtime
+    except OSError:
+        return False  # vanished since the directory was read
+
+
+def split_glob(pattern: str) -> Tuple[str, str]:
+    """
+    Split *pattern* into the directory to walk and an anchored pattern.
+
+    The directory is the longest run of leading components without
+    wildcards, minus the last component::
+
+        split_glob("data/2024-*/*.parquet") -> ("data", "/2024-*/*.parquet")
+        split_glob("*.txt")                 -> (".", "/*.txt")
+    """
+    parts = _parts(pattern)
+    if not parts:
+        raise ValueError(f"Empty glob pattern {pattern!r}.")
+    literal = 0
+    while literal < len(parts) - 1 and not _has_magic(parts[literal]):
+        literal += 1
+    base = "/".join(parts[:literal]) or "."
+    return base, "/" + "/".join(parts[literal:])
+
+
+def walk(
+    root: str,
+    query: PathQuery,
+    *,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[str]:
+    """
+    Return the entries under directory *root* that match *query*.
+
+    Paths are relative to *root* and ``/``-separated.  At most *limit* are
+    returned, all strictly after *after* in walk order.  Symbolic links are
+    reported but never followed, and subdirectories that cannot be read
+    are skipped.
+
+    Raises:
+        OSError: If *root* itself cannot be read.
+    """
+    includes = [_Pattern.compile(pattern) for pattern in query.include]
+    excludes = [_Pattern.compile(pattern) for pattern in query.exclude]
+    resume = tuple(after.split("/")) if after else None
+    results: List[str] = []
+
+    def visit(
+        directory: str,
+        prefix: Tuple[str, ...],
+        included: Sequence[FrozenSet[int]],
+        excluded: Sequence[FrozenSet[int]],
+    ) -> bool:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            parts = prefix + (entry.name,)
+            seen = False
+            if resume is not None:
+                seen = resume[: len(parts)] == parts  # resume is at/below
+                if not seen and parts < resume:
+                    continue  # the whole subtree came on earlier pages
+            ex = [p.step(s, entry.name) for p, s in zip(excludes, excluded)]
+            if any(p.accepts(s) for p, s in zip(excludes, ex)):
+                continue
+            inc = [p.step(s, entry.name) for p, s in zip(includes, included)]
+            matched = not includes or any(
+                p.accepts(s) for p, s in zip(includes, inc)
+            )
+            if (
+                matched
+                and not seen
+                and _modified_since(entry, query.min_mtime)
+            ):
+                results.append("/".join(parts))
+                if limit is not None and len(results) >= limit:
+                    return True
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if query.max_depth is not None and len(parts) >= query.max_depth:
+                continue
+            if includes and not any(
+                p.continues(s) for p, s in zip(includes, inc)
+            ):
+                continue  # nothing below can match
+            try:
+                if visit(entry.path, parts, inc, ex):
+                    return True
+            except OSError:
+                continue  # unreadable subdirectory
+        return False
+
+    visit(
+        root,
+        (),
+        [p.start() for p in includes],
+        [p.start() for p in excludes],
+    )
+    return results
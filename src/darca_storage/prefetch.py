@@ -0,0 +1,127 @@
+# src/darca_storage/prefetch.py
+# License: MIT
+"""
+Read-ahead for predictable access sequences.
+
+`prefetch` reads a known sequence of paths and yields their contents in
+order, keeping up to *window* reads in flight ahead of the consumer so that
+I/O overlaps with whatever the consumer does between items.  Results that
+are ready but not yet consumed count against *max_bytes*; while they exceed
+it no further reads are started (one read is always allowed, so progress is
+guaranteed).  Paths further ahead can be announced to the backend with a
+``will_need`` hint (``posix_fadvise(WILLNEED)`` on local disk) so the kernel
+starts reading them before a worker does.
+
+Errors are raised when the consumer reaches the failed path.  Closing the
+iterator early (e.g. with `contextlib.aclosing`) cancels the outstanding
+reads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import suppress
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from darca_storage.decorators.forwarding_backend import content_size
+
+T = TypeVar("T")
+
+
+async def prefetch(
+    read: Callable[[str], Awaitable[T]],
+    paths: Iterable[str],
+    *,
+    window: int = 4,
+    max_bytes: Optional[int] = None,
+    advise: Optional[Callable[[str], Awaitable[None]]] = None,
+    advise_ahead: int = 0,
+) -> AsyncIterator[Tuple[str, T]]:
+    """
+    Yield ``(path, read(path))`` for every path, in order, reading ahead.
+
+    Args:
+        read:         Coroutine function reading one path.
+        paths:        Paths in consumption order (any iterable; consumed
+                      lazily).
+        window:       Maximum reads in flight or waiting to be consumed.
+        max_bytes:    Budget for results waiting to be consumed; None is
+                      unbounded.
+        advise:       Coroutine function hinting that a path will be read
+                      soon; failures are ignored.
+        advise_ahead: How many paths beyond the window to hint.
+
+    Raises:
+        ValueError: If *window* is smaller than 1.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1.")
+    upcoming = iter(paths)
+    queued: Deque[str] = deque()  # announced, not started
+    started: Deque[Tuple[str, asyncio.Future]] = deque()
+    hints: Set[asyncio.Future] = set()
+
+    def waiting_bytes() -> int:
+        return sum(
+            content_size(task.result())
+            for _, task in started
+            if task.done() and not task.cancelled() and not task.exception()
+        )
+
+    def take() -> Optional[str]:
+        if queued:
+            return queued.popleft()
+        return next(upcoming, None)
+
+    def fill() -> None:
+        while len(started) < window and (
+            max_bytes is None or not started or waiting_bytes() < max_bytes
+        ):
+            path = take()
+            if path is None:
+                break
+            started.append((path, asyncio.ensure_future(read(path))))
+        if advise is None:
+            return
+        while len(queued) < advise_ahead:
+            path = next(upcoming, None)
+            if path is None:
+                break
+            queued.append(path)
+            hint = asyncio.ensure_future(advise(path))
+            hints.add(hint)
+            hint.add_done_callback(_forget(hints))
+
+    try:
+        fill()
+        while started:
+            path, task = started.popleft()
+            result = await task
+            fill()  # before yielding, so reads overlap the consumer's work
+            yield path, result
+    finally:
+        outstanding = [task for _, task in started] + list(hints)
+        for task in outstanding:
+            task.cancel()
+        with suppress(asyncio.CancelledError):
+            await asyncio.gather(*outstanding, return_exceptions=True)
+
+
+def _forget(hints: Set[asyncio.Future]) -> Callable[[asyncio.Future], None]:
+    def done(hint: asyncio.Future) -> None:
+        hints.discard(hint)
+        if not hint.cancelled():
+            hint.exception()  # a failed hint is not an error
+
+    return done
@@ -0,0 +1,311 @@
+# darca_storage/sync_client.py
+# License: MIT
+"""
+Blocking storage client for callers without an event loop.
+
+CLI tools, multiprocessing workers and legacy code can use
+`SyncStorageClient` instead of wrapping every `StorageClient` call in
+`asyncio.run`.  Each operation runs directly on the calling thread: there is
+no event-loop creation, no thread hop and no task scheduling, which makes a
+single small operation roughly an order of magnitude cheaper (see the usage
+guide).
+
+Paths are confined by `SyncScopedFileBackend` exactly as `ScopedFileBackend`
+does for the async client, and the same exception types are raised.  Like
+`StorageClient`, the client can be closed (or used as a ``with`` block),
+after which operations raise `StorageClientClosed`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from darca_storage.decorators.forwarding_backend import RESOURCE_KEYS
+from darca_storage.decorators.scoped_backend import SyncScopedFileBackend
+from darca_storage.exceptions import StorageClientClosed
+from darca_storage.interfaces.file_backend import (
+    Buffer,
+    Content,
+    FileStat,
+    NotModified,
+)
+from darca_storage.path_query import PathQuery, split_glob
+
+
+class SyncStorageClient:
+    """
+    Session-aware blocking client wrapping a SyncScopedFileBackend.
+
+    Offers the same operations, properties and `context()` as
+    `StorageClient`, as plain methods.
+    """
+
+    def __init__(
+        self,
+        backend: SyncScopedFileBackend,
+        *,
+        session_metadata: Optional[Dict[str, Any]] = None,
+        user: Optional[str] = None,
+        credentials: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._backend = backend
+        self._session_metadata = session_metadata or {}
+        self._user = user
+        self._credentials = credentials or {}
+        self._closed = False
+
+    def _check_open(self, operation: str) -> None:
+        if self._closed:
+            raise StorageClientClosed(operation)
+
+    def __enter__(self) -> SyncStorageClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """True once `close()` has been called."""
+        return self._closed
+
+    def close(self) -> None:
+        """
+        Close the client; later operations raise `StorageClientClosed`.
+
+        The blocking backend keeps no buffers or handles between calls,
+        so there is nothing else to release.
+        """
+        self._closed = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Same shape as `StorageClient.stats` (all resources are zero)."""
+        return {
+            "client": {"closed": self._closed, "in_flight": {}},
+            "resources": dict.fromkeys(RESOURCE_KEYS, 0),
+        }
+
+    def read(
+        self,
+        relative_path: str,
+        *,
+        binary: bool = False,
+        verify: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Union[str, bytes, NotModified]:
+        self._check_open("read")
+        return self._backend.read(
+            relative_path,
+            binary=binary,
+            verify=verify,
+            if_none_match=if_none_match,
+        )
+
+    def write(
+        self,
+        relative_path: str,
+        content: Content,
+        *,
+        binary: bool = False,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        self._check_open("write")
+        self._backend.write(
+            relative_path,
+            content,
+            binary=binary,
+            permissions=permissions,
+            user=user or self._user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    def writev(
+        self,
+        relative_path: str,
+        buffers: Iterable[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        self._check_open("writev")
+        self._backend.writev(
+            relative_path,
+            list(buffers),
+            permissions=permissions,
+            user=user or self._user,
+            checksum=checksum,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
+
+    def delete(self, relative_path: str) -> None:
+        self._check_open("delete")
+        self._backend.delete(relative_path)
+
+    def exists(self, relative_path: str) -> bool:
+        self._check_open("exists")
+        return self._backend.exists(relative_path)
+
+    def list(
+        self,
+        relative_path: str = ".",
+        *,
+        recursive: bool = False,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        min_mtime: Optional[float] = None,
+    ) -> List[str]:
+        if (
+            include is None
+            and exclude is None
+            and max_depth is None
+            and min_mtime is None
+        ):
+            self._check_open("list")
+            return self._backend.list(relative_path, recursive=recursive)
+        if max_depth is None and not recursive:
+            max_depth = 1
+        return list(
+            self.walk(
+                relative_path,
+                include=include,
+                exclude=exclude,
+                max_depth=max_depth,
+                min_mtime=min_mtime,
+            )
+        )
+
+    def mkdir(
+        self,
+        relative_path: str,
+        *,
+        parents: bool = True,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> None:
+        self._check_open("mkdir")
+        self._backend.mkdir(
+            relative_path,
+            parents=parents,
+            permissions=permissions,
+            user=user or self._user,
+        )
+
+    def rmdir(self, relative_path: str) -> None:
+        self._check_open("rmdir")
+        self._backend.rmdir(relative_path)
+
+    def rename(self, src_relative: str, dest_relative: str) -> None:
+        self._check_open("rename")
+        self._backend.rename(src_relative, dest_relative)
+
+    def stat_mtime(self, relative_path: str) -> float:
+        self._check_open("stat_mtime")
+        return self._backend.stat_mtime(relative_path)
+
+    def stat(self, relative_path: str) -> FileStat:
+        self._check_open("stat")
+        return self._backend.stat(relative_path)
+
+    def scan(self, relative_path: str = ".") -> List[FileStat]:
+        self._check_open("scan")
+        return self._backend.scan(relative_path)
+
+    def find(
+        self,
+        relative_path: str,
+        query: PathQuery,
+        *,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        self._check_open("find")
+        return self._backend.find(
+            relative_path, query, after=after, limit=limit
+        )
+
+    def walk(
+        self,
+        relative_path: str = ".",
+        *,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        min_mtime: Optional[float] = None,
+        page_size: int = 1000,
+    ) -> Iterator[str]:
+        query = PathQuery.build(include, exclude, max_depth, min_mtime)
+        after = None
+        while True:
+            page = self.find(
+                relative_path, query, after=after, limit=page_size
+            )
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page[-1]
+
+    def glob(
+        self,
+        pattern: str,
+        *,
+        min_mtime: Optional[float] = None,
+        page_size: int = 1000,
+    ) -> Iterator[str]:
+        base, rest = split_glob(pattern)
+        if base != "." and not self.exists(base):
+            return
+        for path in self.walk(
+            base, include=rest, min_mtime=min_mtime, page_size=page_size
+        ):
+            yield path if base == "." else f"{base}/{path}"
+
+    def checksum(self, relative_path: str, algorithm: str = "sha256") -> str:
+        self._check_open("checksum")
+        return self._backend.checksum(relative_path, algorithm)
+
+    @property
+    def backend(self) -> SyncScopedFileBackend:
+        """Access the underlying backend (for diagnostics or chaining)."""
+        return self._backend
+
+    @property
+    def session(self) -> Dict[str, Any]:
+        """Arbitrary metadata describing the active storage session."""
+        return self._session_metadata
+
+    @property
+    def user(self) -> Optional[str]:
+        """Logical user this session may be scoped to."""
+        return self._user
+
+    @property
+    def credentials(self) -> Dict[str, str]:
+        """Credentials associated with this session (if any)."""
+        return self._credentials
+
+    def context(self) -> Dict[str, Any]:
+        """
+        Return contextual information for debugging or observability.
+        Redacts credentials by default.
+        """
+        return {
+            "user": self._user,
+            "session_metadata": self._session_metadata,
+            "backend_type": type(self._backend).__name__,
+            "credentials": (
+                {k: "***" for k in self._credentials}
+                if self._credentials
+                else None
+            ),
+        }
@@ -0,0 +1,521 @@
+# src/darca_storage/transaction.py
+# License: MIT
+"""
+Multi-file changes staged together and published on commit.
+
+A `Transaction` records writes, deletes and renames for a client scoped to
+a local directory and changes nothing until it commits.  Then, in one
+worker hop:
+
+1. the changes are reduced to the final state of every path they touch,
+   and checked (files to delete or rename must exist, no target may be a
+   directory) — a failed check raises before anything is published;
+2. new contents are written and fsynced into a hidden staging directory
+   under the scoped root (``.darca-txn/<id>``), and renamed files are
+   hard-linked there, so publishing never copies data;
+3. a journal naming every staged file and delete, with the state each
+   target had when planned, is fsynced: this is the commit point;
+4. staged files are moved into place with ``os.replace``, deletes are
+   unlinked, and each affected directory is fsynced once;
+5. the staging directory is removed.
+
+Each file is replaced atomically, but the set is not: a reader racing
+step 4 can see some files new and others old for that short window.  If
+the process dies, its transaction is finished (roll forward) if it got
+its journal and discarded (roll back) if not, by `recover_transactions`.
+The local connector runs it when it connects, before the new client can
+write, and every commit runs it too.  A replayed change is skipped when
+its target changed since it was planned: that later write wins.
+Concurrent transactions are not isolated from each other: the last one
+to publish a path wins.
+
+Every path goes through `ScopedFileBackend._full_path`, so transactions
+cannot reach outside the scoped root, and the staging directory itself is
+off limits (and hidden from listings).  Renames move files only.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import uuid
+from contextlib import suppress
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from darca_storage.backends.local_file_backend import (
+    LocalFileBackend,
+    SyncLocalFileBackend,
+)
+from darca_storage.decorators.scoped_backend import (
+    STAGING_DIR,
+    ScopedFileBackend,
+    resolve_scoped_path,
+)
+from darca_storage.exceptions import (
+    StorageClientPathViolation,
+    StorageTransactionClosed,
+    StorageTransactionFailed,
+)
+from darca_storage.executors import run_in_thread
+from darca_storage.hashing import validate_algorithm
+from darca_storage.interfaces.file_backend import Buffer, Content
+
+try:  # POSIX only; elsewhere crashed transactions are not recovered
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_JOURNAL = "journal.json"
+
+# Final state of a path: None (absent), the index of the write supplying
+# its content, or the existing file whose content it ends up with.
+_Source = Optional[Union[int, str]]
+
+# What a path held when its change was planned: inode, mtime and size, or
+# None if it was absent.
+_Stamp = Optional[List[int]]
+
+
+class _Op(NamedTuple):
+    kind: str  # "write", "delete" or "rename"
+    path: str  # absolute and confined, like `dest`
+    dest: Optional[str] = None
+    buffers: Tuple[Buffer, ...] = ()
+    permissions: Optional[int] = None
+    user: Optional[str] = None
+    checksum: Optional[str] = None
+
+
+class Transaction:
+    """
+    Writes, deletes and renames published together on `commit`.
+
+    Use it as ``async with client.transaction() as tx:`` — leaving the
+    block commits, leaving it with an exception rolls back.  Staging a
+    change only checks its path and records it; contents are kept by
+    reference, so do not modify a staged buffer before the commit.
+    """
+
+    def __init__(self, client: Any) -> None:
+        backend = client.backend
+        if not isinstance(backend, ScopedFileBackend):
+            raise TypeError(
+                "Transactions need a client backed by a ScopedFileBackend, "
+                f"got {type(backend).__name__}."
+            )
+        self._client = client
+        self._backend = backend
+        self._local = _local_backend(backend)
+        self._staging = backend._full_path(STAGING_DIR)
+        self._ops: List[_Op] = []
+        self._finished = False
+
+    async def __aenter__(self) -> Transaction:
+        return self
+
+    async def __aexit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is None:
+            if not self._finished:
+                await self.commit()
+        else:
+            await self.rollback()
+
+    @property
+    def pending(self) -> int:
+        """Number of changes staged so far."""
+        return len(self._ops)
+
+    def _path(self, relative_path: str, operation: str) -> str:
+        if self._finished:
+            raise StorageTransactionClosed(operation)
+        path = self._backend._full_path(relative_path)
+        if path == self._staging or path.startswith(self._staging + os.sep):
+            raise StorageClientPathViolation(
+                relative_path, self._backend.base_path
+            )
+        return path
+
+    # ───────────────────────────── staging ──────────────────────────────── #
+
+    async def write(
+        self,
+        relative_path: str,
+        content: Content,
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+    ) -> None:
+        """Stage writing *content* (text is encoded as UTF-8)."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        await self.writev(
+            relative_path,
+            (content,),
+            permissions=permissions,
+            user=user,
+            checksum=checksum,
+        )
+
+    async def writev(
+        self,
+        relative_path: str,
+        buffers: Iterable[Buffer],
+        *,
+        permissions: Optional[int] = None,
+        user: Optional[str] = None,
+        checksum: Optional[str] = None,
+    ) -> None:
+        """Stage writing the concatenation of *buffers*."""
+        path = self._path(relative_path, "write")
+        if checksum is not None:
+            validate_algorithm(checksum)
+        self._ops.append(
+            _Op(
+                "write",
+                path,
+                buffers=tuple(buffers),
+                permissions=permissions,
+                user=user,
+                checksum=checksum,
+            )
+        )
+
+    async def delete(self, relative_path: str) -> None:
+        """Stage deleting the file at *relative_path*."""
+        self._ops.append(_Op("delete", self._path(relative_path, "delete")))
+
+    async def rename(self, src: str, dest: str) -> None:
+        """Stage moving the file *src* to *dest*, replacing *dest*."""
+        path = self._path(src, "rename")
+        self._ops.append(_Op("rename", path, self._path(dest, "rename")))
+
+    # ───────────────────────────── outcome ──────────────────────────────── #
+
+    async def commit(self) -> None:
+        """
+        Publish the staged changes.
+
+        Raises:
+            StorageTransactionFailed:  If a change cannot be applied.
+                                       Nothing was published, unless the
+                                       reason says the rest was.
+            StorageTransactionClosed:  If the transaction is finished.
+            StorageClientClosed:       If the client has been closed.
+        """
+        if self._finished:
+            raise StorageTransactionClosed("commit")
+        with self._client._track("commit"):
+            self._finished = True
+            ops, self._ops = self._ops, []
+            touched, failures = await run_in_thread(
+                _publish, self._backend.base_path, ops, self._local
+            )
+        for path in touched:
+            self._backend.invalidate(path)
+        if failures:
+            path, reason = failures[0]
+            raise StorageTransactionFailed(
+                path, f"{reason} (every other change was published)"
+            )
+
+    async def rollback(self) -> None:
+        """Discard the staged changes; does nothing once finished."""
+        self._finished = True
+        self._ops = []
+
+
+def _local_backend(backend: Any) -> SyncLocalFileBackend:
+    """The blocking local backend at the bottom of *backend*'s chain."""
+    while backend is not None:
+        if isinstance(backend, SyncLocalFileBackend):
+            return backend
+        if isinstance(backend, LocalFileBackend):
+            return backend.sync
+        backend = getattr(backend, "_backend", None)
+    raise TypeError("Transactions need a client on local disk.")
+
+
+def recover_transactions(base_path: str) -> List[str]:
+    """
+    Finish or discard the transactions of dead processes under *base_path*.
+
+    Blocking.  Returns the paths it touched, relative to *base_path*.
+    """
+    root = os.path.join(base_path, STAGING_DIR)
+    if not os.path.isdir(root):
+        return []
+    return _recover(base_path, root)
+
+
+# ───────────────────────────── worker side ──────────────────────────────── #
+
+
+def _publish(
+    base: str, ops: List[_Op], local: SyncLocalFileBackend
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Run a whole commit; returns the touched paths and the failures."""
+    root = os.path.join(base, STAGING_DIR)
+    os.makedirs(root, exist_ok=True)
+    touched = _recover(base, root)
+    plan = _plan(base, ops)
+    if not plan:
+        return touched, []
+
+    name = uuid.uuid4().hex
+    directory = os.path.join(root, name)
+    lock = _lock(root, name, wait=True)
+    try:
+        try:
+            os.mkdir(directory)
+            journal = _stage(base, directory, ops, plan, local)
+            _write_journal(directory, journal)
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        published, failures = _apply(base, directory, journal)
+        shutil.rmtree(directory, ignore_errors=True)
+    finally:
+        _unlock(root, name, lock)
+    return touched + published, failures
+
+
+def _plan(base: str, ops: List[_Op]) -> Dict[str, _Source]:
+    """
+    Reduce *ops* to the final state of each path whose state changes.
+
+    Raises:
+        StorageTransactionFailed: If an operation cannot be applied.
+    """
+    state: Dict[str, _Source] = {}
+
+    def current(path: str) -> _Source:
+        if path in state:
+            return state[path]
+        if os.path.isdir(path):
+            raise StorageTransactionFailed(
+                os.path.relpath(path, base), "is a directory"
+            )
+        return path if os.path.lexists(path) else None
+
+    for index, op in enumerate(ops):
+        source = current(op.path)
+        if op.kind == "write":
+            state[op.path] = index
+            continue
+        if source is None:
+            raise StorageTransactionFailed(
+                os.path.relpath(op.path, base), f"cannot {op.kind}: no file"
+            )
+        state[op.path] = None
+        if op.kind == "rename":
+            current(op.dest)
+            state[op.dest] = source
+    return {
+        path: source
+        for path, source in state.items()
+        if source != path and (source is not None or os.path.lexists(path))
+    }
+
+
+def _stage(
+    base: str,
+    directory: str,
+    ops: List[_Op],
+    plan: Dict[str, _Source],
+    local: SyncLocalFileBackend,
+) -> List[List[Any]]:
+    """Write or link every new content into *directory*; returns a journal."""
+    journal = []
+    for number, (path, source) in enumerate(plan.items()):
+        target = os.path.relpath(path, base)
+        stamp = _stamp(path)
+        if source is None:
+            journal.append(["delete", target, stamp])
+            continue
+        staged = os.path.join(directory, str(number))
+        if isinstance(source, int):
+            op = ops[source]
+            local.writev(
+                staged,
+                op.buffers,
+                permissions=op.permissions,
+                user=op.user,
+                checksum=op.checksum,
+            )
+            _sync_file(staged)
+        else:
+            os.link(source, staged)
+        journal.append(["put", target, str(number), stamp])
+    return journal
+
+
+def _stamp(path: str) -> _Stamp:
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def _write_journal(directory: str, journal: List[List[Any]]) -> None:
+    temporary = os.path.join(directory, _JOURNAL + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as fh:
+        json.dump(journal, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(temporary, os.path.join(directory, _JOURNAL))
+    _sync_directory(directory)  # also makes the staged names durable
+
+
+def _read_journal(directory: str) -> Optional[List[List[Any]]]:
+    try:
+        with open(os.path.join(directory, _JOURNAL), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _apply(
+    base: str,
+    directory: str,
+    journal: List[List[Any]],
+    *,
+    recovering: bool = False,
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Publish *journal*: puts first, then deletes.
+
+    Every path appears once, so repeating this after a crash part-way is
+    safe.  When *recovering*, a target that no longer has the state it
+    was planned against is left alone.  Returns the touched paths
+    (relative to *base*) and failures.
+    """
+    touched: List[str] = []
+    failures: List[Tuple[str, str]] = []
+    directories = set()
+    for entry in sorted(journal, key=lambda entry: entry[0] != "put"):
+        target = entry[1]
+        path = resolve_scoped_path(base, target)
+        if recovering and _moved_on(path, entry):
+            continue
+        try:
+            if entry[0] == "put":
+                staged = os.path.join(directory, entry[2])
+                if os.path.lexists(staged):  # else published before a crash
+                    for created in _make_parents(path):
+                        directories.add(os.path.dirname(created))
+                        touched.append(os.path.relpath(created, base))
+                    os.replace(staged, path)
+            else:
+                with suppress(FileNotFoundError):
+                    os.unlink(path)
+        except OSError as error:
+            failures.append((target, error.strerror or str(error)))
+            continue
+        directories.add(os.path.dirname(path))
+        touched.append(target)
+    for parent in sorted(directories):
+        _sync_directory(parent)
+    return touched, failures
+
+
+def _moved_on(path: str, entry: List[Any]) -> bool:
+    """Whether *path* changed since its journal *entry* was planned."""
+    stamped = len(entry) == (4 if entry[0] == "put" else 3)
+    return stamped and _stamp(path) != entry[-1]
+
+
+def _make_parents(path: str) -> List[str]:
+    """Create the missing parent directories of *path*; returns them."""
+    missing = []
+    parent = os.path.dirname(path)
+    while not os.path.isdir(parent):
+        missing.append(parent)
+        parent = os.path.dirname(parent)
+    for parent in reversed(missing):
+        with suppress(FileExistsError):
+            os.mkdir(parent)
+    return missing
+
+
+def _recover(base: str, root: str) -> List[str]:
+    """Finish or discard the transactions of processes that died."""
+    if fcntl is None:  # pragma: no cover
+        return []  # cannot tell a dead transaction from a running one
+    touched: List[str] = []
+    names = {
+        entry[: -len(".lock")] if entry.endswith(".lock") else entry
+        for entry in os.listdir(root)
+    }
+    for name in names:
+        lock = _lock(root, name, wait=False)
+        if lock is None:
+            continue  # still running
+        try:
+            directory = os.path.join(root, name)
+            journal = _read_journal(directory)
+            if journal is not None:
+                touched += _apply(
+                    base, directory, journal, recovering=True
+                )[0]
+            shutil.rmtree(directory, ignore_errors=True)
+        finally:
+            _unlock(root, name, lock)
+    return touched
+
+
+def _lock(root: str, name: str, *, wait: bool) -> Optional[int]:
+    """Lock transaction *name*; None if *wait* is false and it is held."""
+    path = os.path.join(root, name + ".lock")
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                flags = fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB)
+                fcntl.flock(fd, flags)
+            if os.path.samestat(os.fstat(fd), os.stat(path)):
+                return fd
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)  # removed by its last holder meanwhile; start over
+
+
+def _unlock(root: str, name: str, fd: int) -> None:
+    with suppress(FileNotFoundError):
+        os.unlink(os.path.join(root, name + ".lock"))
+    os.close(fd)
+
+
+def _sync_file(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _sync_directory(path: str) -> None:
+    if not hasattr(os, "O_DIRECTORY"):  # pragma: no cover  (Windows)
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,94 @@
+# tests/test_buffer_writes.py
+
+import array
+import os
+
+import pytest
+from darca_file_utils.file_utils import FileUtilsException
+
+from darca_storage.backends import local_file_backend
+from darca_storage.backends.local_file_backend import (
+    LocalFileBackend,
+    SyncLocalFileBackend,
+)
+from darca_storage.client import StorageClient
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.hashing import digest_bytes
+
+
+@pytest.fixture
+def client(temp_storage_dir):
+    return StorageClient(
+        ScopedFileBackend(LocalFileBackend(), base_path=temp_storage_dir)
+    )
+
+
+@pytest.mark.asyncio
+async def test_write_accepts_buffer_objects(client):
+    payload = bytearray(b"0123456789")
+
+    await client.write("a.bin", memoryview(payload)[2:6])
+    await client.write("b.bin", payload)
+    await client.write("c.bin", array.array("H", [1, 2]))
+
+    assert await client.read("a.bin", binary=True) == b"2345"
+    assert await client.read("b.bin", binary=True) == bytes(payload)
+    assert await client.read("c.bin", binary=True) == (
+        array.array("H", [1, 2]).tobytes()
+    )
+
+
+@pytest.mark.asyncio
+async def test_writev_concatenates_and_checksums(client):
+    pieces = [b"head-", bytearray(b"body-"), memoryview(b"tail")]
+
+    await client.writev("v.bin", pieces, checksum="sha256")
+
+    assert await client.read("v.bin", binary=True, verify=True) == (
+        b"head-body-tail"
+    )
+    assert (await client.stat("v.bin")).etag == digest_bytes(
+        "sha256", b"head-body-tail"
+    )
+
+
+@pytest.mark.asyncio
+async def test_writev_honours_conditions(client):
+    await client.writev("lock", [b"a"], if_none_match="*")
+    etag = (await client.stat("lock")).etag
+
+    await client.writev("lock", [b"b", b"c"], if_match=etag)
+
+    assert await client.read("lock") == "bc"
+
+
+def test_short_writes_are_resumed(temp_storage_dir, monkeypatch):
+    real_writev = os.writev
+
+    def trickle(fd, buffers):
+        return real_writev(fd, [bytes(buffers[0][:3])])
+
+    monkeypatch.setattr(local_file_backend.os, "writev", trickle)
+    path = os.path.join(temp_storage_dir, "t.bin")
+
+    SyncLocalFileBackend().writev(path, [b"abcdefg", b"", b"hij"])
+
+    with open(path, "rb") as fh:
+        assert fh.read() == b"abcdefghij"
+
+
+def test_non_contiguous_buffer_is_rejected(temp_storage_dir):
+    path = os.path.join(temp_storage_dir, "x.bin")
+
+    with pytest.raises(TypeError):
+        SyncLocalFileBackend().write(path, memoryview(b"abcdef")[::2])
+
+
+def test_os_errors_surface_as_file_utils_exceptions(temp_storage_dir):
+    backend = SyncLocalFileBackend()
+    os.mkdir(os.path.join(temp_storage_dir, "dir"))
+
+    with pytest.raises(FileUtilsException):
+        backend.writev(os.path.join(temp_storage_dir, "dir"), [b"x"])
+    with pytest.raises(FileUtilsException):
+        backend.writev(os.path.join(temp_storage_dir, "no", "f"), [b"x"])
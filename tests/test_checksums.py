@@ -0,0 +1,114 @@
+# tests/test_checksums.py
+
+import hashlib
+import os
+import zlib
+
+import pytest
+
+from darca_storage.backends.local_file_backend import (
+    CHECKSUM_XATTR,
+    LocalFileBackend,
+)
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.exceptions import (
+    StorageChecksumMismatch,
+    StorageChecksumUnavailable,
+)
+
+
+def _xattrs_supported(path):
+    probe = os.path.join(path, ".xattr_probe")
+    with open(probe, "w") as fh:
+        fh.write("x")
+    try:
+        os.setxattr(probe, "user.darca.probe", b"1")
+        return True
+    except (AttributeError, OSError):
+        return False
+    finally:
+        os.remove(probe)
+
+
+@pytest.fixture
+def backend(temp_storage_dir):
+    if not _xattrs_supported(temp_storage_dir):
+        pytest.skip("filesystem does not support user xattrs")
+    return ScopedFileBackend(LocalFileBackend(), base_path=temp_storage_dir)
+
+
+@pytest.mark.asyncio
+async def test_write_records_checksum_and_stat_exposes_it(backend):
+    await backend.write("a.txt", "hello", checksum="sha256")
+
+    st = await backend.stat("a.txt")
+
+    assert st.etag == "sha256:" + hashlib.sha256(b"hello").hexdigest()
+    assert await backend.read("a.txt", verify=True) == "hello"
+
+
+@pytest.mark.asyncio
+async def test_crc32_binary_roundtrip(backend):
+    await backend.write("b.bin", b"\x00\x01", binary=True, checksum="crc32")
+
+    st = await backend.stat("b.bin")
+
+    assert st.etag == "crc32:%08x" % zlib.crc32(b"\x00\x01")
+    assert await backend.read("b.bin", binary=True, verify=True) == (
+        b"\x00\x01"
+    )
+
+
+@pytest.mark.asyncio
+async def test_verified_text_read_matches_plain_read(backend):
+    await backend.write("crlf.txt", "a\r\nb\rc\n", checksum="sha256")
+
+    plain = await backend.read("crlf.txt")
+
+    assert await backend.read("crlf.txt", verify=True) == plain
+
+
+@pytest.mark.asyncio
+async def test_verified_read_detects_corruption(backend, temp_storage_dir):
+    await backend.write("c.txt", "good", checksum="sha256")
+    path = os.path.join(temp_storage_dir, "c.txt")
+    st = os.stat(path)
+
+    # Flip the content without changing size or mtime (bit rot).
+    with open(path, "r+b") as fh:
+        fh.write(b"baad")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    with pytest.raises(StorageChecksumMismatch):
+        await backend.read("c.txt", verify=True)
+
+
+@pytest.mark.asyncio
+async def test_rewrite_without_checksum_makes_it_stale(
+    backend, temp_storage_dir
+):
+    await backend.write("d.txt", "v1", checksum="sha256")
+    await backend.write("d.txt", "version two")
+
+    assert os.getxattr(os.path.join(temp_storage_dir, "d.txt"), CHECKSUM_XATTR)
+    with pytest.raises(StorageChecksumUnavailable):
+        await backend.read("d.txt", verify=True)
+    assert (await backend.stat("d.txt")).etag.startswith('W/"')
+
+
+@pytest.mark.asyncio
+async def test_default_checksum_is_applied(temp_storage_dir):
+    if not _xattrs_supported(temp_storage_dir):
+        pytest.skip("filesystem does not support user xattrs")
+    backend = ScopedFileBackend(
+        LocalFileBackend(default_checksum="crc32"), base_path=temp_storage_dir
+    )
+
+    await backend.write("e.txt", "auto")
+
+    assert (await backend.stat("e.txt")).etag.startswith("crc32:")
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        LocalFileBackend(default_checksum="nope")
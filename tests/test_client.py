@@ -1,10 +1,13 @@
 # tests/test_client.py
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from darca_storage.client import StorageClient
+from darca_storage.exceptions import StorageClientClosed
+from darca_storage.interfaces.file_backend import FileStat
 
 
 @pytest.fixture
@@ -20,6 +23,11 @@ def mock_backend():
     backend.rmdir = AsyncMock()
     backend.rename = AsyncMock()
     backend.stat_mtime = AsyncMock(return_value=1234567890.0)
+    backend.stat = AsyncMock(
+        return_value=FileStat(name="data.txt", size=4, mtime=1.0)
+    )
+    backend.scan = AsyncMock(return_value=[])
+    backend.checksum = AsyncMock(return_value="sha256:abc")
 
     return backend
 
@@ -38,7 +46,10 @@ async def test_read(client):
     result = await client.read("file.txt")
     assert result == "mocked-content"
     client.backend.read.assert_awaited_once_with(
-        relative_path="file.txt", binary=False
+        relative_path="file.txt",
+        binary=False,
+        verify=False,
+        if_none_match=None,
     )
 
 
@@ -51,6 +62,9 @@ async def test_write(client):
         binary=False,
         permissions=None,
         user="test-user",
+        checksum=None,
+        if_match=None,
+        if_none_match=None,
     )
 
 
@@ -109,6 +123,27 @@ async def test_stat_mtime(client):
     )
 
 
+@pytest.mark.asyncio
+async def test_stat(client):
+    st = await client.stat("data.txt")
+    assert st.size == 4
+    client.backend.stat.assert_awaited_once_with(relative_path="data.txt")
+
+
+@pytest.mark.asyncio
+async def test_scan(client):
+    assert await client.scan("folder") == []
+    client.backend.scan.assert_awaited_once_with(relative_path="folder")
+
+
+@pytest.mark.asyncio
+async def test_checksum(client):
+    assert await client.checksum("data.txt") == "sha256:abc"
+    client.backend.checksum.assert_awaited_once_with(
+        relative_path="data.txt", algorithm="sha256"
+    )
+
+
 @pytest.mark.asyncio
 async def test_session_properties(client):
     assert client.user == "test-user"
@@ -136,3 +171,51 @@ async def test_flush_is_noop(client):
 @pytest.mark.asyncio
 async def test_presign_url_returns_none(client):
     assert await client.presign_url("nope.txt", expires_in=300) is None
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_and_closes_backend(client, mock_backend):
+    mock_backend.flush = AsyncMock()
+    mock_backend.close = AsyncMock()
+
+    async with client:
+        await client.read("file.txt")
+
+    assert client.closed
+    mock_backend.flush.assert_awaited_once()
+    mock_backend.close.assert_awaited_once()
+
+    await client.close()  # idempotent
+    mock_backend.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_operations_after_close_raise(client):
+    await client.close()
+
+    with pytest.raises(StorageClientClosed):
+        await client.read("file.txt")
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_in_flight_operations(client, mock_backend):
+    gate = asyncio.Event()
+
+    async def slow_read(**kwargs):
+        await gate.wait()
+        return "late"
+
+    mock_backend.read = AsyncMock(side_effect=slow_read)
+    mock_backend.close = AsyncMock()
+    read = asyncio.create_task(client.read("file.txt"))
+    await asyncio.sleep(0)
+
+    assert client.stats()["resources"]["in_flight"] == 1
+    closing = asyncio.create_task(client.close())
+    await asyncio.sleep(0)
+    mock_backend.close.assert_not_awaited()
+
+    gate.set()
+    assert await read == "late"
+    await closing
+    mock_backend.close.assert_awaited_once()
@@ -0,0 +1,108 @@
+# tests/test_conditional_ops.py
+
+import asyncio
+import os
+
+import pytest
+
+from darca_storage.backends.local_file_backend import (
+    VERSION_XATTR,
+    LocalFileBackend,
+)
+from darca_storage.client import StorageClient
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.exceptions import StoragePreconditionFailed
+from darca_storage.interfaces.file_backend import NOT_MODIFIED
+
+
+@pytest.fixture
+def client(temp_storage_dir):
+    return StorageClient(
+        ScopedFileBackend(LocalFileBackend(), base_path=temp_storage_dir)
+    )
+
+
+def _has_version(path):
+    try:
+        return bool(os.getxattr(path, VERSION_XATTR))
+    except OSError:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_create_only_write(client):
+    await client.write("lock", "owner-a", if_none_match="*")
+
+    with pytest.raises(StoragePreconditionFailed) as exc:
+        await client.write("lock", "owner-b", if_none_match="*")
+
+    assert exc.value.error_code == "PRECONDITION_FAILED"
+    assert await client.read("lock") == "owner-a"
+
+
+@pytest.mark.asyncio
+async def test_only_one_concurrent_creator_wins(client):
+    results = await asyncio.gather(
+        *(
+            client.write("lock", f"owner-{i}", if_none_match="*")
+            for i in range(8)
+        ),
+        return_exceptions=True,
+    )
+
+    winners = [r for r in results if r is None]
+    assert len(winners) == 1
+    assert all(
+        isinstance(r, StoragePreconditionFailed)
+        for r in results
+        if r is not None
+    )
+
+
+@pytest.mark.asyncio
+async def test_if_match_replaces_only_expected_version(client):
+    await client.write("doc.txt", "v1")
+    etag = (await client.stat("doc.txt")).etag
+
+    await client.write("doc.txt", "v2", if_match=etag)
+
+    with pytest.raises(StoragePreconditionFailed):
+        await client.write("doc.txt", "v3", if_match=etag)
+    assert await client.read("doc.txt") == "v2"
+
+
+@pytest.mark.asyncio
+async def test_if_match_star_requires_existing_file(client):
+    with pytest.raises(StoragePreconditionFailed):
+        await client.write("missing.txt", "x", if_match="*")
+    assert not await client.exists("missing.txt")
+
+
+@pytest.mark.asyncio
+async def test_read_if_none_match(client):
+    await client.write("doc.txt", "v1")
+    etag = (await client.stat("doc.txt")).etag
+
+    assert await client.read("doc.txt", if_none_match=etag) is NOT_MODIFIED
+    assert await client.read("doc.txt", if_none_match='W/"0-0"') == "v1"
+
+
+@pytest.mark.asyncio
+async def test_every_write_gets_a_new_weak_etag(client, temp_storage_dir):
+    path = os.path.join(temp_storage_dir, "state")
+    await client.write("state", "aaaa")
+    if not _has_version(path):
+        pytest.skip("filesystem does not support user xattrs")
+    st = os.stat(path)
+    first = (await client.stat("state")).etag
+
+    # In-place rewrites within one mtime tick: changed, then changed back.
+    await client.write("state", "bbbb")
+    await client.write("state", "aaaa")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(path).st_ino == st.st_ino
+
+    current = (await client.stat("state")).etag
+    assert current.startswith('W/"') and current != first
+    with pytest.raises(StoragePreconditionFailed):
+        await client.write("state", "cccc", if_match=first)
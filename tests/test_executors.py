@@ -0,0 +1,76 @@
+# tests/test_executors.py
+
+import hashlib
+import os
+import threading
+
+import pytest
+
+from darca_storage import executors
+from darca_storage.hashing import file_digest
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    yield
+    executors.configure_io_pool(None)
+    executors.configure_process_pool(None)
+    executors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_in_thread_uses_dedicated_pool():
+    executors.configure_io_pool(2)
+
+    name = await executors.run_in_thread(
+        lambda: threading.current_thread().name
+    )
+
+    assert name.startswith("darca-storage-io")
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_bound_in_process_pool(temp_storage_dir):
+    path = os.path.join(temp_storage_dir, "blob.bin")
+    with open(path, "wb") as fh:
+        fh.write(b"x" * 4096)
+    executors.configure_process_pool(1)
+
+    digest = await executors.run_cpu_bound(file_digest, path, "sha256")
+
+    assert digest == "sha256:" + hashlib.sha256(b"x" * 4096).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_bound_falls_back_to_threads(temp_storage_dir):
+    path = os.path.join(temp_storage_dir, "blob.bin")
+    with open(path, "wb") as fh:
+        fh.write(b"abc")
+
+    assert not executors.process_pool_enabled()
+    assert await executors.run_cpu_bound(file_digest, path, "md5") == (
+        "md5:" + hashlib.md5(b"abc").hexdigest()
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_fork_resets_pools_and_handlers():
+    class Handler:
+        reset = False
+
+        def _reset_after_fork(self):
+            Handler.reset = True
+
+    handler = Handler()
+    executors.register_fork_handler(handler)
+    executors.configure_io_pool(1)
+    assert executors._get_io_pool() is not None
+
+    pid = os.fork()
+    if pid == 0:  # child
+        ok = Handler.reset and executors._io_pool is None
+        os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert Handler.reset is False
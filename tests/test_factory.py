@@ -6,6 +6,9 @@ import pytest
 
 from darca_storage.client import StorageClient
 from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.decorators.sharded_backend import ShardedFileBackend
+from darca_storage.decorators.throttled_backend import ThrottledFileBackend
+from darca_storage.decorators.tiered_backend import TieredFileBackend
 from darca_storage.factory import StorageConnectorFactory
 
 
@@ -36,3 +39,73 @@ async def test_factory_rejects_unsupported_scheme():
         await StorageConnectorFactory.from_url("ftp://localhost/data")
 
     assert "Unsupported storage scheme" in str(exc.value)
+
+
+@pytest.mark.asyncio
+async def test_factory_applies_throttle_parameters(temp_storage_dir):
+    client = await StorageConnectorFactory.from_url(
+        f"file://{temp_storage_dir}",
+        parameters={"max_concurrency": "4"},
+        session_metadata={"tenant": "reports"},
+    )
+
+    inner = client.backend._backend
+    assert isinstance(inner, ThrottledFileBackend)
+    assert inner.limits.max_concurrency == 4
+    assert client.backend.stats()["throttle"]["tenant"] == "reports"
+
+
+@pytest.mark.asyncio
+async def test_factory_builds_tiered_client(temp_storage_dir):
+    fast = os.path.join(temp_storage_dir, "fast")
+    slow = os.path.join(temp_storage_dir, "slow")
+    os.makedirs(fast)
+    os.makedirs(slow)
+
+    client = await StorageConnectorFactory.from_url(
+        f"tiered://?fast=file://{fast}&slow=file://{slow}"
+        "&capacity_bytes=1024&write_policy=behind"
+    )
+
+    backend = client.backend
+    assert isinstance(backend, TieredFileBackend)
+    assert isinstance(backend.fast, ScopedFileBackend)
+    assert isinstance(backend.slow, ScopedFileBackend)
+    assert backend.write_policy == "behind"
+    assert client.session["base_path"] == os.path.abspath(slow)
+
+
+@pytest.mark.asyncio
+async def test_factory_rejects_non_file_tier(temp_storage_dir):
+    with pytest.raises(ValueError):
+        await StorageConnectorFactory.from_url(
+            f"tiered://?fast=ftp://cache&slow=file://{temp_storage_dir}"
+        )
+
+
+@pytest.mark.asyncio
+async def test_factory_builds_sharded_client(temp_storage_dir):
+    first = os.path.join(temp_storage_dir, "nvme0")
+    second = os.path.join(temp_storage_dir, "nvme1")
+    os.makedirs(first)
+    os.makedirs(second)
+
+    client = await StorageConnectorFactory.from_url(
+        f"sharded://?shard=file://{first}&shard=file://{second}"
+        "&shard_names=n0,n1"
+    )
+
+    backend = client.backend
+    assert isinstance(backend, ShardedFileBackend)
+    assert sorted(backend.shards) == ["n0", "n1"]
+    await client.write("x.txt", "hello")
+    assert await client.read("x.txt") == "hello"
+    assert client.session["shards"]["n1"] == os.path.abspath(second)
+
+
+@pytest.mark.asyncio
+async def test_factory_rejects_mismatched_shard_names(temp_storage_dir):
+    with pytest.raises(ValueError):
+        await StorageConnectorFactory.from_url(
+            f"sharded://?shard=file://{temp_storage_dir}&shard_names=a,b"
+        )
@@ -0,0 +1,82 @@
+# tests/test_import_time.py
+
+import os
+import subprocess
+import sys
+
+# Cumulative ``python -X importtime`` budget for each import users write, in
+# microseconds (best of a few runs).  asyncio is not counted: every client
+# needs it.  Override on slow machines.
+IMPORT_BUDGET_US = int(
+    os.environ.get("DARCA_STORAGE_IMPORT_BUDGET_US", 150000)
+)
+
+PUBLIC_IMPORTS = (
+    "import darca_storage",
+    "from darca_storage import StorageClient",
+    "from darca_storage import StorageConnectorFactory",
+)
+
+
+def _python(*args):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _loaded_after(statement):
+    probe = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+    return set(_python("-c", probe).stdout.split())
+
+
+def _top_level_imports(code):
+    report = _python("-X", "importtime", "-c", code)
+    imports = {}
+    for line in report.stderr.splitlines():
+        fields = line.split("|")
+        # Nested imports are indented and counted in their parent's time.
+        if (
+            len(fields) == 3
+            and fields[1].strip().isdigit()
+            and not fields[2].startswith("  ")
+        ):
+            imports[fields[2].strip()] = int(fields[1])
+    return imports
+
+
+def _import_time_us(statement):
+    # Lazily resolved names import their modules at the top level, after
+    # the package itself, so sum everything the statement adds.
+    baseline = _top_level_imports("import asyncio")
+    imports = _top_level_imports(f"import asyncio\n{statement}")
+    return sum(us for name, us in imports.items() if name not in baseline)
+
+
+def test_package_import_is_lazy():
+    loaded = _loaded_after("import darca_storage")
+
+    assert "darca_storage.client" not in loaded
+    assert "asyncio" not in loaded
+
+
+def test_client_import_skips_backend_dependencies():
+    loaded = _loaded_after("from darca_storage import StorageClient")
+
+    assert "darca_storage.client" in loaded
+    assert "darca_file_utils" not in loaded
+    assert "multiprocessing" not in loaded
+
+
+def test_public_import_time_budget():
+    for statement in PUBLIC_IMPORTS:
+        best = min(_import_time_us(statement) for _ in range(3))
+
+        assert best <= IMPORT_BUDGET_US, (
+            f"{statement!r} took {best} us on top of asyncio "
+            f"(budget {IMPORT_BUDGET_US} us)"
+        )
@@ -0,0 +1,95 @@
+# tests/test_lookup_cache_backend.py
+
+import os
+
+import pytest
+
+from darca_storage.decorators.lookup_cache_backend import (
+    LookupCacheFileBackend,
+)
+from darca_storage.interfaces.file_backend import FileStat
+
+
+class FakeBackend:
+    def __init__(self, names):
+        self.names = set(names)
+        self.exists_calls = 0
+        self.scan_calls = 0
+
+    async def exists(self, path):
+        self.exists_calls += 1
+        return path in self.names
+
+    async def scan(self, path):
+        self.scan_calls += 1
+        return [
+            FileStat(name=os.path.basename(n), size=0, mtime=0.0)
+            for n in self.names
+            if os.path.dirname(n) == path
+        ]
+
+    async def write(self, path, content, **options):
+        self.names.add(path)
+
+    async def delete(self, path):
+        self.names.discard(path)
+
+
+@pytest.mark.asyncio
+async def test_repeated_miss_is_answered_from_memory():
+    inner = FakeBackend([])
+    backend = LookupCacheFileBackend(inner, negative_ttl=60)
+
+    assert not await backend.exists("/data/missing")
+    assert not await backend.exists("/data/missing")
+    assert not await backend.exists("/data/missing/child")
+
+    assert inner.exists_calls == 1
+    assert backend.stats()["lookup_cache"]["negative_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_negative_entry():
+    inner = FakeBackend([])
+    backend = LookupCacheFileBackend(inner, negative_ttl=60)
+
+    assert not await backend.exists("/data/a")
+    await backend.write("/data/a", "x")
+
+    assert await backend.exists("/data/a")
+
+
+@pytest.mark.asyncio
+async def test_listing_answers_misses_in_directory():
+    inner = FakeBackend(["/data/a", "/data/b"])
+    backend = LookupCacheFileBackend(
+        inner, negative_ttl=60, listing_ttl=60, listing_after_misses=2
+    )
+
+    assert not await backend.exists("/data/x")
+    assert not await backend.exists("/data/y")  # loads the listing
+    calls = inner.exists_calls
+
+    assert not await backend.exists("/data/z")
+    assert await backend.exists("/data/a")
+    assert inner.exists_calls == calls
+    assert inner.scan_calls == 1
+
+    await backend.write("/data/z", "x")
+    await backend.delete("/data/a")
+    assert await backend.exists("/data/z")
+    assert not await backend.exists("/data/a")
+    assert inner.exists_calls == calls
+
+
+@pytest.mark.asyncio
+async def test_write_adds_created_parents_to_cached_listings():
+    inner = FakeBackend(["/data/old"])
+    backend = LookupCacheFileBackend(inner, listing_ttl=60)
+    await backend.scan("/data")
+
+    await backend.write("/data/a/b/c.txt", "x")
+
+    assert await backend.exists("/data/a")
+    assert await backend.exists("/data/old")
+    assert inner.exists_calls == 0
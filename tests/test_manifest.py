@@ -0,0 +1,129 @@
+# tests/test_manifest.py
+
+import os
+
+import pytest
+
+from darca_storage.backends.local_file_backend import LocalFileBackend
+from darca_storage.client import StorageClient
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.manifest import Manifest
+
+
+@pytest.fixture
+def client(temp_storage_dir):
+    backend = ScopedFileBackend(LocalFileBackend(), base_path=temp_storage_dir)
+    return StorageClient(backend=backend)
+
+
+@pytest.mark.asyncio
+async def test_manifest_records_files_and_directories(client):
+    await client.mkdir("a/b")
+    await client.write("top.txt", "1")
+    await client.write("a/b/deep.txt", "22")
+
+    manifest = await client.manifest()
+
+    files = {e.path: e.size for e in manifest.files()}
+    assert files == {"top.txt": 1, "a/b/deep.txt": 2}
+    assert {e.path for e in manifest.directories()} == {".", "a", "a/b"}
+
+
+@pytest.mark.asyncio
+async def test_manifest_json_roundtrip(client):
+    await client.write("x.txt", "data")
+    manifest = await client.manifest(checksum="sha256")
+
+    restored = Manifest.from_json(manifest.to_json())
+
+    assert restored.entries == manifest.entries
+    assert restored.entries["x.txt"].checksum.startswith("sha256:")
+    assert not client.diff(manifest, restored)
+
+
+@pytest.mark.asyncio
+async def test_diff_reports_added_changed_removed(client, temp_storage_dir):
+    await client.write("keep.txt", "same")
+    await client.write("edit.txt", "old")
+    await client.write("gone.txt", "bye")
+    before = await client.manifest()
+
+    await client.write("edit.txt", "new content")
+    os.utime(os.path.join(temp_storage_dir, "edit.txt"), (1, 1))
+    await client.delete("gone.txt")
+    await client.write("new.txt", "hi")
+    after = await client.manifest()
+
+    diff = client.diff(before, after)
+    assert [e.path for e in diff.added] == ["new.txt"]
+    assert [e.path for e in diff.changed] == ["edit.txt"]
+    assert [e.path for e in diff.removed] == ["gone.txt"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_manifest_reuses_unchanged_checksums(
+    client, temp_storage_dir
+):
+    await client.mkdir("stable")
+    await client.mkdir("busy")
+    await client.write("stable/a.txt", "a")
+    await client.write("busy/b.txt", "b")
+    first = await client.manifest(checksum="sha256")
+
+    await client.write("busy/c.txt", "c")
+
+    hashed = []
+    original_checksum = client.backend.checksum
+
+    async def recording_checksum(relative_path, algorithm="sha256"):
+        hashed.append(relative_path)
+        return await original_checksum(relative_path, algorithm)
+
+    client.backend.checksum = recording_checksum
+    second = await client.manifest(previous=first, checksum="sha256")
+
+    assert [os.path.normpath(p) for p in hashed] == ["busy/c.txt"]
+    assert second.entries["stable/a.txt"] == first.entries["stable/a.txt"]
+    assert [e.path for e in client.diff(first, second).added] == [
+        "busy/c.txt"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_incremental_manifest_keeps_symlinks(client, temp_storage_dir):
+    await client.mkdir("d")
+    await client.write("d/target.txt", "target")
+    os.symlink("target.txt", os.path.join(temp_storage_dir, "d", "link"))
+    first = await client.manifest()
+
+    second = await client.manifest(previous=first)
+
+    assert second.entries == first.entries
+    assert not client.diff(first, second)
+
+
+@pytest.mark.asyncio
+async def test_manifest_rejects_file_root(client):
+    await client.write("file.txt", "x")
+    with pytest.raises(ValueError):
+        await client.manifest("file.txt")
+
+
+@pytest.mark.asyncio
+async def test_incremental_manifest_sees_in_place_rewrites(
+    client, temp_storage_dir
+):
+    await client.mkdir("d")
+    await client.write("d/f.txt", "old")
+    directory = os.path.join(temp_storage_dir, "d")
+    os.utime(directory, (1, 1))
+    first = await client.manifest(checksum="sha256")
+
+    await client.write("d/f.txt", "new")  # same size, same inode
+    os.utime(os.path.join(directory, "f.txt"), (2, 2))
+    os.utime(directory, (1, 1))
+    second = await client.manifest(previous=first, checksum="sha256")
+
+    changed = client.diff(first, second).changed
+    assert [e.path for e in changed] == ["d/f.txt"]
+    assert changed[0].checksum != first.entries["d/f.txt"].checksum
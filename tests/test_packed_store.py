@@ -0,0 +1,167 @@
+# tests/test_packed_store.py
+
+import asyncio
+import os
+
+import pytest
+
+from darca_storage import packed_store
+from darca_storage.backends.local_file_backend import LocalFileBackend
+from darca_storage.client import StorageClient
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.exceptions import StoragePackCorrupted, StoragePackLocked
+
+
+@pytest.fixture
+def client(temp_storage_dir):
+    return StorageClient(
+        ScopedFileBackend(LocalFileBackend(), base_path=temp_storage_dir)
+    )
+
+
+@pytest.mark.asyncio
+async def test_put_get_delete(client):
+    async with await client.packed_store("meta") as store:
+        await store.put("a", b"1")
+        await store.put("b", "two")
+        await store.put("a", bytearray(b"one"))
+
+        assert await store.get("a") == b"one"
+        assert await store.get("b") == b"two"
+        assert await store.delete("b")
+        assert not await store.delete("b")
+        assert await store.get("b") is None
+        assert len(store) == 1
+
+
+@pytest.mark.asyncio
+async def test_iterate_by_prefix(client):
+    async with await client.packed_store("meta") as store:
+        for key in ("user/2", "job/1", "user/1"):
+            await store.put(key, key)
+
+        items = [item async for item in store.iterate("user/")]
+
+    assert items == [("user/1", b"user/1"), ("user/2", b"user/2")]
+
+
+@pytest.mark.asyncio
+async def test_reopen_replays_log(client):
+    async with await client.packed_store("meta") as store:
+        await store.put("keep", b"v1")
+        await store.put("keep", b"v2")
+        await store.put("gone", b"x")
+        await store.delete("gone")
+
+    async with await client.packed_store("meta") as store:
+        assert await store.get("keep") == b"v2"
+        assert "gone" not in store
+
+
+@pytest.mark.asyncio
+async def test_torn_tail_is_truncated(client, temp_storage_dir):
+    async with await client.packed_store("meta") as store:
+        await store.put("a", b"complete")
+    segment = os.path.join(temp_storage_dir, "meta", "00000001.pack")
+    with open(segment, "ab") as fh:
+        fh.write(b"\x00\x01\x02")  # a record cut short by a crash
+
+    async with await client.packed_store("meta") as store:
+        assert await store.get("a") == b"complete"
+        await store.put("b", b"after")
+        assert await store.get("b") == b"after"
+
+
+@pytest.mark.asyncio
+async def test_damaged_sealed_segment_is_reported(client, temp_storage_dir):
+    async with await client.packed_store("meta", segment_bytes=1) as store:
+        await store.put("a", b"value")
+        await store.put("b", b"value")
+    segment = os.path.join(temp_storage_dir, "meta", "00000001.pack")
+    with open(segment, "r+b") as fh:
+        fh.seek(-1, os.SEEK_END)
+        fh.write(b"!")
+
+    with pytest.raises(StoragePackCorrupted):
+        await client.packed_store("meta")
+
+
+@pytest.mark.asyncio
+async def test_second_open_is_refused(client):
+    async with await client.packed_store("meta"):
+        with pytest.raises(StoragePackLocked):
+            await client.packed_store("meta")
+
+
+@pytest.mark.asyncio
+async def test_compaction_reclaims_overwritten_segments(client):
+    async with await client.packed_store("meta", segment_bytes=256) as store:
+        for round_ in range(10):
+            for i in range(8):
+                await store.put(f"k{i}", f"{round_}".encode() * 20)
+        await store.compact()
+
+        stats = store.stats()["packed_store"]
+        assert stats["compactions"] > 0
+        assert stats["garbage_bytes"] < stats["bytes"]
+        assert [await store.get(f"k{i}") for i in range(8)] == (
+            [b"9" * 20] * 8
+        )
+
+    async with await client.packed_store("meta") as store:
+        assert await store.get("k3") == b"9" * 20
+
+
+@pytest.mark.asyncio
+async def test_compaction_syncs_copies_even_without_sync(client, monkeypatch):
+    synced = []
+    real_unlink = os.unlink
+
+    def unlink(path, *args, **kwargs):
+        if path.endswith(".pack"):
+            assert synced, "segment removed before its copies were synced"
+        return real_unlink(path, *args, **kwargs)
+
+    async with await client.packed_store("meta", segment_bytes=200) as store:
+        await store.put("keep", b"k" * 50)
+        await store.put("gone", b"g" * 150)
+        for _ in range(4):
+            await store.put("gone", b"x" * 150)
+        monkeypatch.setattr(packed_store, "_fdatasync", synced.append)
+        monkeypatch.setattr(os, "unlink", unlink)
+        await asyncio.wait_for(store.compact(), 5)
+        assert store.stats()["packed_store"]["compactions"] > 0
+
+
+@pytest.mark.asyncio
+async def test_compaction_drops_tombstones_that_hide_nothing(client):
+    async with await client.packed_store("meta", segment_bytes=200) as store:
+        await store.put("keep", b"k" * 190)  # fills the first segment
+        for i in range(40):
+            await store.put(f"gone{i}", b"x" * 50)
+            await store.delete(f"gone{i}")
+        await asyncio.wait_for(store.compact(), 5)
+
+        stats = store.stats()["packed_store"]
+        assert stats["segments"] == 2
+        assert await store.get("keep") == b"k" * 190
+
+    async with await client.packed_store("meta") as store:
+        assert await store.get("keep") == b"k" * 190
+        assert [await store.get(f"gone{i}") for i in range(40)] == [None] * 40
+
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_tombstones_hiding_older_values(client):
+    async with await client.packed_store("meta", segment_bytes=200) as store:
+        await store.put("old", b"o" * 50)
+        await store.put("filler", b"f" * 150)  # keeps the segment live
+        await store.delete("old")
+        for _ in range(4):
+            await store.put("churn", b"c" * 100)
+        await asyncio.wait_for(store.compact(), 5)
+        assert store.stats()["packed_store"]["compactions"] > 0
+
+    async with await client.packed_store("meta") as store:
+        assert await store.get("old") is None
+        assert await store.get("filler") == b"f" * 150
@@ -0,0 +1,182 @@
+# tests/test_path_query.py
+
+import os
+
+import pytest
+
+from darca_storage import path_query
+from darca_storage.backends.local_file_backend import (
+    LocalFileBackend,
+    SyncLocalFileBackend,
+)
+from darca_storage.client import StorageClient
+from darca_storage.decorators.scoped_backend import (
+    ScopedFileBackend,
+    SyncScopedFileBackend,
+)
+from darca_storage.decorators.sharded_backend import ShardedFileBackend
+from darca_storage.exceptions import StorageClientPathViolation
+from darca_storage.path_query import PathQuery, split_glob, walk
+from darca_storage.sync_client import SyncStorageClient
+
+TREE = [
+    "a.txt",
+    "src/main.py",
+    "src/pkg/util.py",
+    "src/pkg/notes.txt",
+    "node_modules/dep/index.js",
+    ".git/config",
+    "data/2023-12/x.parquet",
+    "data/2024-01/y.parquet",
+    "data/2024-01/y.json",
+]
+
+
+@pytest.fixture
+def tree(temp_storage_dir):
+    for name in TREE:
+        full = os.path.join(temp_storage_dir, name)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as fh:
+            fh.write(name)
+    return temp_storage_dir
+
+
+def test_patterns_follow_gitignore_anchoring(tree):
+    assert walk(tree, PathQuery.build("*.py")) == [
+        "src/main.py",
+        "src/pkg/util.py",
+    ]
+    assert walk(tree, PathQuery.build("src/*.py")) == ["src/main.py"]
+    assert walk(tree, PathQuery.build("/*.txt")) == ["a.txt"]
+    assert walk(tree, PathQuery.build("data/**/*.parquet")) == [
+        "data/2023-12/x.parquet",
+        "data/2024-01/y.parquet",
+    ]
+    # Wildcards skip hidden names unless the pattern spells the dot out.
+    assert walk(tree, PathQuery.build("**/config")) == []
+    assert walk(tree, PathQuery.build(".git/*")) == [".git/config"]
+
+
+def test_subtrees_that_cannot_match_are_not_entered(tree, monkeypatch):
+    entered = []
+    scandir = os.scandir
+
+    def recording(path):
+        entered.append(os.path.relpath(path, tree))
+        return scandir(path)
+
+    monkeypatch.setattr(path_query.os, "scandir", recording)
+
+    found = walk(
+        tree,
+        PathQuery.build("src/**/*.py", exclude="pkg"),
+    )
+
+    assert found == ["src/main.py"]
+    assert sorted(entered) == [".", "src"]
+
+
+def test_depth_and_mtime_filters(tree):
+    assert walk(tree, PathQuery(max_depth=1)) == [
+        ".git",
+        "a.txt",
+        "data",
+        "node_modules",
+        "src",
+    ]
+    old = os.path.join(tree, "src/main.py")
+    os.utime(old, (1_000_000, 1_000_000))
+    recent = walk(tree, PathQuery.build("*.py", min_mtime=2_000_000))
+    assert recent == ["src/pkg/util.py"]
+    with pytest.raises(ValueError):
+        PathQuery(max_depth=0)
+
+
+def test_pages_resume_after_the_last_path(tree):
+    query = PathQuery.build(exclude="node_modules")
+    everything = walk(tree, query)
+    pages, after = [], None
+    while True:
+        page = walk(tree, query, after=after, limit=4)
+        if not page:
+            break
+        pages.append(page)
+        after = page[-1]
+
+    assert [p for page in pages for p in page] == everything
+    assert all(len(page) <= 4 for page in pages)
+
+
+def test_split_glob():
+    assert split_glob("data/2024-*/*.parquet") == (
+        "data",
+        "/2024-*/*.parquet",
+    )
+    assert split_glob("*.txt") == (".", "/*.txt")
+    assert split_glob("a/b/c.txt") == ("a/b", "/c.txt")
+    with pytest.raises(ValueError):
+        split_glob("/")
+
+
+@pytest.mark.asyncio
+async def test_client_glob_and_filtered_list(tree):
+    client = StorageClient(ScopedFileBackend(LocalFileBackend(), tree))
+
+    found = [p async for p in client.glob("data/2024-*/*.parquet")]
+    assert found == ["data/2024-01/y.parquet"]
+    assert [p async for p in client.glob("missing/*.txt")] == []
+
+    listed = await client.list("src", include="*.py")
+    assert listed == ["main.py"]
+    listed = await client.list(
+        recursive=True, include="*.txt", exclude="src"
+    )
+    assert listed == ["a.txt"]
+    assert [p async for p in client.walk("src", page_size=1)] == [
+        "main.py",
+        "pkg",
+        "pkg/notes.txt",
+        "pkg/util.py",
+    ]
+
+    with pytest.raises(StorageClientPathViolation):
+        await client.list(include="../*")
+    with pytest.raises(StorageClientPathViolation):
+        await client.list("..", include="*")
+
+
+@pytest.mark.asyncio
+async def test_sharded_pages_merge_in_walk_order(tmp_path):
+    roots = {name: str(tmp_path / name) for name in "ab"}
+    for root in roots.values():
+        os.makedirs(root)
+    client = StorageClient(
+        ShardedFileBackend(
+            {
+                name: ScopedFileBackend(LocalFileBackend(), root)
+                for name, root in roots.items()
+            }
+        )
+    )
+    await client.mkdir("d")
+    names = [f"d/f{i:02d}.txt" for i in range(20)]
+    for name in names:
+        await client.write(name, name)
+
+    found = [p async for p in client.glob("d/*.txt", page_size=3)]
+    assert found == names
+
+
+def test_sync_client_glob(tree):
+    client = SyncStorageClient(
+        SyncScopedFileBackend(SyncLocalFileBackend(), tree)
+    )
+
+    assert list(client.glob("src/**/*.txt")) == ["src/pkg/notes.txt"]
+    assert client.list(include="*.js") == []
+    assert client.list(recursive=True, include="*.js") == [
+        "node_modules/dep/index.js"
+    ]
+    with pytest.raises(StorageClientPathViolation):
+        client.find(".", PathQuery.build(exclude="a/../.."))
@@ -0,0 +1,98 @@
+# tests/test_prefetch.py
+
+import asyncio
+import os
+
+import pytest
+
+from darca_storage.backends.local_file_backend import LocalFileBackend
+from darca_storage.client import StorageClient
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.prefetch import prefetch
+
+
+class Reader:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.started = []
+
+    async def read(self, path):
+        self.started.append(path)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            return path.encode() * 10
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_results_arrive_in_order_with_window_in_flight():
+    reader = Reader()
+    paths = [f"p{i}" for i in range(10)]
+
+    stream = prefetch(reader.read, paths, window=3)
+
+    results = [path async for path, _ in stream]
+
+    assert results == paths
+    assert reader.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_limits_read_ahead():
+    reader = Reader(delay=0)
+    stream = prefetch(reader.read, list("abcdef"), window=3, max_bytes=1)
+
+    assert (await stream.__anext__())[0] == "a"
+    await asyncio.sleep(0.01)
+    # b and c are ready and over budget, so d is not started yet.
+    assert reader.started == ["a", "b", "c"]
+
+    assert [path async for path, _ in stream] == list("bcdef")
+
+
+@pytest.mark.asyncio
+async def test_failed_read_raises_at_its_position():
+    async def read(path):
+        if path == "bad":
+            raise FileNotFoundError(path)
+        return b""
+
+    seen = []
+    with pytest.raises(FileNotFoundError):
+        async for path, _ in prefetch(read, ["ok", "bad", "never"]):
+            seen.append(path)
+
+    assert seen == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_client_prefetch_hints_paths_ahead(temp_storage_dir):
+    for i in range(6):
+        with open(os.path.join(temp_storage_dir, f"{i}.txt"), "w") as fh:
+            fh.write(str(i))
+    local = LocalFileBackend()
+    hinted = []
+    hint = local.will_need
+
+    async def will_need(path):
+        hinted.append(os.path.basename(path))
+        await hint(path)
+
+    local.will_need = will_need
+    client = StorageClient(ScopedFileBackend(local, temp_storage_dir))
+
+    items = [
+        item
+        async for item in client.prefetch(
+            [f"{i}.txt" for i in range(6)], window=2, advise_ahead=2
+        )
+    ]
+
+    assert items == [(f"{i}.txt", str(i)) for i in range(6)]
+    assert set(hinted) <= {f"{i}.txt" for i in range(2, 6)}
+    assert "2.txt" in hinted
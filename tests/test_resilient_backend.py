@@ -0,0 +1,184 @@
+# tests/test_resilient_backend.py
+
+import asyncio
+import errno
+import time
+
+import pytest
+
+from darca_storage.decorators import resilient_backend
+from darca_storage.decorators.resilient_backend import (
+    IDEMPOTENT_OPERATIONS,
+    ResiliencePolicy,
+    ResilientFileBackend,
+    is_transient,
+)
+from darca_storage.exceptions import StorageOperationTimeout
+from darca_storage.factory import StorageConnectorFactory
+
+
+class ScriptedBackend:
+    """Backend whose successive calls sleep and/or fail as scripted."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    async def _next(self):
+        self.calls += 1
+        delay, error = self.script.pop(0) if self.script else (0, None)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return f"result {self.calls}"
+
+    async def read(self, path, *, binary=False, **options):
+        return await self._next()
+
+    async def write(self, path, content, **options):
+        await self._next()
+
+
+def _eio():
+    return OSError(errno.EIO, "I/O error")
+
+
+def test_policy_from_parameters():
+    policy = ResiliencePolicy.from_parameters(
+        {
+            "timeout": "5",
+            "timeout.list": "30",
+            "retries": "3",
+            "retry_operations": "read, write",
+            "hedge_after": "p95",
+        }
+    )
+    assert policy.timeout_for("read") == 5.0
+    assert policy.timeout_for("list") == 30.0
+    assert policy.retry_operations == {"read", "write"}
+    assert policy.hedge_percentile == 95.0
+    assert policy.hedge_after is None
+    assert ResiliencePolicy.from_parameters({}).is_passive()
+    assert ResiliencePolicy().retry_operations == IDEMPOTENT_OPERATIONS
+
+
+def test_transient_errors():
+    wrapped = ValueError("wrapper")
+    wrapped.__cause__ = OSError(errno.ESTALE, "stale")
+    assert is_transient(wrapped)
+    assert is_transient(_eio())
+    assert not is_transient(FileNotFoundError(errno.ENOENT, "missing"))
+
+
+@pytest.mark.asyncio
+async def test_timeout_frees_the_caller():
+    backend = ResilientFileBackend(
+        ScriptedBackend((10, None)), ResiliencePolicy(timeout=0.05)
+    )
+
+    with pytest.raises(StorageOperationTimeout):
+        await backend.read("/a")
+    assert backend.stats()["resilience"]["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried():
+    inner = ScriptedBackend((0, _eio()), (0, _eio()))
+    backend = ResilientFileBackend(
+        inner, ResiliencePolicy(retries=2, retry_backoff=0.001)
+    )
+
+    assert await backend.read("/a") == "result 3"
+    assert backend.stats()["resilience"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_only_safe_operations_are_retried():
+    missing = FileNotFoundError(errno.ENOENT, "missing")
+    inner = ScriptedBackend((0, missing), (0, _eio()))
+    backend = ResilientFileBackend(
+        inner, ResiliencePolicy(retries=5, retry_backoff=0.001)
+    )
+
+    with pytest.raises(FileNotFoundError):
+        await backend.read("/a")
+    with pytest.raises(OSError):
+        await backend.write("/a", "x")  # not idempotent by default
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_retries():
+    inner = ScriptedBackend(*[(0.02, _eio())] * 100)
+    backend = ResilientFileBackend(
+        inner,
+        ResiliencePolicy(retries=100, retry_backoff=0.001, deadline=0.1),
+    )
+
+    started = time.monotonic()
+    with pytest.raises((OSError, StorageOperationTimeout)):
+        await backend.read("/a")
+    assert time.monotonic() - started < 0.5
+    assert inner.calls < 100
+
+
+@pytest.mark.asyncio
+async def test_hedged_read_takes_the_faster_copy():
+    inner = ScriptedBackend((1.0, None), (0, None))
+    backend = ResilientFileBackend(inner, ResiliencePolicy(hedge_after=0.02))
+
+    started = time.monotonic()
+    assert await backend.read("/a") == "result 2"
+    assert time.monotonic() - started < 0.5
+
+    counters = backend.stats()["resilience"]
+    assert counters["hedges"] == 1
+    assert counters["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_percentile_hedging_learns_a_delay():
+    backend = ResilientFileBackend(
+        ScriptedBackend(), ResiliencePolicy(hedge_percentile=95)
+    )
+    assert backend.stats()["resilience"]["hedge_delay"] is None
+
+    for _ in range(20):
+        await backend.read("/a")
+
+    assert backend.stats()["resilience"]["hedge_delay"] is not None
+
+
+@pytest.mark.asyncio
+async def test_configured_through_session_metadata(temp_storage_dir):
+    client = await StorageConnectorFactory.from_url(
+        f"file://{temp_storage_dir}",
+        session_metadata={
+            "storage_parameters": {"timeout": "5", "retries": "2"}
+        },
+    )
+    async with client:
+        await client.write("a.txt", "x")
+        assert await client.read("a.txt") == "x"
+        assert client.stats()["resilience"]["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_refresh_stays_periodic(monkeypatch):
+    sorts = []
+
+    def counting_sorted(values):
+        sorts.append(len(values))
+        return sorted(values)
+
+    monkeypatch.setattr(
+        resilient_backend, "sorted", counting_sorted, raising=False
+    )
+    backend = ResilientFileBackend(
+        ScriptedBackend(), ResiliencePolicy(hedge_percentile=95)
+    )
+    for _ in range(1024):
+        await backend.read("/a")
+
+    # Refreshed every 32 samples, also after the window has filled up.
+    assert len(sorts) <= 1024 // 32 + 1
@@ -0,0 +1,162 @@
+# tests/test_sharded_backend.py
+
+import os
+
+import pytest
+from darca_file_utils.file_utils import FileUtilsException
+
+from darca_storage.backends.local_file_backend import LocalFileBackend
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.decorators.sharded_backend import ShardedFileBackend
+from darca_storage.path_query import PathQuery
+
+
+@pytest.fixture
+def roots(temp_storage_dir):
+    paths = {}
+    for name in ("a", "b", "c"):
+        paths[name] = os.path.join(temp_storage_dir, name)
+        os.makedirs(paths[name])
+    return paths
+
+
+def _sharded(roots, names, **options):
+    return ShardedFileBackend(
+        {n: ScopedFileBackend(LocalFileBackend(), roots[n]) for n in names},
+        **options,
+    )
+
+
+def test_shards_must_be_scoped(roots):
+    with pytest.raises(TypeError):
+        ShardedFileBackend({"a": LocalFileBackend()})
+    with pytest.raises(ValueError):
+        ShardedFileBackend({})
+
+
+def test_adding_a_shard_only_moves_files_it_wins(roots):
+    before = _sharded(roots, "ab")
+    after = _sharded(roots, "abc")
+    paths = [f"f{i}.bin" for i in range(300)]
+
+    moved = [p for p in paths if before.placement(p) != after.placement(p)]
+
+    assert moved
+    assert all(after.placement(p) == "c" for p in moved)
+    assert len(moved) < len(paths) / 2
+
+
+@pytest.mark.asyncio
+async def test_files_land_on_owning_shard(roots):
+    backend = _sharded(roots, "abc")
+    await backend.mkdir("d")
+
+    for i in range(12):
+        await backend.write(f"d/{i}.txt", str(i))
+
+    for i in range(12):
+        owner = backend.placement(f"d/{i}.txt")
+        assert os.path.exists(os.path.join(roots[owner], "d", f"{i}.txt"))
+        assert await backend.read(f"d/{i}.txt") == str(i)
+    assert await backend.list("d") == sorted(f"{i}.txt" for i in range(12))
+
+
+@pytest.mark.asyncio
+async def test_rebalance_after_adding_shard(roots):
+    old = _sharded(roots, "ab")
+    await old.mkdir("d")
+    for i in range(30):
+        await old.write(f"d/{i}.txt", str(i))
+
+    new = _sharded(roots, "abc", fallback=True)
+    misplaced = [
+        f"d/{i}.txt"
+        for i in range(30)
+        if new.placement(f"d/{i}.txt") != old.placement(f"d/{i}.txt")
+    ]
+    # Before rebalancing, fallback still finds the misplaced files.
+    assert await new.read(misplaced[0]) == misplaced[0][2:-4]
+
+    plan = await new.rebalance(dry_run=True)
+    assert sorted(p for p, _, _ in plan.planned) == sorted(misplaced)
+
+    report = await new.rebalance()
+
+    assert report.moved == len(misplaced)
+    for path in misplaced:
+        assert os.path.exists(os.path.join(roots["c"], path))
+    assert (await new.rebalance(dry_run=True)).planned == []
+    assert len(await new.list("d")) == 30
+
+
+@pytest.mark.asyncio
+async def test_rebalance_keeps_write_time_checksums(roots):
+    old = _sharded(roots, "ab")
+    new = _sharded(roots, "abc", fallback=True)
+    path = next(
+        f"{i}.bin" for i in range(100) if new.placement(f"{i}.bin") == "c"
+    )
+    await old.write(path, b"payload", checksum="sha256")
+    if not (await old.stat(path)).etag.startswith("sha256:"):
+        pytest.skip("filesystem does not support user xattrs")
+
+    await new.rebalance()
+
+    assert os.path.exists(os.path.join(roots["c"], path))
+    assert (await new.stat(path)).etag.startswith("sha256:")
+    assert await new.read(path, binary=True, verify=True) == b"payload"
+
+
+@pytest.mark.asyncio
+async def test_fallback_delete_removes_misplaced_copies(roots):
+    old = _sharded(roots, "ab")
+    new = _sharded(roots, "abc", fallback=True)
+    path = next(
+        f"{i}.txt" for i in range(100) if new.placement(f"{i}.txt") == "c"
+    )
+    await old.write(path, "x")
+
+    await new.delete(path)
+
+    assert not await new.exists(path)
+    for root in roots.values():
+        assert not os.path.exists(os.path.join(root, path))
+
+
+@pytest.mark.asyncio
+async def test_directories_made_by_a_write_can_be_listed(roots):
+    backend = _sharded(roots, "abc")
+    # As a write creating its parents leaves it: only on the owning shard.
+    owner = backend.shards[backend.placement("implicit/one.txt")]
+    await owner.mkdir("implicit")
+    await backend.write("implicit/one.txt", "1")
+
+    assert await backend.list("implicit") == ["one.txt"]
+    assert [e.name for e in await backend.scan("implicit")] == ["one.txt"]
+    assert await backend.find("implicit", PathQuery()) == ["one.txt"]
+    with pytest.raises(FileUtilsException):
+        await backend.scan("nowhere")
+
+
+@pytest.mark.asyncio
+async def test_rename_moves_misplaced_file_with_metadata(roots):
+    old = _sharded(roots, "ab")
+    new = _sharded(roots, "abc", fallback=True)
+    path = next(
+        f"{i}.bin" for i in range(100) if new.placement(f"{i}.bin") == "c"
+    )
+    dest = next(
+        f"moved{i}.bin"
+        for i in range(100)
+        if new.placement(f"moved{i}.bin") != old.placement(path)
+    )
+    await old.write(path, b"payload", checksum="sha256", permissions=0o640)
+
+    await new.rename(path, dest)
+
+    assert not await new.exists(path)
+    assert await new.read(dest, binary=True) == b"payload"
+    moved = await new.stat(dest)
+    assert moved.mode == 0o640
+    if moved.etag and not moved.etag.startswith("W/"):
+        assert moved.etag.startswith("sha256:")
@@ -0,0 +1,190 @@
+# tests/test_simulated_backend.py
+
+import json
+import os
+import random
+import time
+
+import pytest
+
+from darca_storage.decorators.simulated_backend import (
+    Latency,
+    SimulatedFileBackend,
+    SimulationProfile,
+)
+from darca_storage.exceptions import StorageSimulatedFault
+from darca_storage.factory import StorageConnectorFactory
+from darca_storage import loadgen
+from darca_storage.loadgen import run_load
+
+
+class EchoBackend:
+    """Minimal backend that counts the calls reaching it."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def read(self, path, *, binary=False, **options):
+        self.calls += 1
+        return b"x" * 1000
+
+    async def exists(self, path):
+        self.calls += 1
+        return True
+
+
+def test_latency_specs():
+    rng = random.Random(1)
+    assert Latency.parse("0.25").sample(rng) == 0.25
+    assert 0.1 <= Latency.parse("uniform:0.1,0.2").sample(rng) <= 0.2
+    assert Latency.parse("lognormal:0.004,0.5").sample(rng) > 0
+    for bad in ("gamma:1", "uniform:0.1", "fixed:-1", "normal:a,b"):
+        with pytest.raises(ValueError):
+            Latency.parse(bad)
+
+
+def test_profile_from_parameters():
+    profile = SimulationProfile.from_parameters(
+        {
+            "simulate_latency": "exponential:0.01",
+            "simulate_latency.read": "0.002",
+            "simulate_error_rate.write": "0.5",
+            "simulate_seed": "7",
+        }
+    )
+    assert profile.latency == Latency("exponential", (0.01,))
+    assert profile.operation_latency == {"read": Latency("fixed", (0.002,))}
+    assert profile.operation_error_rate == {"write": 0.5}
+    assert profile.seed == 7
+    assert not profile.is_inert()
+    assert SimulationProfile.from_parameters({}).is_inert()
+    with pytest.raises(ValueError):
+        SimulationProfile(error_rate=1.5)
+
+
+@pytest.mark.asyncio
+async def test_faults_skip_the_wrapped_backend():
+    inner = EchoBackend()
+    backend = SimulatedFileBackend(
+        inner, SimulationProfile(operation_error_rate={"read": 1.0})
+    )
+
+    with pytest.raises(StorageSimulatedFault):
+        await backend.read("/a")
+    assert await backend.exists("/a")
+
+    assert inner.calls == 1
+    assert backend.stats()["simulated"]["faults"] == 1
+
+
+@pytest.mark.asyncio
+async def test_same_seed_same_delays():
+    def run():
+        return SimulatedFileBackend(
+            EchoBackend(),
+            SimulationProfile(
+                latency=Latency.parse("exponential:0.001"), seed=3
+            ),
+        )
+
+    first, second = run(), run()
+    for backend in (first, second):
+        for _ in range(5):
+            await backend.exists("/a")
+
+    assert (
+        first.stats()["simulated"]["delay_seconds"]
+        == second.stats()["simulated"]["delay_seconds"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_throughput_is_capped():
+    backend = SimulatedFileBackend(
+        EchoBackend(), SimulationProfile(read_bytes_per_second=20_000)
+    )
+
+    started = time.monotonic()
+    for _ in range(5):
+        await backend.read("/a")  # 1000 bytes each; the bucket holds 2000
+
+    assert time.monotonic() - started >= 0.1
+    assert backend.stats()["simulated"]["transfer_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_load_generator_against_simulated_url(temp_storage_dir):
+    client = await StorageConnectorFactory.from_url(
+        f"file://{temp_storage_dir}",
+        parameters={
+            "simulate_latency": "uniform:0,0.001",
+            "simulate_error_rate.read": "0.2",
+            "simulate_seed": "1",
+        },
+    )
+    async with client:
+        report = await run_load(
+            client,
+            duration=None,
+            operations=200,
+            concurrency=8,
+            mix={"read": 3, "write": 1},
+            size=64,
+            files=10,
+            seed=1,
+        )
+        faults = client.stats()["simulated"]["faults"]
+
+    assert report["operations"] == 200
+    reads = report["by_operation"]["read"]
+    assert reads["count"] + report["by_operation"]["write"]["count"] == 200
+    assert reads["errors"] == {"StorageSimulatedFault": faults}
+    assert faults > 0
+    assert reads["p50"] <= reads["p99"] <= reads["max"]
+
+
+@pytest.mark.asyncio
+async def test_load_generator_setup_avoids_injected_faults(temp_storage_dir):
+    url = f"file://{temp_storage_dir}"
+    setup_client = await StorageConnectorFactory.from_url(url)
+    client = await StorageConnectorFactory.from_url(
+        url,
+        parameters={"simulate_error_rate": "0.5", "simulate_seed": "1"},
+    )
+    async with setup_client, client:
+        report = await run_load(
+            client,
+            duration=None,
+            operations=50,
+            mix={"write": 1},
+            size=64,
+            files=20,
+            seed=1,
+            setup_client=setup_client,
+        )
+
+    assert report["operations"] == 50
+    assert report["by_operation"]["write"]["errors"]
+    assert len(os.listdir(os.path.join(temp_storage_dir, "loadgen"))) == 20
+
+
+def test_load_generator_script_reports_faults(temp_storage_dir, capsys):
+    assert (
+        loadgen.main(
+            [
+                f"file://{temp_storage_dir}",
+                "--operations=40",
+                "--files=20",
+                "--mix=read=1",
+                "-p",
+                "simulate_error_rate=0.5",
+                "-p",
+                "simulate_seed=1",
+            ]
+        )
+        == 0
+    )
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["operations"] == 40
+    assert report["by_operation"]["read"]["errors"]
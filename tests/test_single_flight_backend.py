@@ -0,0 +1,90 @@
+# tests/test_single_flight_backend.py
+
+import asyncio
+
+import pytest
+
+from darca_storage.decorators.single_flight_backend import (
+    SingleFlightFileBackend,
+)
+
+
+class CountingBackend:
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.gate = asyncio.Event()
+
+    async def read(self, path, *, binary=False, **options):
+        self.reads += 1
+        call = self.reads
+        await self.gate.wait()
+        return f"content-{call}"
+
+    async def list(self, base_path, *, recursive=False):
+        self.reads += 1
+        await self.gate.wait()
+        return ["a", "b"]
+
+    async def write(self, path, content, *, binary=False, **options):
+        self.writes += 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_call():
+    inner = CountingBackend()
+    backend = SingleFlightFileBackend(inner)
+
+    tasks = [asyncio.create_task(backend.read("/hot")) for _ in range(10)]
+    await asyncio.sleep(0)
+    inner.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert inner.reads == 1
+    assert set(results) == {"content-1"}
+    assert backend.stats()["single_flight"]["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_write_detaches_in_flight_read():
+    inner = CountingBackend()
+    backend = SingleFlightFileBackend(inner)
+
+    first = asyncio.create_task(backend.read("/hot"))
+    await asyncio.sleep(0)
+    await backend.write("/hot", "new")
+    second = asyncio.create_task(backend.read("/hot"))
+    await asyncio.sleep(0)
+    inner.gate.set()
+
+    assert await first == "content-1"
+    assert await second == "content-2"
+    assert inner.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_the_flight():
+    inner = CountingBackend()
+    backend = SingleFlightFileBackend(inner)
+
+    leader = asyncio.create_task(backend.read("/hot"))
+    follower = asyncio.create_task(backend.read("/hot"))
+    await asyncio.sleep(0)
+    leader.cancel()
+    inner.gate.set()
+
+    assert await follower == "content-1"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_list_results_are_copied():
+    inner = CountingBackend()
+    inner.gate.set()
+    backend = SingleFlightFileBackend(inner)
+
+    a, b = await asyncio.gather(backend.list("/d"), backend.list("/d"))
+    a.append("mutated")
+
+    assert b == ["a", "b"]
@@ -0,0 +1,68 @@
+# tests/test_sync_client.py
+
+import os
+
+import pytest
+
+from darca_storage.decorators.scoped_backend import SyncScopedFileBackend
+from darca_storage.exceptions import (
+    StorageClientClosed,
+    StorageClientPathViolation,
+)
+from darca_storage.factory import StorageConnectorFactory
+from darca_storage.sync_client import SyncStorageClient
+
+
+@pytest.fixture
+def client(temp_storage_dir):
+    return StorageConnectorFactory.from_url_sync(
+        f"file://{temp_storage_dir}", session_metadata={"env": "cli"}
+    )
+
+
+def test_factory_returns_scoped_sync_client(client, temp_storage_dir):
+    assert isinstance(client, SyncStorageClient)
+    assert isinstance(client.backend, SyncScopedFileBackend)
+    assert client.context()["session_metadata"]["base_path"] == (
+        os.path.abspath(temp_storage_dir)
+    )
+
+
+def test_file_operations(client):
+    client.mkdir("docs")
+    client.write("docs/a.txt", "hello")
+    assert client.exists("docs/a.txt")
+    assert client.read("docs/a.txt") == "hello"
+    assert client.stat("docs/a.txt").size == 5
+
+    client.rename("docs/a.txt", "docs/b.txt")
+    assert not client.exists("docs/a.txt")
+    assert [e.name for e in client.scan("docs")] == ["b.txt"]
+
+    client.delete("docs/b.txt")
+    client.rmdir("docs")
+    assert not client.exists("docs")
+
+
+def test_binary_roundtrip(client):
+    client.write("data.bin", b"\x00\xff", binary=True)
+    assert client.read("data.bin", binary=True) == b"\x00\xff"
+
+
+def test_sync_client_blocks_escape(client):
+    with pytest.raises(StorageClientPathViolation):
+        client.read("../outside.txt")
+
+
+def test_sync_factory_rejects_unsupported_scheme():
+    with pytest.raises(ValueError):
+        StorageConnectorFactory.from_url_sync("ftp://localhost/data")
+
+
+def test_closed_sync_client_rejects_operations(client):
+    with client:
+        client.write("a.txt", "x")
+
+    assert client.closed
+    with pytest.raises(StorageClientClosed):
+        client.read("a.txt")
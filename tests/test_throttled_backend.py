@@ -0,0 +1,111 @@
+# tests/test_throttled_backend.py
+
+import asyncio
+
+import pytest
+
+from darca_storage.decorators.throttled_backend import (
+    FairScheduler,
+    ThrottledFileBackend,
+    ThrottleLimits,
+    TokenBucket,
+)
+
+
+class SlowBackend:
+    """Minimal backend that records peak concurrency."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def read(self, path, *, binary=False, **options):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return "x" * 10
+
+
+def test_limits_from_parameters():
+    limits = ThrottleLimits.from_parameters(
+        {
+            "max_concurrency": "8",
+            "max_concurrency.read": "2",
+            "ops_per_second": "100",
+        }
+    )
+    assert limits.max_concurrency == 8
+    assert limits.operation_concurrency == {"read": 2}
+    assert limits.ops_per_second == 100.0
+    assert not limits.is_unlimited()
+    assert ThrottleLimits.from_parameters({}).is_unlimited()
+
+
+def test_operation_limits_parse_like_the_global_ones():
+    limits = ThrottleLimits.from_parameters({"max_concurrency.read": ""})
+    assert limits.operation_concurrency == {}
+
+    with pytest.raises(ValueError, match="'max_concurrency.write'"):
+        ThrottleLimits.from_parameters({"max_concurrency.write": "many"})
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_is_enforced_and_reported():
+    inner = SlowBackend()
+    backend = ThrottledFileBackend(inner, ThrottleLimits(max_concurrency=2))
+
+    await asyncio.gather(*(backend.read(f"/f{i}") for i in range(6)))
+
+    assert inner.peak == 2
+    assert backend.stats()["throttle"]["limit_hits"]["max_concurrency"] > 0
+
+
+@pytest.mark.asyncio
+async def test_per_operation_cap():
+    inner = SlowBackend()
+    backend = ThrottledFileBackend(
+        inner, ThrottleLimits(operation_concurrency={"read": 1})
+    )
+
+    await asyncio.gather(*(backend.read("/f") for _ in range(3)))
+
+    assert inner.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=100, capacity=1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(5):
+        await bucket.acquire()
+    assert loop.time() - start >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduler_alternates_tenants():
+    scheduler = FairScheduler(max_concurrency=1)
+    order = []
+
+    async def op(tenant):
+        async with scheduler.slot(tenant):
+            order.append(tenant)
+            await asyncio.sleep(0)
+
+    async with scheduler.slot("hog"):
+        tasks = [asyncio.create_task(op("hog")) for _ in range(3)]
+        tasks.append(asyncio.create_task(op("small")))
+        await asyncio.sleep(0)
+
+    await asyncio.gather(*tasks)
+    assert order[:2] == ["hog", "small"]
+    assert scheduler.stats()["waits"] == {"hog": 3, "small": 1}
+
+
+@pytest.mark.asyncio
+async def test_shared_scheduler_is_reused():
+    a = FairScheduler.shared("test-root", 4)
+    b = FairScheduler.shared("test-root", 8)
+    assert a is b
@@ -0,0 +1,150 @@
+# tests/test_tiered_backend.py
+
+import os
+
+import pytest
+
+from darca_storage.backends.local_file_backend import LocalFileBackend
+from darca_storage.client import StorageClient
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage.decorators.tiered_backend import TieredFileBackend
+
+
+@pytest.fixture
+def roots(temp_storage_dir):
+    fast = os.path.join(temp_storage_dir, "fast")
+    slow = os.path.join(temp_storage_dir, "slow")
+    os.makedirs(fast)
+    os.makedirs(slow)
+    return fast, slow
+
+
+def _tiered(roots, **options):
+    fast, slow = roots
+    return TieredFileBackend(
+        ScopedFileBackend(LocalFileBackend(), fast),
+        ScopedFileBackend(LocalFileBackend(), slow),
+        **options,
+    )
+
+
+def _put(root, name, content):
+    with open(os.path.join(root, name), "w") as fh:
+        fh.write(content)
+
+
+def test_tiers_must_be_scoped(roots):
+    with pytest.raises(TypeError):
+        TieredFileBackend(
+            LocalFileBackend(),
+            ScopedFileBackend(LocalFileBackend(), roots[1]),
+        )
+
+
+@pytest.mark.asyncio
+async def test_read_promotes_into_fast_tier(roots):
+    fast, slow = roots
+    _put(slow, "a.txt", "hello")
+    backend = _tiered(roots)
+
+    assert await backend.read("a.txt") == "hello"
+    assert os.path.exists(os.path.join(fast, "a.txt"))
+    assert await backend.read("a.txt") == "hello"
+
+    counters = backend.stats()["tiered"]
+    assert counters["misses"] == 1
+    assert counters["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_respects_capacity(roots):
+    fast, slow = roots
+    for name in ("a", "b", "c"):
+        _put(slow, name, "x" * 10)
+    backend = _tiered(roots, capacity_bytes=20)
+
+    await backend.read("a")
+    await backend.read("b")
+    await backend.read("a")  # b is now least recently used
+    await backend.read("c")
+
+    assert backend.cached() == ["a", "c"]
+    assert not os.path.exists(os.path.join(fast, "b"))
+    assert backend.stats()["tiered"]["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_through_updates_both_tiers(roots):
+    backend = _tiered(roots)
+    await backend.mkdir("d")
+
+    await backend.write("d/f.txt", "v1")
+
+    for root in roots:
+        with open(os.path.join(root, "d", "f.txt")) as fh:
+            assert fh.read() == "v1"
+
+
+@pytest.mark.asyncio
+async def test_write_behind_reaches_slow_tier_on_flush(roots):
+    fast, slow = roots
+    backend = _tiered(roots, write_policy="behind", capacity_bytes=1)
+
+    await backend.write("f.txt", "x")
+    assert await backend.read("f.txt") == "x"
+    await backend.flush()
+
+    with open(os.path.join(slow, "f.txt")) as fh:
+        assert fh.read() == "x"
+    assert backend.stats()["tiered"]["dirty"] == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_both_copies(roots):
+    fast, slow = roots
+    _put(slow, "a.txt", "hello")
+    backend = _tiered(roots)
+    await backend.read("a.txt")
+
+    await backend.delete("a.txt")
+
+    assert not await backend.exists("a.txt")
+    assert not os.path.exists(os.path.join(fast, "a.txt"))
+
+
+@pytest.mark.asyncio
+async def test_client_close_flushes_write_behind(roots):
+    fast, slow = roots
+    client = StorageClient(_tiered(roots, write_policy="behind"))
+
+    async with client:
+        await client.write("f.txt", "data")
+        resources = client.stats()["resources"]
+        assert resources["cache_entries"] == 1
+        assert resources["cache_bytes"] == 4
+
+    with open(os.path.join(slow, "f.txt")) as fh:
+        assert fh.read() == "data"
+
+
+@pytest.mark.asyncio
+async def test_capacity_counts_encoded_text_bytes(roots):
+    backend = _tiered(roots)
+
+    await backend.write("t.txt", "größe €")  # 7 characters, 11 bytes
+
+    assert backend.stats()["tiered"]["cached_bytes"] == 11
+
+
+@pytest.mark.asyncio
+async def test_text_reads_agree_on_miss_and_hit(roots):
+    fast, slow = roots
+    with open(os.path.join(slow, "crlf.txt"), "wb") as fh:
+        fh.write(b"a\r\nb\r\n")
+    backend = _tiered(roots)
+    uncached = _tiered(roots, capacity_bytes=1)  # too small to promote
+
+    miss = await backend.read("crlf.txt")
+    assert await backend.read("crlf.txt") == miss
+    assert await uncached.read("crlf.txt") == miss
+    assert await backend.read("crlf.txt", binary=True) == b"a\r\nb\r\n"
@@ -0,0 +1,239 @@
+# tests/test_transaction.py
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from darca_storage.backends.local_file_backend import LocalFileBackend
+from darca_storage.client import StorageClient
+from darca_storage.decorators.lookup_cache_backend import (
+    LookupCacheFileBackend,
+)
+from darca_storage.decorators.scoped_backend import ScopedFileBackend
+from darca_storage import transaction
+from darca_storage.exceptions import (
+    StorageClientPathViolation,
+    StorageTransactionClosed,
+    StorageTransactionFailed,
+)
+from darca_storage.factory import StorageConnectorFactory
+from darca_storage.transaction import STAGING_DIR
+
+
+@pytest.fixture
+def client(temp_storage_dir):
+    return StorageClient(
+        ScopedFileBackend(
+            LookupCacheFileBackend(LocalFileBackend(), negative_ttl=60),
+            base_path=temp_storage_dir,
+        )
+    )
+
+
+def _put(root, name, content):
+    with open(os.path.join(root, name), "w") as fh:
+        fh.write(content)
+
+
+def _get(root, name):
+    with open(os.path.join(root, name)) as fh:
+        return fh.read()
+
+
+@pytest.mark.asyncio
+async def test_commit_publishes_all_changes(client, temp_storage_dir):
+    _put(temp_storage_dir, "old.txt", "old")
+    _put(temp_storage_dir, "gone.txt", "x")
+    assert not await client.exists("d/new.txt")  # cached as missing
+
+    async with client.transaction() as tx:
+        await tx.write("d/new.txt", "new")
+        await tx.writev("d/parts.bin", [b"ab", memoryview(b"cd")])
+        await tx.rename("old.txt", "d/moved.txt")
+        await tx.delete("gone.txt")
+        assert not os.path.exists(os.path.join(temp_storage_dir, "d"))
+
+    assert _get(temp_storage_dir, "d/new.txt") == "new"
+    assert _get(temp_storage_dir, "d/parts.bin") == "abcd"
+    assert _get(temp_storage_dir, "d/moved.txt") == "old"
+    assert not os.path.exists(os.path.join(temp_storage_dir, "old.txt"))
+    assert not os.path.exists(os.path.join(temp_storage_dir, "gone.txt"))
+    assert await client.exists("d/new.txt")
+    assert os.listdir(os.path.join(temp_storage_dir, STAGING_DIR)) == []
+
+
+@pytest.mark.asyncio
+async def test_exception_rolls_back(client, temp_storage_dir):
+    _put(temp_storage_dir, "a.txt", "a")
+
+    with pytest.raises(RuntimeError):
+        async with client.transaction() as tx:
+            await tx.write("b.txt", "b")
+            await tx.delete("a.txt")
+            raise RuntimeError("boom")
+
+    assert _get(temp_storage_dir, "a.txt") == "a"
+    assert not os.path.exists(os.path.join(temp_storage_dir, "b.txt"))
+    with pytest.raises(StorageTransactionClosed):
+        await tx.write("c.txt", "c")
+
+
+@pytest.mark.asyncio
+async def test_failed_check_publishes_nothing(client, temp_storage_dir):
+    with pytest.raises(StorageTransactionFailed):
+        async with client.transaction() as tx:
+            await tx.write("a.txt", "a")
+            await tx.delete("missing.txt")
+
+    assert os.listdir(temp_storage_dir) == [STAGING_DIR]
+
+
+@pytest.mark.asyncio
+async def test_changes_are_reduced_to_final_state(client, temp_storage_dir):
+    _put(temp_storage_dir, "a", "A")
+    _put(temp_storage_dir, "b", "B")
+
+    async with client.transaction() as tx:  # swap a and b
+        await tx.rename("a", "tmp")
+        await tx.rename("b", "a")
+        await tx.rename("tmp", "b")
+        await tx.write("c", "first")
+        await tx.rename("c", "d")
+        await tx.write("c", "second")
+
+    assert _get(temp_storage_dir, "a") == "B"
+    assert _get(temp_storage_dir, "b") == "A"
+    assert _get(temp_storage_dir, "c") == "second"
+    assert _get(temp_storage_dir, "d") == "first"
+    assert not os.path.exists(os.path.join(temp_storage_dir, "tmp"))
+
+
+@pytest.mark.asyncio
+async def test_paths_are_confined(client):
+    tx = client.transaction()
+    with pytest.raises(StorageClientPathViolation):
+        await tx.write("../escape.txt", "x")
+    with pytest.raises(StorageClientPathViolation):
+        await tx.delete(f"{STAGING_DIR}/anything")
+    assert tx.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_journaled_publish_is_rolled_forward(client, temp_storage_dir):
+    # A process died after its commit point, having published nothing.
+    staging = os.path.join(temp_storage_dir, STAGING_DIR, "dead")
+    os.makedirs(staging)
+    _put(staging, "0", "recovered")
+    _put(temp_storage_dir, "old.txt", "x")
+    with open(os.path.join(staging, "journal.json"), "w") as fh:
+        json.dump([["put", "r.txt", "0"], ["delete", "old.txt"]], fh)
+    # ...and another died before it.
+    abandoned = os.path.join(temp_storage_dir, STAGING_DIR, "early")
+    os.makedirs(abandoned)
+    _put(abandoned, "0", "never")
+
+    async with client.transaction() as tx:
+        await tx.write("new.txt", "new")
+
+    assert _get(temp_storage_dir, "r.txt") == "recovered"
+    assert not os.path.exists(os.path.join(temp_storage_dir, "old.txt"))
+    assert _get(temp_storage_dir, "new.txt") == "new"
+    assert os.listdir(os.path.join(temp_storage_dir, STAGING_DIR)) == []
+
+
+def _crash_after_put_of_rename(root):
+    """Leave what rename("a.txt", "z.txt") leaves dying after its puts."""
+    _put(root, "a.txt", "a")
+    st = os.lstat(os.path.join(root, "a.txt"))
+    staging = os.path.join(root, STAGING_DIR, "dead")
+    os.makedirs(staging)
+    os.link(os.path.join(root, "a.txt"), os.path.join(root, "z.txt"))
+    with open(os.path.join(staging, "journal.json"), "w") as fh:
+        json.dump(
+            [
+                ["put", "z.txt", "0", None],
+                ["delete", "a.txt", [st.st_ino, st.st_mtime_ns, st.st_size]],
+            ],
+            fh,
+        )
+
+
+@pytest.mark.asyncio
+async def test_connecting_recovers_before_anything_is_written(
+    temp_storage_dir,
+):
+    _crash_after_put_of_rename(temp_storage_dir)
+
+    client = await StorageConnectorFactory.from_url(
+        f"file://{temp_storage_dir}"
+    )
+    async with client:
+        assert not await client.exists("a.txt")
+        await client.write("a.txt", "new")
+        async with client.transaction() as tx:
+            await tx.write("b.txt", "b")
+
+    assert _get(temp_storage_dir, "a.txt") == "new"
+    assert _get(temp_storage_dir, "z.txt") == "a"
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_targets_changed_since(client, temp_storage_dir):
+    _crash_after_put_of_rename(temp_storage_dir)
+    os.unlink(os.path.join(temp_storage_dir, "a.txt"))
+    _put(temp_storage_dir, "a.txt", "written after the crash")
+
+    async with client.transaction() as tx:
+        await tx.write("b.txt", "b")
+
+    assert _get(temp_storage_dir, "a.txt") == "written after the crash"
+    assert _get(temp_storage_dir, "z.txt") == "a"
+
+
+@pytest.mark.asyncio
+async def test_staging_area_is_hidden(client, temp_storage_dir):
+    async with client.transaction() as tx:
+        await tx.write("d/a.txt", "a")
+    assert os.path.isdir(os.path.join(temp_storage_dir, STAGING_DIR))
+
+    assert await client.list("") == ["d"]
+    listed = await client.list(recursive=True)
+    assert not [name for name in listed if name.startswith(STAGING_DIR)]
+    assert [stat.name for stat in await client.scan()] == ["d"]
+    assert [p async for p in client.walk(page_size=1)] == ["d", "d/a.txt"]
+    manifest = await client.manifest("")
+    assert STAGING_DIR not in str(manifest)
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_a_commit(
+    client, temp_storage_dir, monkeypatch
+):
+    started, gate = threading.Event(), threading.Event()
+    publish = transaction._publish
+
+    def slow_publish(*args):
+        started.set()
+        gate.wait()
+        return publish(*args)
+
+    monkeypatch.setattr(transaction, "_publish", slow_publish)
+    tx = client.transaction()
+    await tx.write("a.txt", "a")
+    commit = asyncio.create_task(tx.commit())
+    while not started.is_set():
+        await asyncio.sleep(0.001)
+
+    try:
+        assert client.stats()["resources"]["in_flight"] == 1
+        closing = asyncio.create_task(client.close())
+        await asyncio.sleep(0.01)
+        assert not closing.done()
+    finally:
+        gate.set()
+    await commit
+    await closing
+    assert _get(temp_storage_dir, "a.txt") == "a"